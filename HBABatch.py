@@ -0,0 +1,112 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBABatch resolves many hits at once with NumPy, for example a volley of arrows against a shield wall.
+# The reduction tables of all loadouts in a registry are stacked into one array, so a whole volley is resolved without a loop over the attacks.
+# Identically equipped characters share a loadout, so the array grows with the number of distinct loadouts, not with the number of characters.
+
+# Changelog
+# 2026-10-16: The hit locations and damage types are taken from the registry
+# 2026-10-16: Reduction tables are stacked per loadout instead of per character
+# 2026-10-16: Initial version
+
+import numpy as np
+import HBAEngine as E
+
+# Resolves batches of hits against the characters of a registry.
+# The stacked reduction array is rebuilt lazily whenever a character of the registry was added, removed or recompiled.
+class BatchResolver:
+	# Constructor method
+	# 
+	# @param registry The registry holding the characters to resolve hits against.
+	def __init__(self, registry):
+		self.registry = registry
+		# Version of the registry the reduction array was built from
+		self.version = None
+		# Reduction tables of all loadouts with the shape (loadouts, slots, damage types)
+		self.reductions = None
+		# Row of the loadout of each character ID in the reduction array (-1 for IDs without a character).
+		# It has one more entry than there are IDs, so IDs outside of it are looked up at the last entry, which is always -1.
+		self.rows = None
+		# Row of the reduction table that is hit for each last digit of the attack roll
+		self.hitLocations = None
+	
+	# Stacks the reduction tables of all loadouts into one array if the registry changed since it was last built.
+	def compile(self):
+		if self.version == self.registry.version:
+			return
+		loadouts = self.registry.loadouts
+		self.reductions = np.zeros((len(loadouts), len(E.SLOT_NAMES), len(self.registry.damageTypes)), dtype=np.int64)
+		self.rows = np.full(self.registry.nextCharacterID + 1, -1, dtype=np.intp)
+		for row, loadout in enumerate(loadouts.values()):
+			self.reductions[row] = loadout[1]
+			self.rows[list(loadout[3])] = row
+		self.hitLocations = np.array(self.registry.hitLocations, dtype=np.intp)
+		self.version = self.registry.version
+	
+	# Resolves a batch of hits.
+	# 
+	# @param characterIDs Array with the ID of the hit character for each attack.
+	# @param attackRolls Array with the total of the attack roll for each attack.
+	# @param damages Array with the damage total before the reduction for each attack.
+	# @param damageTypes Array with the damage type of each attack, either as names of the damage types of the registry or as their column indices.
+	# @return Array with the reduced damage of each attack, which can't be negative.
+	def resolve(self, characterIDs, attackRolls, damages, damageTypes):
+		self.compile()
+		characterIDs = np.asarray(characterIDs, dtype=np.intp)
+		# Negative IDs and IDs that were never given to a character are unknown, like the IDs of removed characters
+		inside = (characterIDs >= 0) & (characterIDs < len(self.rows) - 1)
+		rows = self.rows[np.where(inside, characterIDs, -1)]
+		if (rows < 0).any():
+			unknown = np.unique(characterIDs[rows < 0]).tolist()
+			raise ValueError("Character" + (" ID " if len(unknown) == 1 else " IDs ") + ", ".join(str(characterID) for characterID in unknown)
+				+ (" doesn't" if len(unknown) == 1 else " don't") + " exist.")
+		# Map the hit location from the last digit of the attack roll
+		locations = self.hitLocations[np.asarray(attackRolls, dtype=np.int64) % 10]
+		columns = damageTypeColumns(damageTypes, self.registry.damageTypeIndex)
+		# Gather the reductions and clamp at zero
+		return np.maximum(np.asarray(damages, dtype=np.int64) - self.reductions[rows, locations, columns], 0)
+
+# Converts damage types to their column indices in the reduction tables.
+# Only the distinct damage type names are looked up, not every attack.
+# 
+# @param damageTypes Array with damage type names or column indices.
+# @param damageTypeIndex Column of each valid damage type name, by default the built-in damage types.
+# @return Array with the column index of each damage type.
+def damageTypeColumns(damageTypes, damageTypeIndex=E.DAMAGE_TYPE_INDEX):
+	damageTypes = np.asarray(damageTypes)
+	if np.issubdtype(damageTypes.dtype, np.integer):
+		return damageTypes.astype(np.intp)
+	names, inverse = np.unique(damageTypes, return_inverse=True)
+	columns = np.empty(len(names), dtype=np.intp)
+	for index, name in enumerate(names):
+		if not name in damageTypeIndex:
+			raise ValueError("Damage type " + str(name) + " is undefined.")
+		columns[index] = damageTypeIndex[name]
+	return columns[inverse.reshape(damageTypes.shape)]
+
+# Resolves attack records as returned by E.parseAttacks against the characters of a registry.
+# 
+# @param resolver The BatchResolver of the registry.
+# @param records List of records in the format [characterName, attackRoll, damage, damageType], optionally followed by the line of the record.
+# @return Tuple of the characterIDs of the resolved records, the array with their reduced damage, a list of messages about records with unknown characters
+# (with their line, if the records give it) and the resolved records.
+def resolveRecords(resolver, records):
+	characterIDs = []
+	resolved = []
+	messages = []
+	for record in records:
+		characterID = resolver.registry.findCharacter(record[0])
+		if None == characterID:
+			if len(record) > 4:
+				messages.append("Line " + str(record[4]) + ": character " + record[0] + " doesn't exist.")
+			else:
+				messages.append("Character " + record[0] + " doesn't exist.")
+			continue
+		characterIDs.append(characterID)
+		resolved.append(record)
+	if len(resolved) == 0:
+		return characterIDs, np.zeros(0, dtype=np.int64), messages, resolved
+	columns = list(zip(*resolved))
+	return characterIDs, resolver.resolve(characterIDs, columns[1], columns[2], columns[3]), messages, resolved
@@ -0,0 +1,117 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBACache keeps the parsed content of armour and character files in a compact binary cache (marshal),
+# so unchanged files don't have to be parsed from text again.
+# The cache of a file is stored in the directory "__hbacache__" next to it, or in the directory given by the environment variable HBA_CACHE_DIR.
+# An entry is valid if the size of the file matches and either its modification time or the hash of its content matches.
+# Stale or corrupt entries are ignored and the file is parsed from text. The cache can be disabled by setting HBA_CACHE=0.
+
+# Changelog
+# 2026-10-17: New cache format version, since items with a one-character name on the unterminated last line of character files are read
+# 2026-10-16: New cache format version, since the last line of character files is read without cutting off its last character
+# 2026-10-16: New cache format version, since armour files report reductions above the largest storable one
+# 2026-10-16: New cache format version, since messages of character files give the line
+# 2026-10-16: Initial version
+
+import hashlib
+import marshal
+import os
+import threading
+
+# Whether the cache is used
+ENABLED = os.environ.get("HBA_CACHE", "1") != "0"
+# Directory for all cache files. If None, the cache of a file is stored next to it.
+CACHE_DIRECTORY = os.environ.get("HBA_CACHE_DIR")
+# Marks a cache file and the version of its format. Must be changed whenever a parser returns its result in a different format.
+MAGIC = b"HBAC\x05"
+# Size of the hashes
+DIGEST_SIZE = 16
+
+# Calculates the hash of a file's content.
+# 
+# @param content The content of the file.
+# @return The hash.
+def digest(content):
+	return hashlib.blake2b(content, digest_size=DIGEST_SIZE).digest()
+
+# Gets the path of the cache file of a file.
+# 
+# @param path The path of the file.
+# @return The path of its cache file.
+def cachePath(path):
+	if None == CACHE_DIRECTORY:
+		directory, name = os.path.split(os.path.abspath(path))
+		return os.path.join(directory, "__hbacache__", name + ".cache")
+	# Files with the same name in different directories need different cache files
+	absolute = os.path.abspath(path)
+	return os.path.join(CACHE_DIRECTORY, digest(absolute.encode()).hex() + "-" + os.path.basename(absolute) + ".cache")
+
+# Reads the entry of a cache file.
+# 
+# @param path The path of the cache file.
+# @return The entry in the format (parser name, modification time, size, content hash, result) or None if the cache file doesn't exist or is corrupt.
+def readEntry(path):
+	try:
+		cacheFile = open(path, "rb")
+		data = cacheFile.read()
+		cacheFile.close()
+		if data[:len(MAGIC)] != MAGIC:
+			return None
+		payload = data[len(MAGIC) + DIGEST_SIZE:]
+		if digest(payload) != data[len(MAGIC):len(MAGIC) + DIGEST_SIZE]:
+			return None
+		entry = marshal.loads(payload)
+		if not isinstance(entry, tuple) or len(entry) != 5:
+			return None
+		return entry
+	except (OSError, EOFError, ValueError, TypeError):
+		return None
+
+# Writes the entry of a cache file. The file is replaced at once, so a crash can't leave a half written entry.
+# Failures (for example a read-only directory) are ignored.
+# 
+# @param path The path of the cache file.
+# @param entry The entry in the format (parser name, modification time, size, content hash, result).
+def writeEntry(path, entry):
+	try:
+		payload = marshal.dumps(entry)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		# Files are parsed on a thread pool, so each thread of each process writes its own temporary file
+		temporaryPath = path + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+		cacheFile = open(temporaryPath, "wb")
+		cacheFile.write(MAGIC + digest(payload) + payload)
+		cacheFile.close()
+		os.replace(temporaryPath, path)
+	except (OSError, ValueError):
+		pass
+
+# Parses a file or reads the result from the cache if the file didn't change since it was cached.
+# 
+# @param path The path of the file.
+# @param parser The function that parses the file, for example HBAEngine.parseArmourFile. Its result must only consist of
+# types marshal supports (lists, tuples, dictionaries, strings, numbers, None).
+# @return The result of the parser.
+def cachedParse(path, parser):
+	if not ENABLED:
+		return parser(path)
+	status = os.stat(path)
+	cacheFile = cachePath(path)
+	entry = readEntry(cacheFile)
+	if not None == entry and entry[0] == parser.__name__ and entry[2] == status.st_size:
+		if entry[1] == status.st_mtime_ns:
+			return entry[4]
+		# The file was touched, but its content might be the same
+		sourceFile = open(path, "rb")
+		content = sourceFile.read()
+		sourceFile.close()
+		if digest(content) == entry[3]:
+			writeEntry(cacheFile, (entry[0], status.st_mtime_ns, entry[2], entry[3], entry[4]))
+			return entry[4]
+	sourceFile = open(path, "rb")
+	content = sourceFile.read()
+	sourceFile.close()
+	result = parser(path)
+	writeEntry(cacheFile, (parser.__name__, status.st_mtime_ns, status.st_size, digest(content), result))
+	return result
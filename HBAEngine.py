@@ -0,0 +1,882 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAEngine contains the rules of the homebrew armour system without any GUI.
+# It holds the parsers for armour, character and configuration files, the registry of loaded armour and characters
+# and the damage resolution, so it can be used from scripts and tools without a display.
+
+# Changelog
+# 2026-10-16: Messages of character and configuration files give the line, and the parsers can report the line of each definition, item and entry
+# 2026-10-16: Armour definitions can be updated incrementally for a set of changed armour names
+# 2026-10-16: Added the Roster for ordering characters with constant time removal and moves
+# 2026-10-16: Damage types and hit locations are stored in the registry and can be declared in configurations
+# 2026-10-16: Armour types and characters are stored in compact ArmourType and Character objects with interned armour IDs
+# 2026-10-16: Identically equipped characters share one compiled loadout and configurations can add squads
+# 2026-10-16: The files of a configuration are parsed in parallel on a thread pool
+# 2026-10-16: Configurations load unchanged armour and character files from the cache
+# 2026-10-16: Armour files are parsed in a single pass with line-numbered messages and arbitrary stats
+# 2026-10-16: Split from the GUI in HomebrewArmour
+
+import array
+import concurrent.futures
+import os
+import sys
+import HBACache as C
+
+# Names of the armour slots in the order they are stored for a character
+SLOT_NAMES = ["feet", "legs", "torso", "arms", "hands", "head"]
+# Built-in damage types in the order they are stored in an armour definition (after the name).
+# These are the damage types of a registry unless a configuration declares others.
+DAMAGE_TYPES = ["piercing", "slashing", "bludgeoning", "toHitSpells"]
+# Column of each built-in damage type in a reduction table
+DAMAGE_TYPE_INDEX = {damageType: index for index, damageType in enumerate(DAMAGE_TYPES)}
+# Default row of the reduction table that is hit for each last digit of the attack roll
+HIT_LOCATIONS = [0, 1, 1, 2, 2, 2, 3, 4, 5, 5]
+# Largest reduction of a damage type, since the reductions of an armour type are stored as 16-bit integers
+MAX_REDUCTION = 32767
+
+# Checks the value of a reduction.
+# 
+# @param damageType The name of the damage type.
+# @param value The value as parsed from an armour file: an integer or, if it isn't numeric, text.
+# @return A message describing why the value isn't a valid reduction or None if it is valid.
+def checkReduction(damageType, value):
+	if not isinstance(value, int) or value < 0:
+		return "Value for " + damageType + " must be a non-negative integer."
+	if value > MAX_REDUCTION:
+		return "Value for " + damageType + " must be at most " + str(MAX_REDUCTION) + "."
+	return None
+
+# An armour type of the loaded armour definitions.
+# The reductions are stored in a compact array with one entry for each damage type of the registry.
+class ArmourType:
+	__slots__ = ("id", "name", "reductions", "stats")
+	
+	# Constructor method
+	# 
+	# @param armourID The interned ID of the armour name in the registry.
+	# @param definition The armour definition as returned by parseArmourFile: [name, piercing, slashing, bludgeoning, toHitSpells, other stats].
+	# @param damageTypes The damage types of the registry. The reductions of damage types that aren't built in are read from the other stats;
+	# values that aren't valid (see checkReduction) don't reduce any damage.
+	def __init__(self, armourID, definition, damageTypes=DAMAGE_TYPES):
+		self.id = armourID
+		self.name = definition[0]
+		# Other stats of the armour keyed by their name
+		self.stats = definition[len(DAMAGE_TYPES) + 1]
+		reductions = []
+		for damageType in damageTypes:
+			if damageType in DAMAGE_TYPE_INDEX:
+				reductions.append(definition[DAMAGE_TYPE_INDEX[damageType] + 1])
+			else:
+				reduction = self.stats.get(damageType, 0)
+				reductions.append(0 if checkReduction(damageType, reduction) else reduction)
+		self.reductions = array.array("h", reductions)
+	
+	# Armour types are equal if they have the same name and stats.
+	def __eq__(self, other):
+		if not isinstance(other, ArmourType):
+			return NotImplemented
+		return self.name == other.name and self.reductions == other.reductions and self.stats == other.stats
+	
+	# Gets the reduction of a damage type.
+	# 
+	# @param registry The registry the armour type belongs to.
+	# @param damageType The name of the damage type.
+	# @return The reduction.
+	def reduction(self, registry, damageType):
+		return self.reductions[registry.damageTypeIndex[damageType]]
+
+# A character of the registry.
+class Character:
+	__slots__ = ("name", "loadout", "reductions", "hitPoints")
+	
+	# Constructor method
+	# 
+	# @param name The name of the character.
+	# @param hitPoints The hit points of the character or None if they aren't known.
+	def __init__(self, name, hitPoints=None):
+		self.name = name
+		# The equipped armour: a tuple with a tuple of interned armour IDs for each slot in SLOT_NAMES
+		self.loadout = ((),) * len(SLOT_NAMES)
+		# The reduction table: a tuple with the total reduction of every damage type for each slot.
+		# Shared with all characters wearing the same loadout.
+		self.reductions = None
+		self.hitPoints = hitPoints
+
+# In-memory registry of the loaded armour definitions and characters.
+# Armour definitions are keyed by their name and characters by a stable ID, so both can be looked up in constant time.
+# Armour names are interned to small integer IDs, so loadouts only store numbers.
+class Registry:
+	# Constructor method
+	def __init__(self):
+		# Armour types keyed by armour name
+		self.armour = {}
+		# Interned ID of each armour name that was ever defined or worn
+		self.armourIDs = {}
+		# Armour names indexed by their interned ID
+		self.armourNames = []
+		# Characters keyed by their ID
+		self.characters = {}
+		# IDs of the characters using each name - used to find characters by name and to report duplicate names
+		self.characterNames = {}
+		# Compiled loadouts keyed by their armour (a tuple with a tuple of armour IDs for each slot).
+		# Each loadout is a list: [armour IDs, reductions, undefined armour names, IDs of the characters wearing it]
+		# Identically equipped characters share one loadout, so it is only stored and compiled once.
+		self.loadouts = {}
+		# Interned reductions of a single slot - slots with the same total reductions share one tuple
+		self.slotReductions = {}
+		# Armour definitions the armour types were built from
+		self.definitions = []
+		# Damage types in the order of the columns of the reduction tables
+		self.damageTypes = list(DAMAGE_TYPES)
+		# Column of each damage type in a reduction table
+		self.damageTypeIndex = dict(DAMAGE_TYPE_INDEX)
+		# Row of the reduction table that is hit for each last digit of the attack roll
+		self.hitLocations = list(HIT_LOCATIONS)
+		# Messages about invalid reductions of declared damage types, found when the armour types were last built.
+		# These reductions are 0, like the reductions the parser rejects for the built-in damage types.
+		self.invalidReductions = []
+		# ID of the next character that will be added
+		self.nextCharacterID = 0
+		# Incremented whenever a character is added, removed or recompiled - used to invalidate data derived from the reduction tables
+		self.version = 0
+	
+	# Gets the interned ID of an armour name.
+	# 
+	# @param name The name of the armour type.
+	# @return The ID of the name.
+	def internArmour(self, name):
+		armourID = self.armourIDs.get(name)
+		if None == armourID:
+			armourID = len(self.armourNames)
+			name = sys.intern(name)
+			self.armourIDs[name] = armourID
+			self.armourNames.append(name)
+		return armourID
+	
+	# Rebuilds the armour index from a list of armour definitions.
+	# The loadouts containing an armour type that was added, changed or removed are recompiled.
+	# 
+	# @param definitions List of armour definitions in the format [name, piercing, slashing, bludgeoning, toHitSpells, other stats] as returned by parseArmourFile.
+	# @return Tuple of the armour names that were defined more than once and a list of [characterID, armourName] for undefined armour worn by recompiled characters.
+	# Only the first definition of each name is used.
+	def setArmourDefinitions(self, definitions):
+		armour, duplicates = self.buildArmour(definitions)
+		oldArmour = self.armour
+		self.armour = armour
+		# Find the armour that was added, changed or removed
+		changed = set()
+		for armourName in oldArmour.keys() | armour.keys():
+			if oldArmour.get(armourName) != armour.get(armourName):
+				changed.add(self.armourIDs[armourName])
+		return duplicates, self.recompileLoadouts(self.findLoadouts(changed))
+	
+	# Replaces the armour definitions when only some armour types changed, for example after an armour file was edited.
+	# Only the armour types with the given names are rebuilt, so the rest of a large library isn't touched.
+	# 
+	# @param definitions The new list of all armour definitions as returned by parseArmourFile.
+	# @param names The names of the armour types that were added, changed or removed.
+	# @return List of [characterID, armourName] for undefined armour worn by recompiled characters.
+	def updateArmourDefinitions(self, definitions, names):
+		self.definitions = definitions
+		# Only the first definition of each name is used
+		first = {}
+		for definition in definitions:
+			if definition[0] in names and not definition[0] in first:
+				first[definition[0]] = definition
+		changed = set()
+		self.invalidReductions = []
+		for armourName in names:
+			armourID = self.internArmour(armourName)
+			definition = first.get(armourName)
+			armourType = None if None == definition else ArmourType(armourID, definition, self.damageTypes)
+			if not None == armourType:
+				self.checkReductions(armourType)
+			if self.armour.get(armourName) != armourType:
+				changed.add(armourID)
+				if None == armourType:
+					del self.armour[armourName]
+				else:
+					self.armour[armourName] = armourType
+		return self.recompileLoadouts(self.findLoadouts(changed))
+	
+	# Finds the loadouts containing any of the given armour types. Only distinct loadouts are checked, not every character.
+	# 
+	# @param armourIDs Set of interned armour IDs.
+	# @return List of the loadouts as stored in loadouts.
+	def findLoadouts(self, armourIDs):
+		if len(armourIDs) == 0:
+			return []
+		return [loadout for loadout in self.loadouts.values() if any(armourID in armourIDs for slot in loadout[0] for armourID in slot)]
+	
+	# Builds the armour types from a list of armour definitions.
+	# 
+	# @param definitions List of armour definitions as returned by parseArmourFile.
+	# @return Tuple of the armour types keyed by name and the armour names that were defined more than once.
+	def buildArmour(self, definitions):
+		self.definitions = definitions
+		self.invalidReductions = []
+		armour = {}
+		duplicates = []
+		for definition in definitions:
+			if definition[0] in armour:
+				duplicates.append(definition[0])
+			else:
+				armourType = ArmourType(self.internArmour(definition[0]), definition, self.damageTypes)
+				armour[armourType.name] = armourType
+				self.checkReductions(armourType)
+		return armour, duplicates
+	
+	# Adds a message to invalidReductions for each invalid reduction of a declared damage type of an armour type.
+	# 
+	# @param armourType The ArmourType.
+	def checkReductions(self, armourType):
+		for damageType in self.damageTypes:
+			if not damageType in DAMAGE_TYPE_INDEX and damageType in armourType.stats:
+				problem = checkReduction(damageType, armourType.stats[damageType])
+				if not None == problem:
+					self.invalidReductions.append("Armour type \"" + armourType.name + "\": " + problem)
+	
+	# Recompiles loadouts and updates the reduction tables of the characters wearing them.
+	# 
+	# @param loadouts List of the loadouts as stored in loadouts.
+	# @return List of [characterID, armourName] for undefined armour worn by the recompiled characters.
+	def recompileLoadouts(self, loadouts):
+		undefined = []
+		for loadout in loadouts:
+			self.compileLoadout(loadout)
+			for characterID in loadout[3]:
+				self.characters[characterID].reductions = loadout[1]
+				for armourName in loadout[2]:
+					undefined.append([characterID, armourName])
+		if len(loadouts) > 0:
+			self.version += 1
+		return undefined
+	
+	# Sets the damage types, for example to add fire, cold and force reductions.
+	# The armour types are rebuilt from their definitions and all loadouts are recompiled, so the reduction tables get a column for each damage type.
+	# 
+	# @param damageTypes List of the names of the damage types.
+	# @return List of [characterID, armourName] for undefined armour worn by the characters.
+	def setDamageTypes(self, damageTypes):
+		if len(damageTypes) == 0 or len(set(damageTypes)) != len(damageTypes):
+			raise ValueError("Damage types must be unique and at least one damage type must be given.")
+		self.damageTypes = list(damageTypes)
+		self.damageTypeIndex = {damageType: index for index, damageType in enumerate(self.damageTypes)}
+		self.slotReductions = {}
+		self.armour = self.buildArmour(self.definitions)[0]
+		return self.recompileLoadouts(list(self.loadouts.values()))
+	
+	# Sets the slot that is hit for each last digit of the attack roll.
+	# 
+	# @param slotNames List with the name of the hit slot from SLOT_NAMES for each digit from 0 to 9.
+	def setHitLocations(self, slotNames):
+		if len(slotNames) != len(HIT_LOCATIONS) or any(not slotName in SLOT_NAMES for slotName in slotNames):
+			raise ValueError("Hit locations must give one of the slots " + ", ".join(SLOT_NAMES) + " for each of the digits 0 to 9.")
+		self.hitLocations = [SLOT_NAMES.index(slotName) for slotName in slotNames]
+		self.version += 1
+	
+	# Compiles the reduction table of a loadout from the current armour definitions.
+	# 
+	# @param loadout The loadout as stored in loadouts.
+	def compileLoadout(self, loadout):
+		reductions = []
+		undefined = []
+		for slot in loadout[0]:
+			slotReductions = [0] * len(self.damageTypes)
+			for armourID in slot:
+				armourType = self.armour.get(self.armourNames[armourID])
+				if None == armourType:
+					undefined.append(self.armourNames[armourID])
+					continue
+				for index, reduction in enumerate(armourType.reductions):
+					slotReductions[index] += reduction
+			slotReductions = tuple(slotReductions)
+			reductions.append(self.slotReductions.setdefault(slotReductions, slotReductions))
+		loadout[1] = tuple(reductions)
+		loadout[2] = tuple(undefined)
+	
+	# Gets the shared loadout for the armour of a character's slots. The loadout is compiled if no character wears it yet.
+	# 
+	# @param loadoutKey A tuple with a tuple of armour IDs for each slot in SLOT_NAMES.
+	# @return The loadout as stored in loadouts.
+	def internLoadout(self, loadoutKey):
+		loadout = self.loadouts.get(loadoutKey)
+		if None == loadout:
+			loadout = [loadoutKey, None, None, set()]
+			self.compileLoadout(loadout)
+			self.loadouts[loadoutKey] = loadout
+		return loadout
+	
+	# Compiles the reduction table of a character from its equipped armour.
+	# This needs to be called whenever the equipped armour of the character changes.
+	# 
+	# @param characterID The ID of the character.
+	# @return List of the undefined armour types the character is wearing. These don't reduce any damage.
+	def compileCharacter(self, characterID):
+		character = self.characters[characterID]
+		# Remove the character from the users of its previous loadout
+		self.releaseArmour(characterID)
+		loadout = self.internLoadout(character.loadout)
+		loadout[3].add(characterID)
+		character.loadout = loadout[0]
+		character.reductions = loadout[1]
+		self.version += 1
+		return list(loadout[2])
+	
+	# Gets the definition of an armour type.
+	# 
+	# @param name The name of the armour type.
+	# @return The ArmourType or None if the armour type is undefined.
+	def getArmour(self, name):
+		return self.armour.get(name)
+	
+	# Gets the names of the armour a character is wearing.
+	# 
+	# @param character The character as stored in the registry.
+	# @return List with a list of armour names for each slot in SLOT_NAMES.
+	def getSlots(self, character):
+		return [[self.armourNames[armourID] for armourID in slot] for slot in character.loadout]
+	
+	# Adds a character without any equipped armour.
+	# 
+	# @param name The name of the character.
+	# @param hitPoints The hit points of the character or None if they aren't known.
+	# @return The ID of the new character.
+	def addCharacter(self, name, hitPoints=None):
+		characterID = self.nextCharacterID
+		self.nextCharacterID += 1
+		self.characters[characterID] = Character(None, hitPoints)
+		self.renameCharacter(characterID, name)
+		self.compileCharacter(characterID)
+		return characterID
+	
+	# Adds a squad of identically equipped characters, for example 200 goblins.
+	# All members share one compiled loadout; only their names and hit points are stored per character.
+	# 
+	# @param name The name of the squad. The members are named "NAME 1", "NAME 2" and so on.
+	# @param slots List with the equipped armour names for each slot in SLOT_NAMES.
+	# @param count The number of members.
+	# @param hitPoints The hit points of each member or None if they aren't known.
+	# @return Tuple of the IDs of the members and a list of the undefined armour types they are wearing.
+	def addSquad(self, name, slots, count, hitPoints=None):
+		characterIDs = []
+		undefined = []
+		for number in range(1, count + 1):
+			characterID = self.addCharacter(name + " " + str(number), hitPoints)
+			undefined = self.setCharacterArmour(characterID, slots)
+			characterIDs.append(characterID)
+		return characterIDs, undefined
+	
+	# Sets the equipped armour of a character and compiles its reduction table.
+	# 
+	# @param characterID The ID of the character.
+	# @param slots List with the equipped armour names for each slot in SLOT_NAMES.
+	# @return List of the undefined armour types the character is wearing.
+	def setCharacterArmour(self, characterID, slots):
+		character = self.characters[characterID]
+		self.releaseArmour(characterID)
+		character.loadout = tuple(tuple(self.internArmour(armourName) for armourName in slot) for slot in slots)
+		return self.compileCharacter(characterID)
+	
+	# Gets a character by its ID.
+	# 
+	# @param characterID The ID of the character.
+	# @return The Character or None if no character has this ID.
+	def getCharacter(self, characterID):
+		return self.characters.get(characterID)
+	
+	# Finds a character by its name.
+	# 
+	# @param name The name of the character.
+	# @return The ID of the first character with this name or None if no character has this name.
+	def findCharacter(self, name):
+		characterIDs = self.characterNames.get(name)
+		if None == characterIDs:
+			return None
+		return characterIDs[0]
+	
+	# Sets the name of a character.
+	# 
+	# @param characterID The ID of the character.
+	# @param name The new name of the character.
+	# @return True if the name is unique, False if another character already uses it.
+	def renameCharacter(self, characterID, name):
+		character = self.characters[characterID]
+		self.releaseName(characterID, character.name)
+		character.name = name
+		characterIDs = self.characterNames.setdefault(name, [])
+		characterIDs.append(characterID)
+		return len(characterIDs) == 1
+	
+	# Removes a character from the registry.
+	# 
+	# @param characterID The ID of the character.
+	def removeCharacter(self, characterID):
+		character = self.characters.get(characterID)
+		if not None == character:
+			self.releaseName(characterID, character.name)
+			self.releaseArmour(characterID)
+			del self.characters[characterID]
+			self.version += 1
+	
+	# Removes a character from the users of a name.
+	# 
+	# @param characterID The ID of the character.
+	# @param name The name that is no longer used by the character.
+	def releaseName(self, characterID, name):
+		characterIDs = self.characterNames.get(name)
+		if None == characterIDs:
+			return
+		characterIDs.remove(characterID)
+		if len(characterIDs) == 0:
+			del self.characterNames[name]
+	
+	# Calculates the row of the reduction table that is hit by an attack.
+	# 
+	# @param attackRoll The total of the attack roll.
+	# @return The index of the hit slot in SLOT_NAMES.
+	def hitLocation(self, attackRoll):
+		return self.hitLocations[attackRoll % 10]
+	
+	# Calculates the damage a character takes from a hit after the reduction of its armour.
+	# 
+	# @param character The Character as stored in the registry.
+	# @param attackRoll The total of the attack roll.
+	# @param damage The damage total before the reduction.
+	# @param damageType Type of the damage. Must be one of damageTypes.
+	# @return The reduced damage, which can't be negative.
+	def resolveHit(self, character, attackRoll, damage, damageType):
+		reducedDamage = damage - character.reductions[self.hitLocations[attackRoll % 10]][self.damageTypeIndex[damageType]]
+		# Damage can't be negative
+		if 0 > reducedDamage:
+			return 0
+		return reducedDamage
+	
+	# Removes a character from the users of its loadout. Loadouts nobody wears anymore are removed.
+	# 
+	# @param characterID The ID of the character.
+	def releaseArmour(self, characterID):
+		loadoutKey = self.characters[characterID].loadout
+		loadout = self.loadouts.get(loadoutKey)
+		if None == loadout or not characterID in loadout[3]:
+			return
+		loadout[3].discard(characterID)
+		if len(loadout[3]) == 0:
+			del self.loadouts[loadoutKey]
+
+# Order of the characters in a list, for example the character list of the GUI.
+# The characters are linked to their neighbours by ID, so adding, removing and moving a character take constant time.
+# The list of all IDs in order is cached and only rebuilt after a character was removed or moved.
+class Roster:
+	# Constructor method
+	# 
+	# @param characterIDs The IDs of the characters in order.
+	def __init__(self, characterIDs=()):
+		# IDs of the previous and the next character keyed by character ID (None at the ends)
+		self.links = {}
+		# ID of the first and the last character
+		self.first = None
+		self.last = None
+		# Cached list of the IDs in order (None if it has to be rebuilt)
+		self.order = []
+		for characterID in characterIDs:
+			self.append(characterID)
+	
+	# Gets the number of characters.
+	# 
+	# @return The number of characters.
+	def __len__(self):
+		return len(self.links)
+	
+	# Checks whether a character is in the roster.
+	# 
+	# @param characterID The ID of the character.
+	# @return Whether the character is in the roster.
+	def __contains__(self, characterID):
+		return characterID in self.links
+	
+	# Adds a character at the end.
+	# 
+	# @param characterID The ID of the character.
+	def append(self, characterID):
+		self.insert(characterID, None)
+		if not None == self.order:
+			self.order.append(characterID)
+	
+	# Links a character in front of another one.
+	# 
+	# @param characterID The ID of the character.
+	# @param beforeID The ID of the character it is placed in front of or None to place it at the end.
+	def insert(self, characterID, beforeID):
+		previousID = self.last if None == beforeID else self.links[beforeID][0]
+		self.links[characterID] = [previousID, beforeID]
+		if None == previousID:
+			self.first = characterID
+		else:
+			self.links[previousID][1] = characterID
+		if None == beforeID:
+			self.last = characterID
+		else:
+			self.links[beforeID][0] = characterID
+	
+	# Removes a character.
+	# 
+	# @param characterID The ID of the character.
+	def remove(self, characterID):
+		previousID, nextID = self.links.pop(characterID)
+		if None == previousID:
+			self.first = nextID
+		else:
+			self.links[previousID][1] = nextID
+		if None == nextID:
+			self.last = previousID
+		else:
+			self.links[nextID][0] = previousID
+		self.order = None
+	
+	# Moves a character in front of another one.
+	# 
+	# @param characterID The ID of the character.
+	# @param beforeID The ID of the character it is moved in front of or None to move it to the end.
+	def move(self, characterID, beforeID):
+		if characterID == beforeID:
+			return
+		self.remove(characterID)
+		self.insert(characterID, beforeID)
+	
+	# Gets the IDs of all characters in order.
+	# 
+	# @return The cached list of IDs. It must not be modified.
+	def getOrder(self):
+		if None == self.order:
+			order = []
+			characterID = self.first
+			while not None == characterID:
+				order.append(characterID)
+				characterID = self.links[characterID][1]
+			self.order = order
+		return self.order
+
+# Parses an armour definitions file in a single pass over its lines.
+# Every line is a comment (starting with "#"), empty, the name of an armour type or an indented "key: value" stat of the armour type named last.
+# The stats of the damage types in DAMAGE_TYPES are reductions and must be integers from 0 to MAX_REDUCTION.
+# Any other stat is kept as an integer or, if it isn't numeric, as text. Reductions of damage types declared in a configuration are such stats. See HBA.loadArmourDefinitions for an example file.
+# If an armour type is defined more than once, only the first definition is used.
+# 
+# @param path The path to the armour file.
+# @param definedAt Dictionary the line of the first definition of each armour name is added to, if given.
+# @return Tuple of the armour definitions in the format [name, piercing, slashing, bludgeoning, toHitSpells, other stats]
+# and a list of messages in the format "path:line: problem" for all invalid lines.
+def parseArmourFile(path, definedAt=None):
+	definitions = []
+	messages = []
+	# Line of the definition of each armour name
+	if None == definedAt:
+		definedAt = {}
+	# Definition the following stats belong to
+	current = None
+	# Open the armour file
+	armour = open(path, "r")
+	for lineNumber, line in enumerate(armour, 1):
+		stripped = line.strip()
+		# Ignore the line if it is a comment or empty
+		if stripped == "" or stripped[0] == "#":
+			continue
+		# Indented lines declare a stat of the current armour type
+		if line[0] == "	" or line[0] == " ":
+			key, separator, value = stripped.partition(":")
+			key = key.rstrip()
+			value = value.strip()
+			if None == current:
+				messages.append(path + ":" + str(lineNumber) + ": You must give an armour type a name before defining its stats.")
+			elif separator == "" or key == "":
+				messages.append(path + ":" + str(lineNumber) + ": \"" + stripped + "\" must have the format \"key: value\".")
+			elif key in DAMAGE_TYPE_INDEX:
+				try:
+					reduction = int(value)
+				except ValueError:
+					reduction = value
+				problem = checkReduction(key, reduction)
+				if not None == problem:
+					messages.append(path + ":" + str(lineNumber) + ": " + problem)
+				else:
+					current[DAMAGE_TYPE_INDEX[key] + 1] = reduction
+			else:
+				try:
+					current[-1][key] = int(value)
+				except ValueError:
+					current[-1][key] = value
+		# Otherwise the line gives the name of an armour type that will be defined by the following lines
+		else:
+			name = line.rstrip("\n")
+			current = [name] + [0] * len(DAMAGE_TYPES) + [{}]
+			if name in definedAt:
+				messages.append(path + ":" + str(lineNumber) + ": Armour type \"" + name + "\" is already defined in line " + str(definedAt[name]) + ". This definition will be ignored.")
+			else:
+				definedAt[name] = lineNumber
+				definitions.append(current)
+	# Close armour definitions file
+	armour.close()
+	return definitions, messages
+
+# Parses a character file.
+# 
+# @param path The path to the character file.
+# @param itemLines List the line numbers of the equipped armour of each slot are added to, if given, in the same format as the slots.
+# @return Tuple of the character name (None if the file doesn't give one), a list with the equipped armour for each slot in SLOT_NAMES
+# and a list of messages in the format "path:line: problem" for all invalid lines.
+def parseCharacterFile(path, itemLines=None):
+	name = None
+	slots = [[] for _ in SLOT_NAMES]
+	messages = []
+	if None == itemLines:
+		itemLines = [[] for _ in SLOT_NAMES]
+	# Current armour slot index
+	armourSlotIndex = None
+	# Open the character file
+	character = open(path, "r")
+	# Load character definition
+	for lineNumber, line in enumerate(character, 1):
+		# Ignore the line if it is a comment (first character being "#") or empty
+		if line[0] == "#" or line[0] == "\n":
+			continue
+		# Check if line contains the character name
+		elif len(line) > 5 and line[:5] == "name=":
+			name = line[5:].rstrip("\n")
+		# Check if line declares an armour item
+		elif len(line.rstrip("\n")) > 1 and line[0] == "	":
+			# Check if the armour slot has been given
+			if not None == armourSlotIndex:
+				slots[armourSlotIndex].append(line[1:].rstrip("\n"))
+				itemLines[armourSlotIndex].append(lineNumber)
+			else:
+				messages.append(path + ":" + str(lineNumber) + ": You must specify an armour slot before listing equipped items.")
+		else:
+			# Check if line declares an armour slot section
+			for index, slotName in enumerate(SLOT_NAMES):
+				if line[:len(slotName)] == slotName:
+					armourSlotIndex = index
+					break
+			else:
+				# Invalid syntax, line will be skipped
+				messages.append(path + ":" + str(lineNumber) + ": " + line.rstrip("\n") + " has an invalid syntax and will not be processed.")
+	# Close character file
+	character.close()
+	return name, slots, messages
+
+# Parses a configuration file.
+# 
+# @param path The path to the configuration file.
+# @param entryLines List the line number of each entry is added to, if given.
+# @return Tuple of a list of entries [key, value] in file order, where key is "armour" or "character", and a list of messages in the format "path:line: problem" for all invalid lines.
+# Squads are entries ["squad", path, count, hit points], declared damage types ["damagetypes", names] and hit locations ["hitlocations", slot names].
+def parseConfigurationFile(path, entryLines=None):
+	entries = []
+	messages = []
+	if None == entryLines:
+		entryLines = []
+	# Open the configuration file
+	configfile = open(path, "r")
+	# Load app configuration
+	for lineNumber, line in enumerate(configfile, 1):
+		# Line of the entry or message of this line
+		location = path + ":" + str(lineNumber) + ": "
+		# Ignore the line if it is a comment (first character being "#") or empty
+		if line[0] == "#" or line[0] == "\n":
+			continue
+		# Check if line defines an armour definitions file
+		elif len(line) > 7 and line[:7] == "armour=":
+			entries.append(["armour", line[7:].rstrip("\n")])
+			entryLines.append(lineNumber)
+		# Check if line includes a character
+		elif len(line) > 10 and line[:10] == "character=":
+			entries.append(["character", line[10:].rstrip("\n")])
+			entryLines.append(lineNumber)
+		# Check if line declares the damage types in the format "damagetypes=NAME NAME ..."
+		elif len(line) > 12 and line[:12] == "damagetypes=":
+			damageTypes = line[12:].rstrip("\n").split()
+			if len(damageTypes) > 0 and len(set(damageTypes)) == len(damageTypes):
+				entries.append(["damagetypes", damageTypes])
+				entryLines.append(lineNumber)
+			else:
+				messages.append(location + line.rstrip("\n") + " must list unique damage types and will not be processed.")
+		# Check if line declares the hit slot for each last digit of the attack roll in the format "hitlocations=SLOT SLOT ..."
+		elif len(line) > 13 and line[:13] == "hitlocations=":
+			slotNames = line[13:].rstrip("\n").split()
+			if len(slotNames) == len(HIT_LOCATIONS) and all(slotName in SLOT_NAMES for slotName in slotNames):
+				entries.append(["hitlocations", slotNames])
+				entryLines.append(lineNumber)
+			else:
+				messages.append(location + line.rstrip("\n") + " must give one of the slots " + ", ".join(SLOT_NAMES) + " for each of the digits 0 to 9 and will not be processed.")
+		# Check if line includes a squad in the format "squad=COUNT HIT POINTS PATH"
+		elif len(line) > 6 and line[:6] == "squad=":
+			fields = line[6:].rstrip("\n").split(None, 2)
+			if len(fields) == 3 and fields[0].isdigit() and fields[1].isdigit():
+				entries.append(["squad", fields[2], int(fields[0]), int(fields[1])])
+				entryLines.append(lineNumber)
+			else:
+				messages.append(location + line.rstrip("\n") + " must have the format squad=COUNT HIT POINTS PATH and will not be processed.")
+		else:
+			# Invalid syntax, line will be skipped
+			messages.append(location + line.rstrip("\n") + " has an invalid syntax and will not be processed.")
+	# Close configuration file
+	configfile.close()
+	return entries, messages
+
+# Parses attack records. Each record is a line in the format "CHARACTER NAME ATTACK DAMAGE DAMAGE TYPE", for example "Tav 17 12 slashing".
+# Comments (starting with "#") and empty lines are ignored.
+# 
+# @param lines Iterable of the lines to parse.
+# @param damageTypeIndex Column of each valid damage type, by default the built-in damage types.
+# @param firstLine The line number of the first line, used in the messages.
+# @return Tuple of the records in the format [characterName, attackRoll, damage, damageType, line] and a list of messages about invalid lines.
+def parseAttacks(lines, damageTypeIndex=DAMAGE_TYPE_INDEX, firstLine=1):
+	records = []
+	messages = []
+	for lineNumber, line in enumerate(lines, firstLine):
+		line = line.strip()
+		# Ignore the line if it is a comment or empty
+		if line == "" or line[0] == "#":
+			continue
+		# Split from the right, since character names may contain spaces
+		fields = line.rsplit(None, 3)
+		if len(fields) < 4:
+			messages.append("Line " + str(lineNumber) + ": \"" + line + "\" must give a character, an attack roll, a damage total and a damage type.")
+			continue
+		try:
+			attackRoll = int(fields[1])
+			damage = int(fields[2])
+		except ValueError:
+			messages.append("Line " + str(lineNumber) + ": attack roll and damage must be integers.")
+			continue
+		if not fields[3] in damageTypeIndex:
+			messages.append("Line " + str(lineNumber) + ": damage type " + fields[3] + " is undefined.")
+			continue
+		records.append([fields[0], attackRoll, damage, fields[3], lineNumber])
+	return records, messages
+
+# Parses one file referenced by a configuration.
+# 
+# @param entry The entry as returned by parseConfigurationFile.
+# @return The result of parseArmourFile or parseCharacterFile, or None if the file doesn't exist or the entry doesn't reference a file.
+def parseConfigurationEntry(entry):
+	key, path = entry[:2]
+	if not key in ["armour", "character", "squad"] or not os.path.exists(path):
+		return None
+	if key == "armour":
+		return C.cachedParse(path, parseArmourFile)
+	return C.cachedParse(path, parseCharacterFile)
+
+# Parses a configuration file and all armour and character files it references.
+# The referenced files are parsed at the same time on a thread pool, so reading many small character files doesn't wait for each file in turn.
+# 
+# @param path The path to the configuration file.
+# @param workers The maximum number of threads. By default, the thread pool decides.
+# @return Tuple of a list with every entry followed by its parsed file in the order of the configuration (see parseConfigurationEntry),
+# for example ["character", path, parsed file], and a list of messages about invalid lines and files that couldn't be read.
+# The parsed file of an entry is None if its file couldn't be read, like for missing files.
+def parseConfiguration(path, workers=None):
+	entries, messages = parseConfigurationFile(path)
+	with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+		futures = [executor.submit(parseConfigurationEntry, entry) for entry in entries]
+	parsed = []
+	for entry, future in zip(entries, futures):
+		try:
+			result = future.result()
+		except (OSError, UnicodeDecodeError) as error:
+			# For example a directory, a file without permission to read it or a file that isn't UTF-8
+			messages.append(entry[0].capitalize() + " file: \"" + entry[1] + "\" couldn't be read: " + str(error))
+			result = None
+		parsed.append(entry + [result])
+	return parsed, messages
+
+# Adds the parsed files of a configuration to a registry.
+# The armour definitions of all armour files in the configuration are combined and every character file adds a character.
+# 
+# @param registry The registry to load the configuration into.
+# @param parsed List of entries with their parsed files as returned by parseConfiguration.
+# @param definitions List of the armour definitions loaded before, if any. They are replaced if the configuration contains an armour file.
+# @return Tuple of a list of messages about missing files, duplicate names and undefined armour,
+# the IDs of the added characters in the order of the configuration and the list of armour definitions now loaded.
+def applyConfiguration(registry, parsed, definitions=None):
+	if None == definitions:
+		definitions = []
+	messages = []
+	characterIDs = []
+	# Whether an armour definitions file of this configuration has been loaded already
+	armourLoaded = False
+	for entry in parsed:
+		key, value, result = entry[0], entry[1], entry[-1]
+		# Check if entry declares the damage types
+		if key == "damagetypes":
+			for characterID, armourName in registry.setDamageTypes(value):
+				messages.append("Error: " + registry.characters[characterID].name + " is wearing undefined armour: " + armourName)
+			messages.extend(registry.invalidReductions)
+		# Check if entry declares the hit locations
+		elif key == "hitlocations":
+			registry.setHitLocations(value)
+		# Check if entry defines an armour definitions file
+		elif key == "armour":
+			if None == result:
+				# Files that exist but couldn't be read were reported by parseConfiguration
+				if not os.path.exists(value):
+					messages.append("Armour file: \"" + value + "\" doesn't exist.")
+				continue
+			armourDefinitions, armourMessages = result
+			messages.extend(armourMessages)
+			# All armour files of a configuration are combined
+			definitions = (definitions if armourLoaded else []) + armourDefinitions
+			armourLoaded = True
+			duplicates, undefined = registry.setArmourDefinitions(definitions)
+			messages.extend(registry.invalidReductions)
+			for armourName in duplicates:
+				messages.append("Armour type \"" + armourName + "\" is defined more than once. Only the first definition will be used.")
+			for characterID, armourName in undefined:
+				messages.append("Error: " + registry.characters[characterID].name + " is wearing undefined armour: " + armourName)
+		elif key == "character":
+			if None == result:
+				# Files that exist but couldn't be read were reported by parseConfiguration
+				if not os.path.exists(value):
+					messages.append("Character file: \"" + value + "\" doesn't exist.")
+				continue
+			name, slots, characterMessages = result
+			messages.extend(characterMessages)
+			# If the file doesn't give a name, generate one
+			if None == name:
+				name = "character " + str(len(registry.characters) + 1)
+			characterID = registry.addCharacter(name)
+			characterIDs.append(characterID)
+			if len(registry.characterNames[name]) > 1:
+				messages.append("Character name \"" + name + "\" is used by more than one character.")
+			for armourName in registry.setCharacterArmour(characterID, slots):
+				messages.append("Error: " + name + " is wearing undefined armour: " + armourName)
+		elif key == "squad":
+			if None == result:
+				# Files that exist but couldn't be read were reported by parseConfiguration
+				if not os.path.exists(value):
+					messages.append("Squad file: \"" + value + "\" doesn't exist.")
+				continue
+			name, slots, characterMessages = result
+			messages.extend(characterMessages)
+			# If the file doesn't give a name, use the name of the file
+			if None == name:
+				name = os.path.splitext(os.path.basename(value))[0]
+			squadIDs, undefined = registry.addSquad(name, slots, entry[2], entry[3])
+			characterIDs.extend(squadIDs)
+			for armourName in undefined:
+				messages.append("Error: Squad " + name + " is wearing undefined armour: " + armourName)
+	return messages, characterIDs, definitions
+
+# Loads a configuration file into a registry without a GUI.
+# The armour definitions of all armour files in the configuration are combined and every character file adds a character.
+# Unchanged armour and character files are read from the HBACache.
+# 
+# @param registry The registry to load the configuration into.
+# @param path The path to the configuration file.
+# @return List of messages about invalid lines, duplicate names and undefined armour.
+def loadConfiguration(registry, path):
+	parsed, messages = parseConfiguration(path)
+	messages.extend(applyConfiguration(registry, parsed)[0])
+	return messages
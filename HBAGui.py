@@ -0,0 +1,1433 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAGui contains the tkinter GUI of HomebrewArmour. The rules of the armour system live in HBAEngine.
+
+# Changelog
+# 2026-10-17: The character list is scrolled by rows and its frame is only as large as the window, no matter how many characters it lists
+# 2026-10-16: Added an armour browser with incremental search that edits the loadout of a character
+# 2026-10-16: Added opt-in instrumentation with latency histograms, event loop lag and profile captures through HBAProfile
+# 2026-10-16: Messages are written through HBALog with levels and hits are recorded as events instead of console lines
+# 2026-10-16: Resize and scroll events are coalesced into one update per frame and the wheel handler no longer logs
+# 2026-10-16: Loaded armour and character files can be watched and changes are applied in place
+# 2026-10-16: Characters can be removed, renamed and reordered by dragging in constant time
+# 2026-10-16: Sessions can be saved and restored and changes are autosaved to a journal
+# 2026-10-16: Added a button for sharing the armour and characters with other devices through HBAServer
+# 2026-10-16: The character rows have a damage button for each damage type of the registry
+# 2026-10-16: Squads from configurations are listed with the hit points of each member
+# 2026-10-16: Configurations are loaded in the background and all characters are added in one layout pass
+# 2026-10-16: The character list only creates widgets for the visible rows and reuses them when scrolling
+# 2026-10-16: Unchanged armour and character files are read from the cache
+# 2026-10-16: Loading armour definitions replaces the previous ones instead of appending duplicates
+# 2026-10-16: Added a dialogue for resolving a volley of attacks in one step
+# 2026-10-16: Split from HomebrewArmour
+
+import time
+import os
+import concurrent.futures
+import numpy as np
+import tkinter as tk
+import tkinter.simpledialog
+from LFLib import LFLib as L
+import HBAEngine as E
+import HBABatch as B
+import HBACache as C
+import HBAServer as V
+import HBASession as J
+import HBAWatch as W
+import HBALog as O
+import HBAProfile as P
+import HBAIndex as I
+
+# Symbols of the damage buttons of known damage types. Buttons of other damage types show the name of the damage type.
+DAMAGE_SYMBOLS = {
+	# Piercing damage: 🏹 (1F3F9)
+	"piercing": u"\U0001F3F9",
+	# Slashing damage: 🪓 (1FA93)
+	"slashing": u"\U0001FA93",
+	# Bludgeoning damage: 🔨 (1F528)
+	"bludgeoning": u"\U0001F528",
+	# Damage from spells that require an attack roll: 🪄 (1FA84)
+	"toHitSpells": u"\U0001FA84",
+	# Fire damage: 🔥 (1F525)
+	"fire": u"\U0001F525",
+	# Cold damage: ❄ (2744)
+	"cold": u"\U00002744",
+	# Force damage: ✨ (2728)
+	"force": u"\U00002728",
+}
+
+# Methods of HBA whose latency is recorded while instrumentation is on
+PROFILED_METHODS = [
+	"loadArmourDefinitions",
+	"loadCharacter",
+	"loadConfiguration",
+	"finishConfiguration",
+	"restoreSession",
+	"addCharacter",
+	"calculateDamage",
+	"applyVolley",
+	"createRow",
+	"layoutRows",
+	"refreshRows",
+]
+
+# Number of results the armour browser shows at once
+BROWSER_ROWS = 20
+
+# Helper function to validate integer input
+def validateIntegerInput(character):
+	if character.isdigit() or character == "":
+		return True
+	return False
+
+# Widgets of a row in the character list.
+# Only the visible rows of the list exist; when scrolling, they are bound to other characters.
+class CharacterRow:
+	# Constructor method
+	def __init__(self):
+		# ID of the character the row is bound to (None if the row isn't used)
+		self.characterID = None
+		# Frame holding the widgets of the row
+		self.frame = None
+		# Label with the name of the character
+		self.characterLabel = None
+		# Input field for the attack roll
+		self.attackInput = None
+		# Input field for the damage total
+		self.damageInput = None
+		# Label that displays the reduced damage
+		self.reducedDamageLabel = None
+
+# Runs updates of the GUI once when the event loop is idle, no matter how many events requested them.
+# During resizes and fast scrolling, Tk delivers many events per frame; each of them only schedules its update.
+class RenderScheduler:
+	# Constructor method
+	# 
+	# @param widget Any widget of the window, used to schedule the updates.
+	def __init__(self, widget):
+		self.widget = widget
+		# Scheduled updates in the order they were first requested (a dictionary used as ordered set)
+		self.pending = {}
+		# ID of the scheduled idle callback (None if no update is scheduled)
+		self.job = None
+		# Whether updates run immediately instead of being coalesced - used to compare both in benchmarks/benchScrolling.py
+		self.immediate = False
+	
+	# Requests an update. Requesting an update that is already scheduled has no effect.
+	# 
+	# @param update The function to call. Bound methods of the same object and function are the same update.
+	def schedule(self, update):
+		if self.immediate:
+			update()
+			return
+		self.pending[update] = None
+		if None == self.job:
+			self.job = self.widget.after_idle(self.run)
+	
+	# Runs all scheduled updates. Updates requested by other updates run in the same pass.
+	def run(self):
+		try:
+			while len(self.pending) > 0:
+				update = next(iter(self.pending))
+				del self.pending[update]
+				update()
+		finally:
+			self.job = None
+	
+	# Cancels all scheduled updates.
+	def cancel(self):
+		if not None == self.job:
+			self.widget.after_cancel(self.job)
+			self.job = None
+		self.pending = {}
+
+# Dialogue for searching the armour library and editing the loadout of a character.
+# The search runs on the ArmourIndex of the app whenever the query changes. Only BROWSER_ROWS labels exist for the results;
+# scrolling fills them with another part of the results, so the dialogue never creates widgets for the whole library.
+class ArmourBrowser:
+	# Constructor method
+	# 
+	# @param app The HBA instance.
+	# @param characterID The ID of the character whose loadout is edited or None to only browse the armour.
+	def __init__(self, app, characterID=None):
+		self.app = app
+		self.characterID = characterID
+		# Rows of the matching armour types in the index
+		self.rows = np.zeros(0, dtype=np.intp)
+		# Armour types of the index the rows refer to
+		self.armourTypes = None
+		# Position of the first shown result
+		self.offset = 0
+		# Name of the selected armour type (None if no armour type is selected).
+		# Rows change whenever the index is rebuilt, so the selection is kept by name.
+		self.selected = None
+		# Create window for the dialogue
+		dialogue = tk.Toplevel(master=app.window, bg=app.bgc)
+		if None == characterID:
+			dialogue.title("HBA armour")
+		else:
+			dialogue.title("HBA armour of " + app.characters[characterID].name)
+		dialogue.rowconfigure(2, weight=1)
+		dialogue.columnconfigure(0, weight=1)
+		self.dialogue = dialogue
+		# Create input field for the query
+		self.query = tk.StringVar(master=dialogue)
+		queryInput = tk.Entry(master=dialogue, textvariable=self.query, bg=app.bgc, fg=app.fgc, insertbackground=app.fgc, font=(app.font, app.glfsize))
+		queryInput.grid(row=0, column=0, columnspan=2, sticky="NESW")
+		queryInput.focus_set()
+		# Search whenever the query changes; fast typing only searches once per frame
+		self.query.trace_add("write", lambda *args: app.renderScheduler.schedule(self.search))
+		# Create label for the number of results
+		self.countLabel = tk.Label(master=dialogue, bg=app.bgc, fg=app.fgc, font=(app.font, app.glfsize), anchor="w")
+		self.countLabel.grid(row=1, column=0, columnspan=2, sticky="NESW")
+		# Create labels for the shown results
+		resultFrame = tk.Frame(master=dialogue, bg=app.bgc)
+		resultFrame.grid(row=2, column=0, sticky="NESW")
+		self.resultLabels = []
+		for index in range(BROWSER_ROWS):
+			resultLabel = tk.Label(master=resultFrame, bg=app.bgc, fg=app.fgc, font=("Courier", app.glfsize), anchor="w", width=60)
+			resultLabel.pack(fill="x")
+			resultLabel.bind("<Button-1>", lambda event, index=index: self.select(self.offset + index))
+			resultLabel.bind("<Double-Button-1>", lambda event, index=index: self.equip(self.offset + index))
+			resultLabel.bind("<MouseWheel>", lambda event: self.setOffset(self.offset - event.delta // 120))
+			resultLabel.bind("<Button-4>", lambda event: self.setOffset(self.offset - 1))
+			resultLabel.bind("<Button-5>", lambda event: self.setOffset(self.offset + 1))
+			self.resultLabels.append(resultLabel)
+		# Create scrollbar for the results
+		self.scroller = tk.Scrollbar(master=dialogue, width=50, command=self.scrollResults)
+		self.scroller.grid(row=2, column=1, sticky="NESW")
+		# Create label for the stats of the selected armour type
+		self.detailsLabel = tk.Label(master=dialogue, bg=app.bgc, fg=app.fgc, font=(app.font, app.glfsize), anchor="nw", justify="left")
+		self.detailsLabel.grid(row=3, column=0, columnspan=2, sticky="NESW")
+		# Create controls for editing the loadout of the character
+		if not None == characterID:
+			loadoutFrame = tk.Frame(master=dialogue, bg=app.bgc)
+			loadoutFrame.grid(row=0, column=2, rowspan=4, sticky="NESW")
+			loadoutFrame.rowconfigure(1, weight=1)
+			# Create menu for the slot
+			self.slot = tk.StringVar(master=dialogue, value=E.SLOT_NAMES[0])
+			slotMenu = tk.OptionMenu(loadoutFrame, self.slot, *E.SLOT_NAMES, command=lambda value: self.showLoadout())
+			slotMenu.config(bg=app.bgc, fg=app.fgc, font=(app.font, app.glfsize))
+			slotMenu.grid(row=0, column=0, columnspan=2, sticky="NESW")
+			# Create list of the armour layers of the slot
+			self.layerList = tk.Listbox(master=loadoutFrame, bg=app.bgc, fg=app.fgc, font=(app.font, app.glfsize), width=30)
+			self.layerList.grid(row=1, column=0, columnspan=2, sticky="NESW")
+			# Create button for equipping the selected armour type: ➕ (2795)
+			equipButton = tk.Button(master=loadoutFrame, bg=app.bgc, fg=app.fgc, text=u"\U00002795", font=(app.font, app.cfsize))
+			equipButton.grid(row=2, column=0, sticky="NESW")
+			equipButton.bind("<Button-1>", lambda event: self.equip())
+			# Create button for removing the selected layer: ✖ (2716)
+			unequipButton = tk.Button(master=loadoutFrame, bg=app.rbc, fg=app.rbtc, text=u"\U00002716", font=(app.font, app.cfsize))
+			unequipButton.grid(row=2, column=1, sticky="NESW")
+			unequipButton.bind("<Button-1>", lambda event: self.unequip())
+			self.showLoadout()
+		self.search()
+	
+	# Searches the armour for the current query and shows the first results.
+	def search(self):
+		if not self.dialogue.winfo_exists():
+			return
+		index = self.app.armourIndex
+		self.rows = index.search(self.query.get())
+		if not index.armourTypes is self.armourTypes:
+			self.armourTypes = index.armourTypes
+			# The armour definitions changed, so show the current stats of the selected armour type
+			self.showDetails()
+		self.countLabel.config(text=str(len(self.rows)) + " of " + str(len(index)) + " armour types")
+		self.setOffset(0)
+	
+	# Shows the results from a position on.
+	# 
+	# @param offset The position of the first shown result.
+	def setOffset(self, offset):
+		self.offset = max(0, min(offset, len(self.rows) - BROWSER_ROWS))
+		self.render()
+	
+	# Scrolls the results like the yview method of a scrollable widget.
+	# 
+	# @param action "moveto" or "scroll".
+	# @param amount The fraction to move to or the number of units or pages to scroll.
+	# @param unit "units" or "pages" when scrolling.
+	def scrollResults(self, action, amount, unit=None):
+		if action == "moveto":
+			self.setOffset(int(float(amount) * len(self.rows)))
+		elif unit == "pages":
+			self.setOffset(self.offset + int(amount) * BROWSER_ROWS)
+		else:
+			self.setOffset(self.offset + int(amount))
+	
+	# Fills the labels with the shown results.
+	def render(self):
+		index = self.app.armourIndex
+		# Search again if the armour definitions changed
+		index.refresh()
+		if not index.armourTypes is self.armourTypes:
+			self.search()
+			return
+		for position, resultLabel in enumerate(self.resultLabels, self.offset):
+			if position < len(self.rows):
+				row = self.rows[position]
+				armourType = index.get(row)
+				reductions = " ".join(str(reduction) for reduction in armourType.reductions)
+				selected = armourType.name == self.selected
+				resultLabel.config(text=armourType.name + " (" + reductions + ")", bg=self.app.fgc if selected else self.app.bgc,
+					fg=self.app.bgc if selected else self.app.fgc)
+			else:
+				resultLabel.config(text="", bg=self.app.bgc)
+		if len(self.rows) > 0:
+			self.scroller.set(self.offset / len(self.rows), min(self.offset + BROWSER_ROWS, len(self.rows)) / len(self.rows))
+		else:
+			self.scroller.set(0, 1)
+	
+	# Selects an armour type and shows its stats.
+	# 
+	# @param position The position of the armour type in the results.
+	def select(self, position):
+		if position >= len(self.rows):
+			return
+		self.selected = self.app.armourIndex.get(self.rows[position]).name
+		self.showDetails()
+		self.render()
+	
+	# Shows the stats of the selected armour type. The selection is cleared if the armour type isn't defined anymore.
+	def showDetails(self):
+		armourType = None if None == self.selected else self.app.registry.getArmour(self.selected)
+		if None == armourType:
+			self.selected = None
+			self.detailsLabel.config(text="")
+			return
+		lines = [armourType.name]
+		for damageType, reduction in zip(self.app.registry.damageTypes, armourType.reductions):
+			lines.append(damageType + ": " + str(reduction))
+		for key, value in armourType.stats.items():
+			if not key in self.app.registry.damageTypeIndex:
+				lines.append(key + ": " + str(value))
+		self.detailsLabel.config(text="\n".join(lines))
+	
+	# Gets the slots of the character whose loadout is edited.
+	# 
+	# @return List with the armour names of each slot or None if the character doesn't exist anymore.
+	def getSlots(self):
+		character = self.app.characters.get(self.characterID)
+		if None == character:
+			O.warning("The character of the armour browser doesn't exist anymore.")
+			return None
+		return self.app.registry.getSlots(character)
+	
+	# Shows the armour layers of the selected slot.
+	def showLoadout(self):
+		slots = self.getSlots()
+		if None == slots:
+			return
+		self.layerList.delete(0, "end")
+		for armourName in slots[E.SLOT_NAMES.index(self.slot.get())]:
+			self.layerList.insert("end", armourName)
+	
+	# Equips an armour type as the outermost layer of the selected slot.
+	# 
+	# @param position The position of the armour type in the results. By default, the selected armour type is equipped.
+	def equip(self, position=None):
+		if None == self.characterID:
+			return
+		if not None == position:
+			self.select(position)
+		else:
+			# The selected armour type may have been removed since it was selected
+			self.showDetails()
+		slots = self.getSlots()
+		if None == self.selected or None == slots:
+			return
+		slots[E.SLOT_NAMES.index(self.slot.get())].append(self.selected)
+		self.app.setCharacterSlots(self.characterID, slots)
+		self.showLoadout()
+	
+	# Removes the selected armour layer from the selected slot.
+	def unequip(self):
+		slots = self.getSlots()
+		selection = self.layerList.curselection()
+		if None == slots or len(selection) == 0:
+			return
+		del slots[E.SLOT_NAMES.index(self.slot.get())][selection[0]]
+		self.app.setCharacterSlots(self.characterID, slots)
+		self.showLoadout()
+
+class HBA:
+	# Constructor method
+	def __init__(self):
+		# Default styles for widgets
+		# Background colour
+		self.bgc = "#101010"
+		# Text colour
+		self.fgc = "#ffffff"
+		# Remove button colour
+		self.rbc = "#CD0000"
+		# Remove button text colour
+		self.rbtc = "#000000"
+		# Text font
+		self.font = "Arial"
+		# Font size for control buttons
+		self.cfsize = 44
+		# Font size for general labels
+		self.glfsize = 14
+		# Font size for remove button
+		self.rbfsize = 14
+		# Font size for reduced damage label
+		self.rdlfsize = 20
+		# Font size for damage buttons
+		self.dbfsize = 44
+		# Path of the currently active armour file
+		self.armour = "./armour.hba"
+		# Write messages to the console of LFLib and record events if a file is given for them
+		O.console = L.pln
+		if not None == O.EVENT_LOG:
+			O.openEvents(O.EVENT_LOG)
+		
+		# Initialize all components
+		# Create control window
+		self.window = tk.Tk()
+		L.window = self.window
+		self.window.title("HBA")
+		# ToDo: implement functionality to switch themes - but not using ttk widgets if possible
+		self.window["bg"] = self.bgc
+		self.window.rowconfigure(2, weight=1)
+		self.window.columnconfigure(0, weight=1)
+		# List with all UI elements
+		self.uiElements = []
+		# List with the grid parameters of all UI elements
+		self.uiGridParams = []
+		
+		# Create label for version number
+		self.vLabel = tk.Label(master=self.window, text="HBA by Lukas Freudenberg v0.1", bg=self.bgc, fg=self.fgc)
+		self.uiElements.append(self.vLabel)
+		self.uiGridParams.append([0, 0, 1, 1, "NESW"])
+		# Create frame for genaral controls
+		self.controlFrame = tk.Frame(master=self.window, bg=self.bgc)
+		self.uiElements.append(self.controlFrame)
+		self.uiGridParams.append([1, 0, 1, 2, "NESW"])
+		self.controlFrame.columnconfigure(3, weight=1)
+		# Create button for loading armour definitions
+		self.loadButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F4C2", font=(self.font, self.cfsize))
+		self.uiElements.append(self.loadButton)
+		self.uiGridParams.append([0, 0, 1, 1, "NESW"])
+		self.loadButton.bind("<Button-1>", lambda event: self.loadArmourDefinitions(armour=None))
+		# Create button for loading a full configuration
+		self.loadConfigButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F4C2", font=(self.font, self.cfsize))
+		self.uiElements.append(self.loadConfigButton)
+		self.uiGridParams.append([0, 1, 1, 1, "NESW"])
+		self.loadConfigButton.bind("<Button-1>", lambda event: self.loadConfiguration(configfile=None))
+		# Create button for saving player character configuration
+		self.saveButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F4BE", font=(self.font, self.cfsize))
+		self.uiElements.append(self.saveButton)
+		self.uiGridParams.append([0, 2, 1, 1, "NESW"])
+		self.saveButton.bind("<Button-1>", lambda event: self.saveSettings())
+		# Create button for resolving a volley of attacks at once
+		self.volleyButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F3AF", font=(self.font, self.cfsize))
+		self.uiElements.append(self.volleyButton)
+		self.uiGridParams.append([0, 4, 1, 1, "NESW"])
+		self.volleyButton.bind("<Button-1>", lambda event: self.openVolleyDialogue())
+		# Create button for sharing the armour and characters with other devices: 📡 (1F4E1)
+		self.serverButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F4E1", font=(self.font, self.cfsize))
+		self.uiElements.append(self.serverButton)
+		self.uiGridParams.append([0, 5, 1, 1, "NESW"])
+		self.serverButton.bind("<Button-1>", lambda event: self.toggleServer())
+		# Create button for watching the loaded files for changes: 👁 (1F441)
+		self.watchButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F441", font=(self.font, self.cfsize))
+		self.uiElements.append(self.watchButton)
+		self.uiGridParams.append([0, 6, 1, 1, "NESW"])
+		self.watchButton.bind("<Button-1>", lambda event: self.toggleWatching())
+		# Create button for showing the latencies of the app: ⏱ (23F1)
+		self.profileButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U000023F1", font=(self.font, self.cfsize))
+		self.uiElements.append(self.profileButton)
+		self.uiGridParams.append([0, 7, 1, 1, "NESW"])
+		self.profileButton.bind("<Button-1>", lambda event: self.openProfileDialogue())
+		# Create button for browsing the armour library: 🛡 (1F6E1)
+		self.browseButton = tk.Button(master=self.controlFrame, bg=self.bgc, text=u"\U0001F6E1", font=(self.font, self.cfsize))
+		self.uiElements.append(self.browseButton)
+		self.uiGridParams.append([0, 8, 1, 1, "NESW"])
+		self.browseButton.bind("<Button-1>", lambda event: ArmourBrowser(self))
+		# Create spacer
+		self.spacerLabel = tk.Label(master=self.window, bg=self.bgc)
+		self.uiElements.append(self.spacerLabel)
+		self.uiGridParams.append([0, 3, 1, 1, "NESW"])
+		
+		# Registry for looking up armour definitions and characters
+		self.registry = E.Registry()
+		# Resolver for volleys of attacks against the characters of the registry
+		self.batchResolver = B.BatchResolver(self.registry)
+		# Index for searching the armour types of the registry
+		self.armourIndex = I.ArmourIndex(self.registry)
+		# Server sharing the registry with other devices (None while it isn't running)
+		self.server = None
+		# Watcher of the files the armour and characters were loaded from
+		self.watcher = W.Watcher(self.registry)
+		# Scheduled poll of the watched files (None while the files aren't watched)
+		self.pollJob = None
+		# Autosave of the session (None until the window is set up)
+		self.session = None
+		# Array that holds the loaded armour definitions
+		self.loadedArmourDefinitions = [] 
+		# Load armour definitions
+		self.loadArmourDefinitions()
+		
+		# Characters keyed by their ID (shared with the registry)
+		self.characters = self.registry.characters
+		# Order of the characters in the list
+		self.roster = E.Roster()
+		# Contents of the rows of the characters keyed by character ID: [attack roll, damage total, reduced damage]
+		self.characterInputs = {}
+		# Pool of row widgets that are bound to the visible characters
+		self.rowPool = []
+		# Rows keyed by the ID of the character they are bound to
+		self.boundRows = {}
+		# Height of a row in pixels - measured when the first row is created
+		self.rowHeight = None
+		# Position of the first visible character in the list
+		self.firstRow = 0
+		# Thread for loading configurations in the background
+		self.loader = concurrent.futures.ThreadPoolExecutor(1)
+		# Future of the configuration that is being loaded (None if no configuration is being loaded)
+		self.configurationLoad = None
+		
+		# Scheduler merging the updates requested by resize and scroll events
+		self.renderScheduler = RenderScheduler(self.window)
+		# Sampler of the lag of the event loop while instrumentation is on
+		self.lagMonitor = P.LagMonitor(self.window)
+		# Dialogue showing the latencies (None while it isn't open)
+		self.profileDialogue = None
+		# Scheduled refresh of the latencies shown by the dialogue
+		self.profileJob = None
+		
+		# Create scrollable canvas
+		canvas = tk.Canvas(self.window, bg=self.bgc)
+		self.canvas = canvas
+		canvas.grid(row=2, column=0, sticky="NESW")
+		# Create scrollbar. The list is scrolled by rows, so the scrollbar is driven by the position of the first visible character.
+		scroller = tk.Scrollbar(self.window, width=50, command=self.scrollList)
+		scroller.grid(row=2, column=1, sticky="NESW")
+		self.scroller = scroller
+		# Create frame for the rows inside the canvas
+		# It is only as large as the canvas and never scrolls; the rows of the visible characters are placed in it from the top.
+		self.scrollFrame = tk.Frame(canvas, bg=self.bgc, height=0)
+		self.scrollFrame.pack_propagate(False)
+		self.scrollFrameID = canvas.create_window((0, 0), window=self.scrollFrame, anchor="nw")
+		# Fit the frame to the canvas automatically, once per frame
+		canvas.bind("<Configure>", lambda event: self.renderScheduler.schedule(self.updateFrame))
+		# Set up scrolling binds
+		# Mouse wheel scrolling
+		canvas.bind_all("<MouseWheel>", lambda event: self.scrollMouse(event))
+		# Arrow key scrolling
+		canvas.bind_all("<Up>", lambda event: self.setFirstRow(self.firstRow - 1))
+		canvas.bind_all("<Down>", lambda event: self.setFirstRow(self.firstRow + 1))
+		# Touchpad scrolling (only works on Linux)
+		self.window.bind('<Button-4>', lambda event: self.setFirstRow(self.firstRow - 1))
+		self.window.bind('<Button-5>', lambda event: self.setFirstRow(self.firstRow + 1))
+        
+		# Create button to add a character
+		self.addCharacterButton = tk.Button(master=self.scrollFrame, text=u"\U0000002B", bg=self.bgc, fg=self.fgc, font=(self.font, self.cfsize))
+		self.addCharacterButton.place(x=0, y=0, relwidth=1)
+		self.addCharacterButton.bind("<Button-1>", lambda event: self.addCharacter())
+		
+		# Turn instrumentation on if requested by HBA_PROFILE
+		if P.ENABLED:
+			self.setProfiling(True)
+		# Display the widgets
+		L.buildUI(self.uiElements, self.uiGridParams)
+		# Recover the last session from the autosave or start a new autosave
+		self.session = J.Session(J.AUTOSAVE)
+		if not os.path.exists(J.AUTOSAVE) or not self.restoreSession(J.AUTOSAVE):
+			self.snapshotSession()
+		# Maximize the window
+		self.window.attributes("-zoomed", True)
+		# Add event for closing the window
+		self.window.protocol("WM_DELETE_WINDOW", self.quit)
+		
+		# Execute mainloop of the window
+		self.window.mainloop()
+	
+	# Loads the armour definitions from a file.
+	# The user can select a file or the default definitions will be used.
+	# Example for a definitions file:
+	#	# This line is a comment and will be ignored when loading the file.
+	#	
+	#	# Name of the armour type (must be unique)
+	#	Leather
+	#	# Reduction of piercing damage
+	#		piercing: 1
+	#	# Reduction of slashing damage
+	#		slashing: 2
+	#	# Reduction of bludgeoning damage
+	#		bludgeoning: 1
+	#	# Reduction of damage from spells that require an attack roll
+	#		toHitSpells: 2
+	#	
+	#	Chainmail
+	#		piercing: 2
+	#		slashing: 5
+	#		bludgeoning: 2
+	#		toHitSpells: 3
+	# 
+	# This file defines two armour types: "Leather" and "Chainmail".
+	# The "Leather" armour reduces piercing damage by 1, slashing damage by 2,
+	# bludgeoning damage by 1 and damage from spells that require an attack roll (like Firebolt) by 2.
+	# Besides the reductions, an armour type can have any other "key: value" stats.
+	# 
+	# @param armour The path to the armour file. By default, the file for the default armour definitions will be used.
+	# @param replace Whether the loaded definitions replace the current ones. Otherwise, they are added to the current ones.
+	def loadArmourDefinitions(self, armour="./default.hba", replace=True, event=None):
+		# Check whether to load default armour
+		if armour == "./default.hba":
+			# Check if default armour file exists; if not, create it
+			if not os.path.exists(armour):
+				O.warning("Default armour definitions don't exist.")
+				default = open(armour, "w")
+				default.writelines([
+					"# This file defines different armour types. The syntax is as follows:\n"
+					"# \n"
+					"# NAME OF ARMOUR (must be unique)\n"
+					"# 	piercing: NUMERIC REDUCTION VALUE\n"
+					"# 	slashing: NUMERIC REDUCTION VALUE\n"
+					"# 	bludgeoning: NUMERIC REDUCTION VALUE\n"
+					"# 	toHitSpells: NUMERIC REDUCTION VALUE\n"
+				])
+				default.close()
+		# Check if a path was provided
+		elif armour == None:
+			armour = tk.filedialog.askopenfilename(filetypes=[("Homebrew Armour files", "*.hba")])
+			# If no armour definitions file was selected, don't load any
+			if armour == "" or armour == ():
+				O.info("No armour file selected.")
+				return
+		else:
+			# Check for correct data format
+			if not isinstance(armour, str):
+				O.warning("Path for armour file must be a string.")
+				return
+			# Check if path exists
+			if not os.path.exists(armour):
+				O.warning("Armour file: \"", armour, "\" doesn't exist.")
+				return
+		# Set the path for the current armour file
+		self.armour = armour
+		# Parse the armour file
+		definitions, messages = C.cachedParse(armour, E.parseArmourFile)
+		for message in messages:
+			O.warning(message)
+		# Swap in the new definitions at once
+		if replace:
+			self.loadedArmourDefinitions = definitions
+			self.watcher.watchArmour([[armour, definitions]])
+		else:
+			self.loadedArmourDefinitions = self.loadedArmourDefinitions + definitions
+			self.watcher.addArmour(armour, definitions)
+		# Rebuild the armour index and the reduction tables of the affected characters
+		duplicates, undefined = self.registry.setArmourDefinitions(self.loadedArmourDefinitions)
+		for message in self.registry.invalidReductions:
+			O.warning(message)
+		for armourName in duplicates:
+			O.warning("Armour type \"", armourName, "\" is defined more than once. Only the first definition will be used.")
+		for characterID, armourName in undefined:
+			O.error("Error: ", self.characters[characterID].name, " is wearing undefined armour: ", armourName)
+		
+		self.publishState()
+		self.snapshotSession()
+		O.info("Armour definitions loaded.")
+	
+	# Creates a new character.
+	# The character only gets widgets while its row is visible in the character list.
+	# 
+	# @param name The name of the character to add.
+	# @return the ID of the character used for loading a character from a file.
+	def addCharacter(self, name=None, event=None):
+		# If no name was given, generate one
+		if name == None:
+			name = "character " + str(len(self.characters) + 1)
+		# Add the character to the registry
+		characterID = self.registry.addCharacter(name)
+		self.roster.append(characterID)
+		self.characterInputs[characterID] = ["", "", "0"]
+		# Update the visible rows
+		self.layoutRows()
+		self.publishState()
+		self.journalCharacter(characterID)
+		
+		return characterID
+	
+	# Removes a character from the list and the registry.
+	# The row of the character is unbound and reused for other characters.
+	# 
+	# @param characterID The ID of the character.
+	def removeCharacter(self, characterID, event=None):
+		if None == characterID or not characterID in self.roster:
+			return
+		row = self.boundRows.get(characterID)
+		if not None == row:
+			self.bindRow(row, None)
+		name = self.characters[characterID].name
+		self.roster.remove(characterID)
+		self.registry.removeCharacter(characterID)
+		self.watcher.forgetCharacter(characterID)
+		del self.characterInputs[characterID]
+		# Update the visible rows
+		self.layoutRows()
+		self.publishState()
+		if not None == self.session:
+			self.session.record(("remove", characterID))
+		
+		O.info(name, " removed.")
+	
+	# Renames a character.
+	# 
+	# @param characterID The ID of the character.
+	# @param name The new name. If no name is given, the user will be prompted for one.
+	def renameCharacter(self, characterID, name=None, event=None):
+		if None == characterID:
+			return
+		if None == name:
+			name = tk.simpledialog.askstring("HBA", "Name of the character", initialvalue=self.characters[characterID].name, parent=self.window)
+			# If no name was entered, keep the current one
+			if None == name or name.strip() == "":
+				return
+		if not self.registry.renameCharacter(characterID, name.strip()):
+			O.warning("Character name \"", name.strip(), "\" is used by more than one character.")
+		self.updateRow(characterID)
+		self.publishState()
+		self.journalCharacter(characterID)
+	
+	# Sets the equipped armour of a character, for example from the armour browser.
+	# 
+	# @param characterID The ID of the character.
+	# @param slots List with the armour names of each slot in E.SLOT_NAMES.
+	def setCharacterSlots(self, characterID, slots):
+		for armourName in self.registry.setCharacterArmour(characterID, slots):
+			O.error("Error: ", self.characters[characterID].name, " is wearing undefined armour: ", armourName)
+		self.updateRow(characterID)
+		self.publishState()
+		self.journalCharacter(characterID)
+	
+	# Moves a character in front of another one.
+	# 
+	# @param characterID The ID of the character.
+	# @param beforeID The ID of the character it is moved in front of or None to move it to the end of the list.
+	def moveCharacter(self, characterID, beforeID):
+		if None == characterID or characterID == beforeID:
+			return
+		self.roster.move(characterID, beforeID)
+		self.renderScheduler.schedule(self.refreshRows)
+		if not None == self.session:
+			self.session.record(("move", characterID, beforeID))
+	
+	# Moves the character of a row to the gap between the rows where its drag handle was released.
+	# 
+	# @param row The CharacterRow whose handle was dragged.
+	# @param event The release event.
+	def dropRow(self, row, event):
+		if None == row.characterID:
+			return
+		order = self.roster.getOrder()
+		gap = self.firstRow + int((event.y_root - self.scrollFrame.winfo_rooty()) / self.rowHeight + 0.5)
+		gap = min(max(gap, 0), len(order))
+		self.moveCharacter(row.characterID, order[gap] if gap < len(order) else None)
+	
+	# Creates the widgets of a row in the character list.
+	# The widgets refer to the character the row is bound to when they are used.
+	# 
+	# @return The new CharacterRow.
+	def createRow(self):
+		row = CharacterRow()
+		# Create frame for the row
+		row.frame = tk.Frame(master=self.scrollFrame, bg=self.bgc)
+		# Create button to remove the character
+		removeButton = tk.Button(master=row.frame, text=u"\U00002716", bg=self.rbc, fg=self.rbtc, font=(self.font, self.rbfsize))
+		removeButton.bind("<Button-1>", lambda event: self.removeCharacter(row.characterID))
+		removeButton.grid(row=0, column=0, sticky="NESW")
+		# Create character label
+		row.characterLabel = tk.Label(master=row.frame, bg=self.bgc, fg=self.fgc, font=(self.font, self.glfsize), anchor="w")
+		row.characterLabel.bind("<Button-1>", lambda event: self.loadCharacter(row.characterID))
+		row.characterLabel.bind("<Button-3>", lambda event: self.renameCharacter(row.characterID))
+		row.characterLabel.bind("<Button-2>", lambda event: ArmourBrowser(self, row.characterID))
+		# Column after the damage buttons
+		column = len(self.registry.damageTypes) + 2
+		row.characterLabel.grid(row=0, column=1, columnspan=column - 1, sticky="NESW")
+		# Create handle for dragging the character to another position: ☰ (2630)
+		dragHandle = tk.Label(master=row.frame, text=u"\U00002630", bg=self.bgc, fg=self.fgc, font=(self.font, self.rbfsize), cursor="fleur")
+		dragHandle.bind("<ButtonRelease-1>", lambda event: self.dropRow(row, event))
+		dragHandle.grid(row=0, column=column, sticky="NESW")
+		# Create label for attack input field
+		attackLabel = tk.Label(master=row.frame, bg=self.bgc, fg=self.fgc, text="ATK", font=(self.font, self.rdlfsize), anchor="w")
+		attackLabel.grid(row=1, column=0, sticky="NESW")
+		# Register validation function for integer input
+		vcmd = self.window.register(validateIntegerInput)
+		# Create input field for the attack roll
+		row.attackInput = tk.Entry(master=row.frame, bg=self.bgc, fg=self.fgc, font=(self.font, self.rdlfsize), width=3, validate="key", validatecommand=(vcmd, "%P"))
+		row.attackInput.grid(row=2, column=0, sticky="NESW")
+		# Create label for damage input field
+		damageLabel = tk.Label(master=row.frame, bg=self.bgc, fg=self.fgc, text="DMG", font=(self.font, self.rdlfsize), anchor="w")
+		damageLabel.grid(row=1, column=1, sticky="NESW")
+		# Create input field for the damage total
+		row.damageInput = tk.Entry(master=row.frame, bg=self.bgc, fg=self.fgc, font=(self.font, self.rdlfsize), width=4, validate="key", validatecommand=(vcmd, "%P"))
+		row.damageInput.grid(row=2, column=1, sticky="NESW")
+		# Create a button for calculating the damage of each damage type of the registry
+		for column, damageType in enumerate(self.registry.damageTypes, 2):
+			damageButton = tk.Button(master=row.frame, text=DAMAGE_SYMBOLS.get(damageType, damageType), fg=self.fgc, bg=self.bgc, font=(self.font, self.dbfsize))
+			damageButton.grid(row=1, column=column, rowspan=2, sticky="NESW")
+			damageButton.bind("<Button-1>", lambda event, damageType=damageType: self.calculateDamage(row.characterID, row.attackInput, row.damageInput, damageType, row.reducedDamageLabel))
+		# Create label for reduced damage title
+		reducedTitleLabel = tk.Label(master=row.frame, bg=self.bgc, fg=self.fgc, text="Reduced DMG", font=(self.font, self.rdlfsize), anchor="w")
+		reducedTitleLabel.grid(row=1, column=column, sticky="NESW")
+		# Create label that will display the reduced damage
+		row.reducedDamageLabel = tk.Label(master=row.frame, bg=self.bgc, fg=self.fgc, text="0", font=(self.font, self.rdlfsize), anchor="w")
+		row.reducedDamageLabel.grid(row=2, column=column, sticky="NESW")
+		# Create separator between this character and next element 
+		sepLabel = tk.Label(master=row.frame, bg=self.bgc)
+		sepLabel.grid(row=3, column=0, columnspan=column + 1, sticky="NESW")
+		self.rowPool.append(row)
+		# Measure the height of a row once
+		if None == self.rowHeight:
+			self.window.update_idletasks()
+			self.rowHeight = row.frame.winfo_reqheight()
+		return row
+	
+	# Binds a row to a character, storing the inputs of the character the row was bound to before.
+	# 
+	# @param row The CharacterRow.
+	# @param characterID The ID of the character or None to unbind the row.
+	def bindRow(self, row, characterID):
+		if row.characterID == characterID:
+			return
+		self.storeRow(row)
+		if not None == row.characterID:
+			self.boundRows.pop(row.characterID, None)
+		row.characterID = characterID
+		if None == characterID:
+			row.frame.place_forget()
+			return
+		self.boundRows[characterID] = row
+		inputs = self.characterInputs[characterID]
+		row.characterLabel.config(text=self.characterTitle(characterID))
+		row.attackInput.delete(0, "end")
+		row.attackInput.insert(0, inputs[0])
+		row.damageInput.delete(0, "end")
+		row.damageInput.insert(0, inputs[1])
+		row.reducedDamageLabel.config(text=inputs[2])
+	
+	# Stores the inputs of a row in the character it is bound to.
+	# 
+	# @param row The CharacterRow.
+	def storeRow(self, row):
+		inputs = self.characterInputs.get(row.characterID)
+		if not None == inputs:
+			inputs[0] = row.attackInput.get()
+			inputs[1] = row.damageInput.get()
+	
+	# Updates the row of a character from the model if the row is visible.
+	# 
+	# @param characterID The ID of the character.
+	def updateRow(self, characterID):
+		row = self.boundRows.get(characterID)
+		if not None == row:
+			row.characterLabel.config(text=self.characterTitle(characterID))
+			row.reducedDamageLabel.config(text=self.characterInputs[characterID][2])
+	
+	# Gets the text of the label of a character.
+	# 
+	# @param characterID The ID of the character.
+	# @return The name of the character, followed by its hit points if they are known.
+	def characterTitle(self, characterID):
+		character = self.characters[characterID]
+		if None == character.hitPoints:
+			return character.name
+		return character.name + " (" + str(character.hitPoints) + " HP)"
+	
+	# Destroys all rows, so they are created again with the current damage types.
+	def clearRows(self):
+		for row in self.rowPool:
+			self.storeRow(row)
+			row.frame.destroy()
+		self.rowPool = []
+		self.boundRows = {}
+		self.rowHeight = None
+	
+	# Rebinds the rows to the visible characters after characters were added or removed.
+	def layoutRows(self):
+		if None == self.rowHeight:
+			self.createRow()
+		self.setFirstRow(self.firstRow)
+	
+	# Gets the number of rows that fit into the canvas.
+	# 
+	# @return The number of rows, at least 1.
+	def fittingRows(self):
+		if None == self.rowHeight:
+			return 1
+		return max(1, self.canvas.winfo_height() // self.rowHeight)
+	
+	# Scrolls the character list so a character is the first visible one.
+	# The rows are rebound once per frame, however many scroll steps happened.
+	# 
+	# @param first The position of the character in the list. It is limited so the button to add a character stays the last row.
+	def setFirstRow(self, first):
+		self.firstRow = max(0, min(first, len(self.roster) + 1 - self.fittingRows()))
+		self.renderScheduler.schedule(self.refreshRows)
+	
+	# Scrolls the character list like the yview method of a scrollable widget.
+	# 
+	# @param action "moveto" or "scroll".
+	# @param amount The fraction to move to or the number of units or pages to scroll.
+	# @param unit "units" or "pages" when scrolling.
+	def scrollList(self, action, amount, unit=None):
+		if action == "moveto":
+			self.setFirstRow(int(float(amount) * (len(self.roster) + 1)))
+		elif unit == "pages":
+			self.setFirstRow(self.firstRow + int(amount) * self.fittingRows())
+		else:
+			self.setFirstRow(self.firstRow + int(amount))
+	
+	# Binds the pool of rows to the characters that are visible in the canvas and updates the scrollbar.
+	# The rows are placed relative to the first visible character, so their positions never exceed the height of the canvas.
+	# Rows are only created if the pool is too small to fill the canvas.
+	def refreshRows(self, event=None):
+		if None == self.rowHeight:
+			return
+		order = self.roster.getOrder()
+		fitting = self.fittingRows()
+		# The canvas may have grown or characters may have been removed since the list was scrolled
+		self.firstRow = max(0, min(self.firstRow, len(order) + 1 - fitting))
+		first = self.firstRow
+		# The last row may only be visible in part
+		visible = min(fitting + 1, len(order) - first)
+		while len(self.rowPool) < visible:
+			self.createRow()
+		for index, row in enumerate(self.rowPool):
+			if index < visible:
+				self.bindRow(row, order[first + index])
+				row.frame.place(x=0, y=index * self.rowHeight, relwidth=1, height=self.rowHeight)
+			else:
+				self.bindRow(row, None)
+		# Move button to add a new character below the last character if it is visible
+		if len(order) - first <= fitting:
+			self.addCharacterButton.place(x=0, y=(len(order) - first) * self.rowHeight, relwidth=1)
+		else:
+			self.addCharacterButton.place_forget()
+		# The button to add a character counts as a row
+		total = len(order) + 1
+		self.scroller.set(first / total, min(first + fitting, total) / total)
+	
+	# Loads a character from a configuration file.
+	# 
+	# @param characterID The ID of the character to load the configuration into.
+	# @param character The path to the character file. If no path is given, the user will be prompted for a file dialogue.
+	def loadCharacter(self, characterID, character=None, event=None):
+		# Check if a path was provided
+		if character == None:
+			character = tk.filedialog.askopenfilename(filetypes=[("Character files", "*.char")])
+			# If no character file was selected, don't load any
+			if character == "" or character == ():
+				O.info("No character file selected.")
+				return
+		else:
+			# Check for correct data format
+			if not isinstance(character, str):
+				O.warning("Path for character file must be a string.")
+				return
+			# Check if path exists
+			if not os.path.exists(character):
+				O.warning("Character file: \"", character, "\" doesn't exist.")
+				return
+		# Parse the character file
+		characterName, slots, messages = C.cachedParse(character, E.parseCharacterFile)
+		for message in messages:
+			O.warning(message)
+		# Check if the file gives the character a name
+		if not None == characterName:
+			# Update registry
+			if not self.registry.renameCharacter(characterID, characterName):
+				O.warning("Character name \"", characterName, "\" is used by more than one character.")
+			# Update label
+			self.updateRow(characterID)
+		# Equip the armour and compile the reduction table of the character
+		for armourName in self.registry.setCharacterArmour(characterID, slots):
+			O.error("Error: ", self.characters[characterID].name, " is wearing undefined armour: ", armourName)
+		self.watcher.watchCharacters(character, [characterID])
+		self.publishState()
+		self.journalCharacter(characterID)
+		
+		O.info(characterName, " loaded.")
+	
+	# Loads a configuration for the app from a file.
+	# 
+	# @param configfile The path to the configuration file. If no path is given, the user will be prompted for a file dialogue.
+	def loadConfiguration(self, configfile=None, event=None):
+		# Check if a path was provided
+		if configfile == None:
+			configfile = tk.filedialog.askopenfilename(filetypes=[("HBA configuration files", "*.hacfg"), ("HBA sessions", "*.hbs")])
+			# If no configuration file was selected, don't load any
+			if configfile == "" or configfile == ():
+				O.info("No configuration file selected.")
+				return
+		else:
+			# Check for correct data format
+			if not isinstance(configfile, str):
+				O.warning("Path for configuration file must be a string.")
+				return
+			# Check if path exists
+			if not os.path.exists(configfile):
+				O.warning("Configuration file: \"", configfile, "\" doesn't exist.")
+				return
+		# Sessions are restored instead of loaded
+		if configfile.endswith(".hbs"):
+			self.restoreSession(configfile)
+			return
+		# Only load one configuration at a time
+		if not None == self.configurationLoad:
+			O.warning("A configuration is already being loaded.")
+			return
+		# Parse the configuration and all its files in the background, so the window stays responsive
+		self.configurationLoad = self.loader.submit(E.parseConfiguration, configfile)
+		self.window.after(50, self.finishConfiguration)
+	
+	# Adds the characters of a configuration once all of its files are parsed.
+	# All rows are updated in one layout pass at the end.
+	def finishConfiguration(self):
+		# Check again later if the files aren't parsed yet
+		if not self.configurationLoad.done():
+			self.window.after(50, self.finishConfiguration)
+			return
+		try:
+			parsed, messages = self.configurationLoad.result()
+		except (OSError, UnicodeDecodeError) as error:
+			O.error("Configuration couldn't be loaded: ", error)
+			return
+		finally:
+			self.configurationLoad = None
+		# Add the armour and characters to the registry
+		damageTypes = self.registry.damageTypes
+		applyMessages, characterIDs, self.loadedArmourDefinitions = E.applyConfiguration(self.registry, parsed, self.loadedArmourDefinitions)
+		# The rows need other damage buttons if the configuration declared other damage types
+		if damageTypes != self.registry.damageTypes:
+			self.clearRows()
+		for message in messages + applyMessages:
+			O.warning(message)
+		self.watcher.watchConfiguration(parsed, characterIDs)
+		# Set the path for the current armour file
+		for entry in parsed:
+			if entry[0] == "armour" and not None == entry[-1]:
+				self.armour = entry[1]
+		# Add the characters to the character list
+		for characterID in characterIDs:
+			self.roster.append(characterID)
+			self.characterInputs[characterID] = ["", "", "0"]
+		self.layoutRows()
+		self.publishState()
+		self.snapshotSession()
+		
+		O.info(len(characterIDs), " characters loaded.")
+	
+	# Updates the scroll frame to match the size of the canvas.
+	def updateFrame(self, event=None):
+		self.canvas.itemconfig(self.scrollFrameID, width=self.canvas.winfo_width(), height=self.canvas.winfo_height())
+		# The canvas may show more rows now
+		self.renderScheduler.schedule(self.refreshRows)
+	
+	# Scrolls the character list with the mouse wheel.
+	def scrollMouse(self, event=None):
+		self.setFirstRow(self.firstRow + int(-1*(event.delta/120)))
+	
+	# Calculates the reduced damage.
+	# 
+	# @param characterID ID of the character whose stats to reference.
+	# @param attackInput Input field for the attack roll.
+	# @param damageInput Input field for the damage roll.
+	# @param damageType Type of the damage, one of the damage types of the registry.
+	# @param reducedDamageLabel Label to display the calculated reduced damage.
+	def calculateDamage(self, characterID, attackInput, damageInput, damageType, reducedDamageLabel, event=None):
+		# Check if the damage type is defined
+		if not damageType in self.registry.damageTypeIndex:
+			# This should never happen.
+			O.error("Error: Damage type ", damageType, " is undefined.")
+			return
+		attackRoll = int(attackInput.get())
+		damage = int(damageInput.get())
+		# Look up the character in the registry
+		characterEntry = self.registry.getCharacter(characterID)
+		# Subtract the precompiled reduction of the hit slot from the damage total
+		reducedDamage = self.registry.resolveHit(characterEntry, attackRoll, damage, damageType)
+		slot = self.registry.hitLocation(attackRoll)
+		O.debug(characterEntry.name, " is hit on their ", E.SLOT_NAMES[slot], ".")
+		if O.traceLayers:
+			layers = self.traceLayers(characterEntry, slot, damageType)
+			O.event("hit", character=characterEntry.name, attack=attackRoll, damage=damage, type=damageType, slot=E.SLOT_NAMES[slot], reduced=reducedDamage, layers=layers)
+		else:
+			O.event("hit", character=characterEntry.name, attack=attackRoll, damage=damage, type=damageType, slot=E.SLOT_NAMES[slot], reduced=reducedDamage)
+		# Update label
+		self.characterInputs[characterID][0] = attackInput.get()
+		self.characterInputs[characterID][1] = damageInput.get()
+		self.characterInputs[characterID][2] = str(reducedDamage)
+		reducedDamageLabel.config(text=reducedDamage)
+		self.journalInputs(characterID)
+	
+	# Traces the reduction of every armour layer of a slot.
+	# 
+	# @param character The Character.
+	# @param slot The index of the slot in E.SLOT_NAMES.
+	# @param damageType The name of the damage type.
+	# @return List of [armour name, reduction] for each layer. Undefined armour reduces nothing.
+	def traceLayers(self, character, slot, damageType):
+		layers = []
+		for armourID in character.loadout[slot]:
+			armourName = self.registry.armourNames[armourID]
+			armourType = self.registry.armour.get(armourName)
+			reduction = 0 if None == armourType else armourType.reduction(self.registry, damageType)
+			O.debug("\t", armourName, " reduces ", damageType, " damage by ", reduction, ".")
+			layers.append([armourName, reduction])
+		return layers
+	
+	# Opens a dialogue for resolving a volley of attacks at once.
+	# Each line of a volley describes one attack in the format "CHARACTER NAME ATTACK DAMAGE DAMAGE TYPE", for example:
+	#	Tav 17 12 slashing
+	# The volley can be pasted or imported from a text file.
+	def openVolleyDialogue(self, event=None):
+		# Create window for the dialogue
+		dialogue = tk.Toplevel(master=self.window, bg=self.bgc)
+		dialogue.title("HBA volley")
+		dialogue.rowconfigure(1, weight=1)
+		dialogue.columnconfigure(0, weight=1)
+		dialogue.columnconfigure(1, weight=1)
+		# Create button for importing a volley from a file
+		importButton = tk.Button(master=dialogue, bg=self.bgc, text=u"\U0001F4C2", font=(self.font, self.cfsize))
+		importButton.grid(row=0, column=0, sticky="NESW")
+		# Create button for resolving the volley
+		applyButton = tk.Button(master=dialogue, bg=self.bgc, text=u"\U0001F3AF", font=(self.font, self.cfsize))
+		applyButton.grid(row=0, column=1, sticky="NESW")
+		# Create input field for the volley
+		volleyInput = tk.Text(master=dialogue, bg=self.bgc, fg=self.fgc, insertbackground=self.fgc, font=(self.font, self.glfsize), width=40)
+		volleyInput.grid(row=1, column=0, sticky="NESW")
+		# Create field that displays the reduced damage of each attack
+		resultOutput = tk.Text(master=dialogue, bg=self.bgc, fg=self.fgc, font=(self.font, self.glfsize), width=40, state="disabled")
+		resultOutput.grid(row=1, column=1, sticky="NESW")
+		importButton.bind("<Button-1>", lambda event: self.importVolley(volleyInput))
+		applyButton.bind("<Button-1>", lambda event: self.applyVolley(volleyInput.get("1.0", "end"), resultOutput))
+	
+	# Imports a volley from a text file into the input field of the volley dialogue.
+	# 
+	# @param volleyInput The input field of the volley.
+	def importVolley(self, volleyInput, event=None):
+		volley = tk.filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All files", "*")])
+		# If no file was selected, don't import anything
+		if volley == "" or volley == ():
+			O.info("No volley file selected.")
+			return
+		volleyFile = open(volley, "r")
+		volleyInput.delete("1.0", "end")
+		volleyInput.insert("1.0", volleyFile.read())
+		volleyFile.close()
+	
+	# Resolves all attacks of a volley in one step.
+	# The reduced damage label of every hit character shows the total damage it takes from the volley.
+	# 
+	# @param volley The text of the volley.
+	# @param resultOutput Field to display the reduced damage of each attack.
+	def applyVolley(self, volley, resultOutput, event=None):
+		records, messages = E.parseAttacks(volley.splitlines(), self.registry.damageTypeIndex)
+		characterIDs, reducedDamage, unknown, resolved = B.resolveRecords(self.batchResolver, records)
+		messages.extend(unknown)
+		# Sum up the damage each character takes
+		totals = np.bincount(np.asarray(characterIDs, dtype=np.intp), weights=reducedDamage, minlength=self.registry.nextCharacterID)
+		for characterID in set(characterIDs):
+			self.characterInputs[characterID][2] = str(int(totals[characterID]))
+			self.updateRow(characterID)
+			self.journalInputs(characterID)
+		# Record a compact event for each hit
+		if O.recording():
+			for record, damage in zip(resolved, reducedDamage.tolist()):
+				O.event("hit", character=record[0], attack=record[1], damage=record[2], type=record[3], slot=E.SLOT_NAMES[self.registry.hitLocation(record[1])], reduced=damage)
+		# Display the result of each attack
+		lines = [self.characters[characterID].name + ": " + str(damage) for characterID, damage in zip(characterIDs, reducedDamage.tolist())]
+		resultOutput.config(state="normal")
+		resultOutput.delete("1.0", "end")
+		resultOutput.insert("1.0", "\n".join(messages + lines))
+		resultOutput.config(state="disabled")
+		O.info("Volley of ", len(characterIDs), " attacks resolved.")
+	
+	# Starts or stops applying changes of the loaded armour and character files.
+	def toggleWatching(self, event=None):
+		if None == self.pollJob:
+			self.pollJob = self.window.after(W.POLL_INTERVAL, self.pollFiles)
+			self.watchButton.config(relief="sunken")
+			O.info("Watching the loaded files for changes.")
+		else:
+			self.window.after_cancel(self.pollJob)
+			self.pollJob = None
+			self.watchButton.config(relief="raised")
+			O.info("Stopped watching the loaded files.")
+	
+	# Applies the changes of the watched files and updates the rows of the changed characters in place.
+	def pollFiles(self):
+		messages, characterIDs, armourChanged = self.watcher.update()
+		for message in messages:
+			O.warning(message)
+		for characterID in characterIDs:
+			self.updateRow(characterID)
+			self.journalCharacter(characterID)
+		if armourChanged:
+			self.loadedArmourDefinitions = self.registry.definitions
+			self.snapshotSession()
+		if armourChanged or len(characterIDs) > 0:
+			self.publishState()
+		self.pollJob = self.window.after(W.POLL_INTERVAL, self.pollFiles)
+	
+	# Starts or stops the server sharing the armour and characters with other devices.
+	def toggleServer(self, event=None):
+		if not None == self.server:
+			self.server.stop()
+			self.server = None
+			self.serverButton.config(relief="raised")
+			O.info("Server stopped.")
+			return
+		server = V.Server(self.registry)
+		try:
+			server.startThread()
+		except OSError as error:
+			O.error("Server couldn't be started: ", error)
+			return
+		self.server = server
+		self.serverButton.config(relief="sunken")
+		O.info("Serving on ", V.HOST, ":", V.PORT)
+	
+	# Publishes the state of the registry to the server after it changed.
+	def publishState(self):
+		if not None == self.server:
+			self.server.publish(self.registry)
+	
+	# Turns the instrumentation of the hot methods and the sampling of the event loop lag on or off.
+	# While it is off, the methods of the class are called directly, so it costs nothing.
+	# 
+	# @param enabled Whether instrumentation is on.
+	def setProfiling(self, enabled):
+		if enabled:
+			P.instrument(self, PROFILED_METHODS, "HBA.")
+			P.instrument(self.renderScheduler, ["run"], "RenderScheduler.")
+			P.instrument(self.window, ["update_idletasks"], "Tk.")
+			self.lagMonitor.start()
+			O.info("Instrumentation on.")
+		else:
+			P.uninstrument()
+			self.lagMonitor.stop()
+			O.info("Instrumentation off.")
+		self.profileButton.config(relief="sunken" if enabled else "raised")
+	
+	# Opens a dialogue showing the p50 and p99 latencies of the instrumented methods and the lag of the event loop.
+	# Its buttons turn instrumentation on and off, capture cProfile or tracemalloc profiles to a file,
+	# clear the latencies and save them as JSON.
+	def openProfileDialogue(self, event=None):
+		if not None == self.profileDialogue:
+			self.profileDialogue.lift()
+			return
+		# Create window for the dialogue
+		dialogue = tk.Toplevel(master=self.window, bg=self.bgc)
+		dialogue.title("HBA profile")
+		dialogue.rowconfigure(1, weight=1)
+		for column in range(5):
+			dialogue.columnconfigure(column, weight=1)
+		self.profileDialogue = dialogue
+		# Create button for turning instrumentation on and off: ⏱ (23F1)
+		instrumentButton = tk.Button(master=dialogue, bg=self.bgc, text=u"\U000023F1", font=(self.font, self.cfsize))
+		instrumentButton.grid(row=0, column=0, sticky="NESW")
+		instrumentButton.bind("<Button-1>", lambda event: self.setProfiling(not P.instrumenting()))
+		# Create buttons for capturing profiles
+		cProfileButton = tk.Button(master=dialogue, bg=self.bgc, fg=self.fgc, text="cProfile", font=(self.font, self.glfsize))
+		cProfileButton.grid(row=0, column=1, sticky="NESW")
+		cProfileButton.bind("<Button-1>", lambda event: self.toggleCapture("cprofile"))
+		tracemallocButton = tk.Button(master=dialogue, bg=self.bgc, fg=self.fgc, text="tracemalloc", font=(self.font, self.glfsize))
+		tracemallocButton.grid(row=0, column=2, sticky="NESW")
+		tracemallocButton.bind("<Button-1>", lambda event: self.toggleCapture("tracemalloc"))
+		# Create button for clearing the latencies: ↺ (21BA)
+		resetButton = tk.Button(master=dialogue, bg=self.bgc, text=u"\U000021BA", font=(self.font, self.cfsize))
+		resetButton.grid(row=0, column=3, sticky="NESW")
+		resetButton.bind("<Button-1>", lambda event: P.reset())
+		# Create button for saving the latencies: 💾 (1F4BE)
+		saveButton = tk.Button(master=dialogue, bg=self.bgc, text=u"\U0001F4BE", font=(self.font, self.cfsize))
+		saveButton.grid(row=0, column=4, sticky="NESW")
+		saveButton.bind("<Button-1>", lambda event: self.saveProfile())
+		# Create field that displays the latencies
+		profileOutput = tk.Text(master=dialogue, bg=self.bgc, fg=self.fgc, font=("Courier", self.glfsize), width=74, height=16, state="disabled")
+		profileOutput.grid(row=1, column=0, columnspan=5, sticky="NESW")
+		dialogue.protocol("WM_DELETE_WINDOW", self.closeProfileDialogue)
+		self.refreshProfile(profileOutput, instrumentButton, cProfileButton, tracemallocButton)
+	
+	# Shows the current latencies in the profile dialogue and refreshes them once per second.
+	# 
+	# @param profileOutput Field to display the latencies.
+	# @param instrumentButton Button for turning instrumentation on and off.
+	# @param cProfileButton Button for capturing a cProfile profile.
+	# @param tracemallocButton Button for capturing a tracemalloc profile.
+	def refreshProfile(self, profileOutput, instrumentButton, cProfileButton, tracemallocButton):
+		lines = P.report() if P.instrumenting() or len(P.summaries()) > 0 else ["Instrumentation is off. Press " + u"\U000023F1" + " to record latencies."]
+		profileOutput.config(state="normal")
+		profileOutput.delete("1.0", "end")
+		profileOutput.insert("1.0", "\n".join(lines))
+		profileOutput.config(state="disabled")
+		instrumentButton.config(relief="sunken" if P.instrumenting() else "raised")
+		cProfileButton.config(relief="sunken" if P.capturing() == "cprofile" else "raised")
+		tracemallocButton.config(relief="sunken" if P.capturing() == "tracemalloc" else "raised")
+		self.profileJob = self.window.after(1000, lambda: self.refreshProfile(profileOutput, instrumentButton, cProfileButton, tracemallocButton))
+	
+	# Closes the profile dialogue. Instrumentation and captures keep running.
+	def closeProfileDialogue(self):
+		if not None == self.profileJob:
+			self.window.after_cancel(self.profileJob)
+			self.profileJob = None
+		self.profileDialogue.destroy()
+		self.profileDialogue = None
+	
+	# Starts capturing a profile or stops the running capture and writes it to its file.
+	# 
+	# @param kind "cprofile" or "tracemalloc".
+	def toggleCapture(self, kind):
+		if P.capturing() == kind:
+			O.info("Profile written to ", P.stopCapture(), ".")
+			return
+		extension = ".prof" if kind == "cprofile" else ".txt"
+		path = tk.filedialog.asksaveasfilename(defaultextension=extension, filetypes=[(kind + " profiles", "*" + extension)])
+		# If no file was selected, don't capture
+		if path == "" or path == ():
+			O.info("No profile file selected.")
+			return
+		# Only one profile is captured at a time
+		previous = P.stopCapture()
+		if not None == previous:
+			O.info("Profile written to ", previous, ".")
+		P.startCapture(kind, path)
+		O.info("Capturing ", kind, " until the button is pressed again.")
+	
+	# Saves the latencies to a JSON file.
+	def saveProfile(self, event=None):
+		path = tk.filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+		# If no file was selected, don't save
+		if path == "" or path == ():
+			O.info("No file selected.")
+			return
+		try:
+			P.dump(path)
+		except OSError as error:
+			O.error("Latencies couldn't be saved: ", error)
+			return
+		O.info("Latencies saved to ", path, ".")
+	
+	# Saves the session to a file.
+	# 
+	# @param path The path of the session file. If no path is given, the user will be prompted for a file dialogue.
+	def saveSettings(self, path=None, event=None):
+		if None == path:
+			path = tk.filedialog.asksaveasfilename(defaultextension=".hbs", filetypes=[("HBA sessions", "*.hbs")])
+			# If no file was selected, don't save
+			if path == "" or path == ():
+				O.info("No session file selected.")
+				return
+		try:
+			J.writeSnapshot(path, self.captureSession())
+		except OSError as error:
+			O.error("Session couldn't be saved: ", error)
+			return
+		O.info("Session saved to ", path, ".")
+	
+	# Restores a session from a file, replacing the armour and characters.
+	# 
+	# @param path The path of the session file.
+	# @return Whether the session was restored.
+	def restoreSession(self, path):
+		state = J.readSession(path)
+		if None == state:
+			O.warning("Session file: \"", path, "\" couldn't be read.")
+			return False
+		# Restore into a new registry, so nothing of the current session is left over
+		registry = E.Registry()
+		try:
+			order, inputs, messages = J.restoreState(registry, state)
+		except ValueError as error:
+			O.error("Session couldn't be restored: ", error)
+			return False
+		for message in messages:
+			O.warning(message)
+		self.registry = registry
+		self.batchResolver = B.BatchResolver(registry)
+		self.armourIndex = I.ArmourIndex(registry)
+		# Restored sessions don't refer to the files they were loaded from
+		self.watcher = W.Watcher(registry)
+		self.characters = registry.characters
+		self.loadedArmourDefinitions = state["definitions"]
+		if not None == state["armour"]:
+			self.armour = state["armour"]
+		# Rows are created again, as the damage types might have changed
+		self.clearRows()
+		self.roster = E.Roster(order)
+		self.characterInputs = inputs
+		self.layoutRows()
+		self.publishState()
+		# The character IDs changed, so the autosave starts with a new snapshot
+		self.snapshotSession()
+		O.info("Session with ", len(order), " characters restored.")
+		return True
+	
+	# Captures the state of the session.
+	# 
+	# @return The state as returned by J.captureState.
+	def captureSession(self):
+		for row in self.boundRows.values():
+			self.storeRow(row)
+		return J.captureState(self.registry, self.roster.getOrder(), self.characterInputs, self.armour)
+	
+	# Writes a snapshot of the session to the autosave. Used after changes affecting many characters.
+	def snapshotSession(self):
+		if not None == self.session:
+			try:
+				self.session.reset(self.captureSession())
+			except OSError as error:
+				O.error("Session couldn't be autosaved: ", error)
+	
+	# Appends the armour and hit points of a character to the journal of the autosave.
+	# 
+	# @param characterID The ID of the character.
+	def journalCharacter(self, characterID):
+		if not None == self.session:
+			self.session.record(J.characterRecord(self.registry, characterID))
+	
+	# Appends the inputs of a character to the journal of the autosave.
+	# 
+	# @param characterID The ID of the character.
+	def journalInputs(self, characterID):
+		if not None == self.session:
+			self.session.record(("inputs", characterID, self.characterInputs[characterID]))
+	
+	# Callback for quitting the program
+	def quit(self, event=None):
+		#for scene in self.players:
+		#	for player in scene:
+		#		player.terminate()
+		#time.sleep(0.5)
+		#L.pln(threading.enumerate())
+		self.loader.shutdown(wait=False)
+		if not None == self.server:
+			self.server.stop()
+		self.renderScheduler.cancel()
+		# Write the latencies and the running capture before the window is gone
+		self.lagMonitor.stop()
+		if not None == self.profileJob:
+			self.window.after_cancel(self.profileJob)
+			self.profileJob = None
+		if P.instrumenting():
+			for line in P.report():
+				O.info(line)
+		path = P.stopCapture()
+		if not None == path:
+			O.info("Profile written to ", path, ".")
+		O.closeEvents()
+		# Compact the autosave, so the session is restored quickly on the next start
+		if not None == self.session:
+			try:
+				self.session.reset(self.captureSession())
+				self.session.close()
+			except OSError as error:
+				O.error("Session couldn't be autosaved: ", error)
+		self.window.destroy()
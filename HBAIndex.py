@@ -0,0 +1,173 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAIndex indexes the armour types of a registry, so the armour browser can search a library of tens of thousands of armour types as the user types.
+# A query is a list of words. Comparisons like "slashing>=4" or "piercing <= 2" select a range of the reduction of a damage type;
+# all other words must be part of the name. Armour types whose name starts with the first word are listed first, in alphabetical order,
+# then all other matches in the order of the library.
+# Names starting with a prefix are found by binary search in the sorted names, which works like a trie without its memory.
+# When a query extends a recent one, like when typing another letter, only the matches of that query are searched again.
+# The reductions are stacked into one NumPy array, so range queries don't loop over the armour types.
+
+# Changelog
+# 2026-10-16: Initial version
+
+import bisect
+import re
+import numpy as np
+import HBAEngine as E
+
+# Comparison of the reduction of a damage type, for example "slashing>=4"
+COMPARISON = re.compile(r"^(\w+)(>=|<=|>|<|=)(\d+)$")
+# Operators with spaces around them, so "slashing >= 4" is one word
+OPERATOR = re.compile(r"\s*(>=|<=|>|<|=)\s*")
+# Number of recent name searches whose matches are kept
+RECENT_SEARCHES = 16
+
+# Parses a query.
+# 
+# @param query The text of the query.
+# @param damageTypeIndex Column of each damage type.
+# @return Tuple of the lower case words the names must contain and a dictionary with the range [lowest, highest] of the reduction keyed by column.
+def parseQuery(query, damageTypeIndex):
+	query = OPERATOR.sub(r"\1", query.replace(u"≥", ">=").replace(u"≤", "<="))
+	terms = []
+	ranges = {}
+	for word in query.split():
+		match = COMPARISON.match(word)
+		if None == match or not match.group(1) in damageTypeIndex:
+			terms.append(word.lower())
+			continue
+		damageType, operator, value = match.groups()
+		value = int(value)
+		lowest, highest = ranges.get(damageTypeIndex[damageType], [0, E.MAX_REDUCTION])
+		if operator == ">=":
+			lowest = max(lowest, value)
+		elif operator == ">":
+			lowest = max(lowest, value + 1)
+		elif operator == "<=":
+			highest = min(highest, value)
+		elif operator == "<":
+			highest = min(highest, value - 1)
+		else:
+			lowest = max(lowest, value)
+			highest = min(highest, value)
+		ranges[damageTypeIndex[damageType]] = [lowest, highest]
+	return terms, ranges
+
+# Index of the armour types of a registry.
+# It is rebuilt lazily whenever the armour definitions or damage types of the registry changed.
+class ArmourIndex:
+	# Constructor method
+	# 
+	# @param registry The registry holding the armour types.
+	def __init__(self, registry):
+		self.registry = registry
+		# Armour types, definitions and damage types of the registry the index was built from
+		self.armour = None
+		self.definitions = None
+		self.damageTypes = None
+		# Armour types in the order of the library
+		self.armourTypes = []
+		# Lower case name of each armour type
+		self.lowerNames = []
+		# Lower case names in alphabetical order and an array with the row of each of them
+		self.sortedNames = []
+		self.sortedRows = None
+		# Reductions with the shape (armour types, damage types)
+		self.reductions = None
+		# Matching rows of recent name searches keyed by their words, used when the next query extends one of them: [list, array]
+		self.recent = {}
+	
+	# Rebuilds the index if the armour of the registry changed.
+	def refresh(self):
+		registry = self.registry
+		if self.armour is registry.armour and self.definitions is registry.definitions and self.damageTypes == registry.damageTypes:
+			return
+		self.armour = registry.armour
+		self.definitions = registry.definitions
+		self.damageTypes = list(registry.damageTypes)
+		self.armourTypes = list(registry.armour.values())
+		self.lowerNames = [armourType.name.lower() for armourType in self.armourTypes]
+		sortedRows = sorted(range(len(self.lowerNames)), key=self.lowerNames.__getitem__)
+		self.sortedNames = [self.lowerNames[row] for row in sortedRows]
+		self.sortedRows = np.array(sortedRows, dtype=np.intp)
+		reductions = b"".join([armourType.reductions.tobytes() for armourType in self.armourTypes])
+		self.reductions = np.frombuffer(reductions, dtype=np.int16).reshape(len(self.armourTypes), len(self.damageTypes))
+		self.recent = {}
+	
+	# Gets the number of indexed armour types.
+	def __len__(self):
+		self.refresh()
+		return len(self.armourTypes)
+	
+	# Finds the rows whose name contains all words.
+	# 
+	# @param terms The lower case words.
+	# @return Array with the rows in the order of the library.
+	def findNames(self, terms):
+		key = tuple(terms)
+		if key in self.recent:
+			return self.recent[key][1]
+		# Typing extends the words of a recent query, so only its matches can still match.
+		# They contain its words already, so only the words that changed are checked.
+		rows = range(len(self.lowerNames))
+		remaining = terms
+		for recentTerms, (recentRows, recentMatches) in self.recent.items():
+			if len(recentTerms) <= len(terms) and len(recentRows) < len(rows) and all(old in new for old, new in zip(recentTerms, terms)):
+				rows = recentRows
+				remaining = [term for index, term in enumerate(terms) if index >= len(recentTerms) or term != recentTerms[index]]
+		lowerNames = self.lowerNames
+		for term in remaining:
+			rows = [row for row in rows if term in lowerNames[row]]
+		matches = np.array(rows, dtype=np.intp)
+		if len(self.recent) >= RECENT_SEARCHES:
+			del self.recent[next(iter(self.recent))]
+		# The rows are kept as list as well, since iterating over a list is faster than over an array
+		self.recent[key] = [rows, matches]
+		return matches
+	
+	# Finds the rows whose name starts with a prefix.
+	# 
+	# @param prefix The lower case prefix.
+	# @return Array with the rows in alphabetical order.
+	def findPrefix(self, prefix):
+		first = bisect.bisect_left(self.sortedNames, prefix)
+		last = bisect.bisect_left(self.sortedNames, prefix[:-1] + chr(ord(prefix[-1]) + 1), first)
+		return self.sortedRows[first:last]
+	
+	# Searches the armour types.
+	# 
+	# @param query The text of the query, see parseQuery.
+	# @return Array with the rows of the matching armour types: names starting with the first word in alphabetical order, then the others in the order of the library.
+	def search(self, query):
+		self.refresh()
+		terms, ranges = parseQuery(query, self.registry.damageTypeIndex)
+		if len(terms) == 0:
+			rows = np.arange(len(self.armourTypes))
+		else:
+			matches = self.findNames(terms)
+			prefixRows = self.findPrefix(terms[0])
+			# Every name starting with the first word contains it, but it may not contain the other words
+			if len(terms) > 1 and len(prefixRows) > 0:
+				matching = np.zeros(len(self.armourTypes), dtype=bool)
+				matching[matches] = True
+				prefixRows = prefixRows[matching[prefixRows]]
+			if len(prefixRows) == len(matches):
+				rows = prefixRows
+			else:
+				isPrefix = np.zeros(len(self.armourTypes), dtype=bool)
+				isPrefix[prefixRows] = True
+				rows = np.concatenate([prefixRows, matches[~isPrefix[matches]]])
+		for column, (lowest, highest) in ranges.items():
+			reductions = self.reductions[rows, column]
+			rows = rows[(reductions >= lowest) & (reductions <= highest)]
+		return rows
+	
+	# Gets an armour type of the index.
+	# 
+	# @param row The row of the armour type as returned by search.
+	# @return The ArmourType.
+	def get(self, row):
+		return self.armourTypes[row]
@@ -0,0 +1,168 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBALog writes the messages of HomebrewArmour with levels and records the combat log as structured events.
+# A message is only formatted if its level is enabled, so disabled messages cost no more than the call.
+# The minimum level is set with the environment variable HBA_LOG_LEVEL (trace, debug, info, warning or error; default: info).
+# Events, like the result of each hit, are written as JSON lines to the file given by HBA_EVENT_LOG. They are buffered and written in blocks.
+# Setting HBA_TRACE_LAYERS=1 adds the reduction of every armour layer to each hit event and writes it as a debug message;
+# otherwise, a hit is only recorded as one compact event.
+
+# Changelog
+# 2026-10-16: Initial version
+
+import atexit
+import json
+import os
+import sys
+import time
+
+# Levels of messages
+TRACE = 5
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"trace": TRACE, "debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+# Number of events that are buffered before they are written
+EVENT_BUFFER = 256
+
+# Minimum level of the messages that are written
+level = LEVELS.get(os.environ.get("HBA_LOG_LEVEL", "info").lower(), INFO)
+# Whether the reduction of every armour layer is traced for each hit
+traceLayers = os.environ.get("HBA_TRACE_LAYERS", "0") != "0"
+# Path of the file events are written to (None if events aren't recorded)
+EVENT_LOG = os.environ.get("HBA_EVENT_LOG")
+
+# Writes a message to the standard error, so messages of headless commands don't mix with their output (like JSON).
+# 
+# @param text The message.
+def writeConsole(text):
+	sys.stderr.write(text + "\n")
+
+# Function writing a message to the console, for example LFLib's pln in the GUI
+console = writeConsole
+# Sink of the recorded events (None if events aren't recorded)
+sink = None
+
+# Buffered sink writing events as JSON lines.
+class EventSink:
+	# Constructor method
+	# 
+	# @param path The path of the file the events are appended to.
+	# @param bufferSize The number of events that are buffered before they are written.
+	def __init__(self, path, bufferSize=EVENT_BUFFER):
+		self.file = open(path, "a")
+		self.bufferSize = bufferSize
+		# Encoded events that weren't written yet
+		self.buffer = []
+	
+	# Records an event.
+	# 
+	# @param event The event as a dictionary of JSON types.
+	def write(self, event):
+		self.buffer.append(json.dumps(event))
+		if len(self.buffer) >= self.bufferSize:
+			self.flush()
+	
+	# Writes the buffered events.
+	def flush(self):
+		if len(self.buffer) > 0:
+			self.file.write("\n".join(self.buffer) + "\n")
+			self.file.flush()
+			self.buffer = []
+	
+	# Writes the buffered events and closes the file.
+	def close(self):
+		self.flush()
+		self.file.close()
+
+# Sets the minimum level of the messages that are written.
+# 
+# @param newLevel One of the levels or its name.
+def setLevel(newLevel):
+	global level
+	level = LEVELS[newLevel.lower()] if isinstance(newLevel, str) else newLevel
+
+# Checks whether messages of a level are written. Used to skip work that is only needed for a message.
+# 
+# @param messageLevel The level of the message.
+# @return Whether the message would be written.
+def enabled(messageLevel):
+	return messageLevel >= level
+
+# Writes a message if its level is enabled.
+# 
+# @param messageLevel The level of the message.
+# @param parts The parts of the message. They are only converted to text and joined if the message is written.
+def log(messageLevel, *parts):
+	if messageLevel >= level:
+		console("".join([str(part) for part in parts]))
+
+# Writes a message with the level TRACE.
+# 
+# @param parts The parts of the message.
+def trace(*parts):
+	if TRACE >= level:
+		log(TRACE, *parts)
+
+# Writes a message with the level DEBUG.
+# 
+# @param parts The parts of the message.
+def debug(*parts):
+	if DEBUG >= level:
+		log(DEBUG, *parts)
+
+# Writes a message with the level INFO.
+# 
+# @param parts The parts of the message.
+def info(*parts):
+	if INFO >= level:
+		log(INFO, *parts)
+
+# Writes a message with the level WARNING.
+# 
+# @param parts The parts of the message.
+def warning(*parts):
+	if WARNING >= level:
+		log(WARNING, *parts)
+
+# Writes a message with the level ERROR.
+# 
+# @param parts The parts of the message.
+def error(*parts):
+	if ERROR >= level:
+		log(ERROR, *parts)
+
+# Starts recording events to a file. The buffered events are written when the program exits.
+# 
+# @param path The path of the file the events are appended to.
+def openEvents(path):
+	global sink
+	closeEvents()
+	sink = EventSink(path)
+	atexit.register(closeEvents)
+
+# Writes the buffered events and stops recording events.
+def closeEvents():
+	global sink
+	if not None == sink:
+		sink.close()
+		sink = None
+
+# Checks whether events are recorded. Used to skip work that is only needed for an event.
+# 
+# @return Whether events are recorded.
+def recording():
+	return not None == sink
+
+# Records an event if events are recorded.
+# 
+# @param kind The kind of the event, for example "hit".
+# @param fields The data of the event. Values must be JSON types.
+def event(kind, **fields):
+	if not None == sink:
+		fields["event"] = kind
+		fields["time"] = time.time()
+		sink.write(fields)
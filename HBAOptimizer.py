@@ -0,0 +1,247 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAOptimizer searches the armour library for the layers of each slot that minimize the expected damage against a threat profile,
+# for example 40 % slashing and 30 % piercing attacks with 1d8+2 damage.
+# Every slot is searched separately with a branch and bound search:
+#	- armour that is worse than at least as many other armour types as a slot can hold layers is never needed and is removed first
+#	- a branch is cut as soon as even the best remaining armour can't beat the best combination found so far
+#	- the expected damage of each total reduction is only calculated once
+# Slots can optionally be searched in parallel.
+# 
+# Usage: python HomebrewArmour.py optimize LIBRARY --threat slashing=40 --threat piercing=30 --damage 1d8+2 --max-layers 3
+
+# Changelog
+# 2026-10-16: Messages about the loaded files are written through HBALog
+# 2026-10-16: Damage types and hit locations are taken from the registry
+# 2026-10-16: Initial version
+
+import argparse
+import concurrent.futures
+import json
+import numpy as np
+import HBACache as C
+import HBAEngine as E
+import HBALog as O
+import HBAStats as S
+
+# Expected damage of a hit after the reduction of a slot, for a threat profile.
+class ThreatProfile:
+	# Constructor method
+	# 
+	# @param weights Dictionary with the share of each damage type in the attacks. The shares are normalized to sum up to 1.
+	# @param dice The damage roll of an attack without the damage type, for example "1d8+2".
+	# @param damageTypes List of the damage types in the order of the reductions, by default the built-in damage types.
+	def __init__(self, weights, dice, damageTypes=E.DAMAGE_TYPES):
+		total = sum(weights.values())
+		if total <= 0:
+			raise ValueError("The threat profile must contain at least one damage type with a positive share.")
+		self.weights = [weights.get(damageType, 0) / total for damageType in damageTypes]
+		self.dice = "".join(dice.split())
+		lowest, probabilities = S.rollDistribution(self.dice)
+		values = np.arange(lowest, lowest + len(probabilities))
+		# Reductions above the highest possible damage don't change anything
+		self.maxReduction = max(int(values[-1]), 0)
+		# Expected damage after each reduction from 0 to maxReduction
+		self.expected = [float(np.dot(np.maximum(values - reduction, 0), probabilities)) for reduction in range(self.maxReduction + 1)]
+		# Memoized scores keyed by the (capped) reduction vector
+		self.scores = {}
+	
+	# Calculates the expected damage of a hit for the total reductions of a slot.
+	# 
+	# @param reductions The total reduction of each damage type as a tuple.
+	# @return The expected damage.
+	def score(self, reductions):
+		key = tuple(min(reduction, self.maxReduction) for reduction in reductions)
+		score = self.scores.get(key)
+		if None == score:
+			score = 0
+			for weight, reduction in zip(self.weights, key):
+				if weight > 0:
+					score += weight * self.expected[reduction]
+			self.scores[key] = score
+		return score
+
+# Removes armour types that are never needed.
+# An armour type that is worse or equal on every damage type than at least maxLayers other armour types can always be swapped for one of them
+# that isn't worn yet, so it is never part of a best combination. Of armour types with identical stats, the first ones are kept.
+# 
+# @param candidates List of ArmourType.
+# @param maxLayers The maximum number of layers of the slot.
+# @return List of the remaining ArmourType.
+def removeDominated(candidates, maxLayers):
+	remaining = []
+	for index, candidate in enumerate(candidates):
+		dominators = 0
+		for otherIndex, other in enumerate(candidates):
+			if otherIndex == index:
+				continue
+			better = True
+			strictlyBetter = False
+			for otherReduction, reduction in zip(other.reductions, candidate.reductions):
+				if otherReduction < reduction:
+					better = False
+					break
+				if otherReduction > reduction:
+					strictlyBetter = True
+			# Identical armour only counts if it comes first, so one of them is kept
+			if better and (strictlyBetter or otherIndex < index):
+				dominators += 1
+				if dominators >= maxLayers:
+					break
+		if dominators < maxLayers:
+			remaining.append(candidate)
+	return remaining
+
+# Searches the best combination of armour layers for a slot.
+# 
+# @param library List of ArmourType that may be worn.
+# @param profile The ThreatProfile to minimize the expected damage for.
+# @param maxLayers The maximum number of layers.
+# @return Tuple of the names of the best layers and their expected damage per hit. Of equally good combinations, the one with fewer layers is preferred.
+def optimizeSlot(library, profile, maxLayers):
+	candidates = removeDominated(library, maxLayers)
+	vectors = [tuple(armourType.reductions) for armourType in candidates]
+	# Try the armour that is best on its own first, so good combinations are found early
+	order = sorted(range(len(candidates)), key=lambda index: profile.score(vectors[index]))
+	vectors = [vectors[index] for index in order]
+	names = [candidates[index].name for index in order]
+	# Best reduction of each damage type among the remaining armour from each position on
+	bestRemaining = [(0,) * len(profile.weights)] * (len(vectors) + 1)
+	for index in range(len(vectors) - 1, -1, -1):
+		bestRemaining[index] = tuple(max(a, b) for a, b in zip(vectors[index], bestRemaining[index + 1]))
+	best = [profile.score((0,) * len(profile.weights)), []]
+	chosen = []
+	
+	# Depth-first search over including or excluding each armour type
+	def search(position, reductions):
+		score = profile.score(reductions)
+		if score < best[0] or (score == best[0] and len(chosen) < len(best[1])):
+			best[0] = score
+			best[1] = list(chosen)
+		if len(chosen) == maxLayers or position == len(vectors):
+			return
+		# Bound: even the best remaining armour on every free layer can't beat the best combination
+		freeLayers = maxLayers - len(chosen)
+		bound = profile.score(tuple(reduction + freeLayers * remaining for reduction, remaining in zip(reductions, bestRemaining[position])))
+		if bound >= best[0]:
+			return
+		for index in range(position, len(vectors)):
+			chosen.append(index)
+			search(index + 1, tuple(a + b for a, b in zip(reductions, vectors[index])))
+			chosen.pop()
+	
+	search(0, (0,) * len(profile.weights))
+	return [names[index] for index in best[1]], best[0]
+
+# Searches the best combination for a slot. This runs in a worker process when the slots are searched in parallel.
+# 
+# @param task Tuple of the armour library, the threat weights, the dice, the maximum number of layers and the damage types.
+# @return The result of optimizeSlot.
+def optimizeSlotTask(task):
+	library, weights, dice, maxLayers, damageTypes = task
+	return optimizeSlot(library, ThreatProfile(weights, dice, damageTypes), maxLayers)
+
+# Searches the best armour layers for every slot.
+# 
+# @param armourTypes List of ArmourType in the library.
+# @param weights Dictionary with the share of each damage type in the attacks.
+# @param dice The damage roll of an attack without the damage type, for example "1d8+2".
+# @param maxLayers Dictionary with the maximum number of layers of each slot in SLOT_NAMES.
+# @param forbidden Dictionary with the set of armour names that may not be worn on each slot in SLOT_NAMES.
+# @param processes The number of worker processes. With 1, all slots are searched in this process.
+# @param damageTypes List of the damage types in the order of the reductions of the armour types, by default the built-in damage types.
+# @return List with [layers, expected damage per hit on the slot] for each slot in SLOT_NAMES.
+def optimize(armourTypes, weights, dice, maxLayers, forbidden, processes=1, damageTypes=E.DAMAGE_TYPES):
+	tasks = []
+	for slotName in E.SLOT_NAMES:
+		library = [armourType for armourType in armourTypes if not armourType.name in forbidden.get(slotName, ())]
+		tasks.append((library, weights, dice, maxLayers[slotName], damageTypes))
+	# Slots with the same constraints have the same best combination
+	distinct = {}
+	for task in tasks:
+		distinct.setdefault((tuple(armourType.name for armourType in task[0]), task[3]), task)
+	if processes == 1:
+		profile = ThreatProfile(weights, dice, damageTypes)
+		results = [optimizeSlot(task[0], profile, task[3]) for task in distinct.values()]
+	else:
+		with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+			results = list(executor.map(optimizeSlotTask, distinct.values()))
+	resultsByKey = dict(zip(distinct.keys(), results))
+	return [list(resultsByKey[(tuple(armourType.name for armourType in task[0]), task[3])]) for task in tasks]
+
+# Parses "KEY=VALUE" arguments.
+# 
+# @param arguments List of arguments.
+# @param convert Function converting a value.
+# @return List of [key, converted value].
+def parseAssignments(arguments, convert):
+	assignments = []
+	for argument in arguments or []:
+		key, separator, value = argument.partition("=")
+		if separator == "":
+			raise ValueError("Argument \"" + argument + "\" must have the format KEY=VALUE.")
+		assignments.append([key.strip(), convert(value.strip())])
+	return assignments
+
+# Searches the best loadout for a library and prints it.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(prog="HomebrewArmour.py optimize", description="Search the armour layers of each slot that minimize the expected damage against a threat profile.")
+	parser.add_argument("library", help="an armour file (.hba) or a configuration file (.hacfg) whose armour and characters are used")
+	parser.add_argument("--threat", action="append", required=True, help="share of a damage type like slashing=40, can be given multiple times")
+	parser.add_argument("--damage", default="1d8+2", help="damage roll of an attack without the damage type (default: 1d8+2)")
+	parser.add_argument("--max-layers", type=int, default=3, help="maximum number of layers per slot (default: 3)")
+	parser.add_argument("--slot-max-layers", action="append", help="maximum number of layers of a single slot like hands=1")
+	parser.add_argument("--forbid", action="append", help="armour that may not be worn, optionally on a single slot like \"head=Platemail\"")
+	parser.add_argument("--processes", type=int, default=1, help="number of worker processes for searching the slots in parallel")
+	parser.add_argument("--json", action="store_true", help="print the result as JSON")
+	args = parser.parse_args(args)
+	registry = E.Registry()
+	if args.library.endswith(".hacfg"):
+		for message in E.loadConfiguration(registry, args.library):
+			O.warning(message)
+	else:
+		definitions, messages = C.cachedParse(args.library, E.parseArmourFile)
+		for message in messages:
+			O.warning(message)
+		registry.setArmourDefinitions(definitions)
+	try:
+		weights = dict(parseAssignments(args.threat, float))
+		for damageType in weights:
+			if not damageType in registry.damageTypeIndex:
+				raise ValueError("Damage type " + damageType + " is undefined.")
+		maxLayers = {slotName: args.max_layers for slotName in E.SLOT_NAMES}
+		for slotName, layers in parseAssignments(args.slot_max_layers, int):
+			if not slotName in maxLayers:
+				raise ValueError("Armour slot " + slotName + " is undefined.")
+			maxLayers[slotName] = layers
+		forbidden = {slotName: set() for slotName in E.SLOT_NAMES}
+		for item in args.forbid or []:
+			slotName, separator, armourName = item.partition("=")
+			if separator != "" and slotName in forbidden:
+				forbidden[slotName].add(armourName)
+			else:
+				for slotNames in forbidden.values():
+					slotNames.add(item)
+		S.parseDamageRoll(args.damage + " " + E.DAMAGE_TYPES[0])
+	except ValueError as error:
+		parser.error(str(error))
+	results = optimize(list(registry.armour.values()), weights, args.damage, maxLayers, forbidden, args.processes, registry.damageTypes)
+	# Expected damage per hit over all hit locations
+	probabilities = S.slotProbabilities(registry.hitLocations)
+	total = sum(probability * result[1] for probability, result in zip(probabilities, results))
+	profile = ThreatProfile(weights, args.damage, registry.damageTypes)
+	current = {}
+	for character in registry.characters.values():
+		current[character.name] = sum(probability * profile.score(row) for probability, row in zip(probabilities, character.reductions))
+	if args.json:
+		print(json.dumps({"slots": dict(zip(E.SLOT_NAMES, results)), "expected": total, "characters": current}, indent=1))
+		return
+	for slotName, result in zip(E.SLOT_NAMES, results):
+		print(slotName + ": " + (", ".join(result[0]) if len(result[0]) > 0 else "nothing") + " (" + "{:.2f}".format(result[1]) + " damage per hit)")
+	print("Expected damage per hit: " + "{:.2f}".format(total))
+	for name, expected in current.items():
+		print(name + " currently takes " + "{:.2f}".format(expected) + " damage per hit.")
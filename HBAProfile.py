@@ -0,0 +1,256 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAProfile measures where the time of a session goes. It records the latency of each call to instrumented methods, like
+# calculateDamage, the loaders and addCharacter, in histograms and the lag of the Tk event loop, and shows their percentiles.
+# Instrumentation replaces the methods of an object by timed wrappers and removing it restores them, so while it is off,
+# no wrapper is called and the methods cost exactly what they did before. It is turned on with the environment variable
+# HBA_PROFILE=1 or with the ⏱ button of the GUI.
+# cProfile or tracemalloc can be captured on demand and written to a file.
+
+# Changelog
+# 2026-10-16: Initial version
+
+import cProfile
+import json
+import math
+import os
+import time
+import tracemalloc
+
+# Whether instrumentation is turned on at startup
+ENABLED = os.environ.get("HBA_PROFILE", "0") != "0"
+# Interval in milliseconds at which the lag of the event loop is sampled
+LAG_INTERVAL = 100
+# Smallest latency in seconds the histograms distinguish
+MIN_LATENCY = 1e-6
+# Number of buckets per doubling of the latency (about 9 % resolution)
+BUCKETS_PER_OCTAVE = 8
+# Number of buckets of a histogram (latencies from 1 us to about 4 hours)
+BUCKETS = BUCKETS_PER_OCTAVE * 34
+# Number of lines of the tracemalloc statistics written to a file
+TRACEMALLOC_LINES = 50
+
+# Histogram of latencies with logarithmic buckets.
+# Recording a latency takes constant time and memory, no matter how many calls are recorded.
+class Histogram:
+	# Constructor method
+	def __init__(self):
+		# Number of latencies in each bucket
+		self.counts = [0] * BUCKETS
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+	
+	# Records a latency.
+	# 
+	# @param seconds The latency in seconds.
+	def add(self, seconds):
+		if seconds > MIN_LATENCY:
+			bucket = min(int(math.log2(seconds / MIN_LATENCY) * BUCKETS_PER_OCTAVE), BUCKETS - 1)
+		else:
+			bucket = 0
+		self.counts[bucket] += 1
+		self.count += 1
+		self.total += seconds
+		if seconds > self.max:
+			self.max = seconds
+	
+	# Estimates a percentile of the recorded latencies.
+	# 
+	# @param percent The percentile, between 0 and 100.
+	# @return The upper bound of the bucket holding the percentile in seconds, at most the largest recorded latency.
+	def percentile(self, percent):
+		if self.count == 0:
+			return 0.0
+		rank = math.ceil(self.count * percent / 100)
+		seen = 0
+		for bucket, count in enumerate(self.counts):
+			seen += count
+			if seen >= rank and count > 0:
+				break
+		return min(MIN_LATENCY * 2**((bucket + 1) / BUCKETS_PER_OCTAVE), self.max)
+	
+	# Summarizes the histogram.
+	# 
+	# @return Dictionary with the number of calls and the mean, p50, p99 and maximum latency in seconds.
+	def summary(self):
+		return {
+			"count": self.count,
+			"mean": self.total / self.count if self.count > 0 else 0.0,
+			"p50": self.percentile(50),
+			"p99": self.percentile(99),
+			"max": self.max,
+		}
+
+# Histograms keyed by the name of what they measure
+histograms = {}
+# Instrumented methods: [object, name]
+instrumented = []
+# Running capture: [kind, path, profiler] (None if nothing is captured)
+capture = None
+
+# Records a latency in a histogram.
+# 
+# @param name The name of the histogram.
+# @param seconds The latency in seconds.
+def record(name, seconds):
+	histogram = histograms.get(name)
+	if None == histogram:
+		histogram = histograms[name] = Histogram()
+	histogram.add(seconds)
+
+# Wraps a function so the latency of each call is recorded.
+# 
+# @param name The name of the histogram.
+# @param function The function to time.
+# @return The timed function.
+def timed(name, function):
+	histogram = histograms.get(name)
+	if None == histogram:
+		histogram = histograms[name] = Histogram()
+	# Record the latency, also of calls that raise an exception
+	def wrapper(*args, **kwargs):
+		start = time.perf_counter()
+		try:
+			return function(*args, **kwargs)
+		finally:
+			histogram.add(time.perf_counter() - start)
+	wrapper.__wrapped__ = function
+	return wrapper
+
+# Replaces methods of an object by timed wrappers.
+# The wrappers are stored on the object, so callbacks that look the method up when they are called are timed too.
+# 
+# @param target The object.
+# @param names The names of the methods.
+# @param prefix The prefix of the histogram names, for example the name of the class.
+def instrument(target, names, prefix=""):
+	for name in names:
+		if any(target is instrumentedTarget and name == instrumentedName for instrumentedTarget, instrumentedName in instrumented):
+			continue
+		setattr(target, name, timed(prefix + name, getattr(target, name)))
+		instrumented.append([target, name])
+
+# Removes all timed wrappers, so the methods of the class are called directly again.
+def uninstrument():
+	global instrumented
+	for target, name in instrumented:
+		delattr(target, name)
+	instrumented = []
+
+# Checks whether any method is instrumented.
+# 
+# @return Whether instrumentation is on.
+def instrumenting():
+	return len(instrumented) > 0
+
+# Samples the lag of the Tk event loop: how much later than requested a scheduled callback runs.
+# A long handler of an event, like parsing a file, delays every other event by the same time.
+class LagMonitor:
+	# Constructor method
+	# 
+	# @param widget Any widget of the window, used to schedule the samples.
+	# @param interval The interval between two samples in milliseconds.
+	def __init__(self, widget, interval=LAG_INTERVAL):
+		self.widget = widget
+		self.interval = interval
+		# ID of the scheduled sample (None if the monitor isn't running)
+		self.job = None
+		# Time the scheduled sample should run at
+		self.expected = None
+	
+	# Starts sampling.
+	def start(self):
+		if None == self.job:
+			self.expected = time.perf_counter() + self.interval / 1000
+			self.job = self.widget.after(self.interval, self.sample)
+	
+	# Records the lag of the current sample and schedules the next one.
+	def sample(self):
+		now = time.perf_counter()
+		record("eventLoopLag", max(now - self.expected, 0.0))
+		self.expected = now + self.interval / 1000
+		self.job = self.widget.after(self.interval, self.sample)
+	
+	# Stops sampling.
+	def stop(self):
+		if not None == self.job:
+			self.widget.after_cancel(self.job)
+			self.job = None
+
+# Clears all histograms.
+def reset():
+	for histogram in histograms.values():
+		histogram.__init__()
+
+# Summarizes all histograms.
+# 
+# @return Dictionary with the summary of each histogram that recorded a latency.
+def summaries():
+	return {name: histogram.summary() for name, histogram in sorted(histograms.items()) if histogram.count > 0}
+
+# Formats the summaries of all histograms as a table.
+# 
+# @return List of lines with the number of calls and the p50, p99 and maximum latency in milliseconds.
+def report():
+	lines = ["{:<32}{:>9}{:>11}{:>11}{:>11}".format("", "calls", "p50 ms", "p99 ms", "max ms")]
+	for name, summary in summaries().items():
+		lines.append("{:<32}{:>9}{:>11.3f}{:>11.3f}{:>11.3f}".format(name, summary["count"], summary["p50"] * 1000, summary["p99"] * 1000, summary["max"] * 1000))
+	return lines
+
+# Writes the summaries of all histograms to a JSON file.
+# 
+# @param path The path of the file.
+def dump(path):
+	dumpFile = open(path, "w")
+	json.dump(summaries(), dumpFile, indent="\t")
+	dumpFile.close()
+
+# Starts capturing a profile.
+# 
+# @param kind "cprofile" for the time spent in each function or "tracemalloc" for the memory allocated by each line.
+# @param path The path of the file the capture is written to when it is stopped.
+def startCapture(kind, path):
+	global capture
+	stopCapture()
+	if kind == "cprofile":
+		profiler = cProfile.Profile()
+		profiler.enable()
+	elif kind == "tracemalloc":
+		profiler = None
+		tracemalloc.start()
+	else:
+		raise ValueError("Unknown capture " + str(kind) + ".")
+	capture = [kind, path, profiler]
+
+# Stops the running capture and writes it to its file.
+# A cProfile capture is written in the format of pstats; a tracemalloc capture as text with the lines that allocated the most memory.
+# 
+# @return The path of the written file or None if nothing was captured.
+def stopCapture():
+	global capture
+	if None == capture:
+		return None
+	kind, path, profiler = capture
+	capture = None
+	if kind == "cprofile":
+		profiler.disable()
+		profiler.dump_stats(path)
+	else:
+		snapshot = tracemalloc.take_snapshot()
+		current, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		captureFile = open(path, "w")
+		captureFile.write("Current: " + "{:.1f}".format(current / 2**20) + " MiB, peak: " + "{:.1f}".format(peak / 2**20) + " MiB\n")
+		for statistic in snapshot.statistics("lineno")[:TRACEMALLOC_LINES]:
+			captureFile.write(str(statistic) + "\n")
+		captureFile.close()
+	return path
+
+# Checks which profile is captured.
+# 
+# @return The kind of the running capture or None.
+def capturing():
+	return None if None == capture else capture[0]
@@ -0,0 +1,132 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAResolve resolves a stream of attack records, for example the combat log of a virtual tabletop, against the characters of a configuration.
+# Every record is a line in the format "CHARACTER NAME ATTACK DAMAGE DAMAGE TYPE" like in the volley dialogue of the GUI.
+# The records are read in chunks of bounded size and each chunk is resolved at once with HBABatch, so memory stays flat on logs of any length.
+# A chunk is resolved as soon as no further input is waiting, so records written to a pipe one by one are answered right away.
+# 
+# Usage: python HomebrewArmour.py resolve CONFIGURATION [LOG] [--format jsonl|csv]
+
+# Changelog
+# 2026-10-16: Initial version
+
+import argparse
+import csv
+import json
+import select
+import sys
+import numpy as np
+import HBAEngine as E
+import HBABatch as B
+
+# Maximum number of records resolved at once
+CHUNK_SIZE = 8192
+# Name of each slot as JSON string
+SLOT_JSON = [json.dumps(slotName) for slotName in E.SLOT_NAMES]
+
+# Checks whether more input can be read from a stream without waiting.
+# 
+# @param stream The input stream.
+# @return True if input is waiting or it can't be checked (for example for pipes on Windows), False otherwise.
+def inputWaiting(stream):
+	try:
+		return len(select.select([stream], [], [], 0)[0]) > 0
+	except (OSError, ValueError, TypeError):
+		return True
+
+# Reads the lines of a stream in chunks.
+# A chunk ends when it holds chunkSize lines or when no further input is waiting.
+# 
+# @param stream The input stream.
+# @param chunkSize The maximum number of lines in a chunk.
+# @return Generator of lists of lines.
+def readChunks(stream, chunkSize=CHUNK_SIZE):
+	chunk = []
+	for line in iter(stream.readline, ""):
+		chunk.append(line)
+		if len(chunk) >= chunkSize or not inputWaiting(stream):
+			yield chunk
+			chunk = []
+	if len(chunk) > 0:
+		yield chunk
+
+# Writes resolved records as JSON lines. The lines are joined from their fields, but every string is encoded by json.dumps.
+# 
+# @param output The output stream.
+# @param records List of the records in the format [characterName, attackRoll, damage, damageType, line].
+# @param slots List with the index of the hit slot of each record.
+# @param reducedDamage List with the reduced damage of each record.
+def writeJSONLines(output, records, slots, reducedDamage):
+	lines = []
+	# Records have few damage types, so each is only encoded once
+	typeJSON = {}
+	for record, slot, reduced in zip(records, slots, reducedDamage):
+		if not record[3] in typeJSON:
+			typeJSON[record[3]] = json.dumps(record[3])
+		lines.append("{\"character\": " + json.dumps(record[0]) + ", \"attack\": " + str(record[1]) + ", \"damage\": " + str(record[2])
+			+ ", \"type\": " + typeJSON[record[3]] + ", \"slot\": " + SLOT_JSON[slot] + ", \"reduced\": " + str(reduced) + "}\n")
+	output.write("".join(lines))
+
+# Writes resolved records as CSV rows.
+# 
+# @param output The output stream.
+# @param records List of the records in the format [characterName, attackRoll, damage, damageType, line].
+# @param slots List with the index of the hit slot of each record.
+# @param reducedDamage List with the reduced damage of each record.
+def writeCSV(output, records, slots, reducedDamage):
+	csv.writer(output, lineterminator="\n").writerows(
+		[record[0], record[1], record[2], record[3], E.SLOT_NAMES[slot], reduced] for record, slot, reduced in zip(records, slots, reducedDamage))
+
+# Resolves a stream of attack records and writes the results.
+# 
+# @param registry The registry holding the characters.
+# @param stream The input stream with one record per line.
+# @param output The output stream.
+# @param outputFormat "jsonl" or "csv".
+# @param messages The stream invalid records and unknown characters are reported to.
+# @param chunkSize The maximum number of records resolved at once.
+# @return The number of resolved records.
+def resolveStream(registry, stream, output, outputFormat="jsonl", messages=sys.stderr, chunkSize=CHUNK_SIZE):
+	resolver = B.BatchResolver(registry)
+	write = writeCSV if outputFormat == "csv" else writeJSONLines
+	if outputFormat == "csv":
+		output.write("character,attack,damage,type,slot,reduced\n")
+	resolved = 0
+	lineNumber = 1
+	for chunk in readChunks(stream, chunkSize):
+		records, chunkMessages = E.parseAttacks(chunk, registry.damageTypeIndex, lineNumber)
+		lineNumber += len(chunk)
+		for message in chunkMessages:
+			messages.write(message + "\n")
+		# The records of unknown characters are dropped
+		characterIDs, reducedDamage, unknown, known = B.resolveRecords(resolver, records)
+		for message in unknown:
+			messages.write(message + "\n")
+		if len(known) > 0:
+			slots = resolver.hitLocations[np.array([record[1] for record in known], dtype=np.int64) % 10]
+			write(output, known, slots.tolist(), reducedDamage.tolist())
+			resolved += len(known)
+		output.flush()
+	return resolved
+
+# Resolves the attack records of a log or the standard input.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(prog="HomebrewArmour.py resolve", description="Resolve a stream of attack records \"CHARACTER NAME ATTACK DAMAGE DAMAGE TYPE\" against the characters of a configuration.")
+	parser.add_argument("configuration", help="the configuration file (.hacfg) with the armour and characters")
+	parser.add_argument("log", nargs="?", help="file with one attack record per line (default: standard input)")
+	parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="output format (default: jsonl)")
+	parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="maximum number of records resolved at once (default: " + str(CHUNK_SIZE) + ")")
+	args = parser.parse_args(args)
+	registry = E.Registry()
+	for message in E.loadConfiguration(registry, args.configuration):
+		sys.stderr.write(message + "\n")
+	if None == args.log or args.log == "-":
+		resolveStream(registry, sys.stdin, sys.stdout, args.format, chunkSize=args.chunk_size)
+	else:
+		log = open(args.log, "r")
+		resolveStream(registry, log, sys.stdout, args.format, chunkSize=args.chunk_size)
+		log.close()
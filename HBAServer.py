@@ -0,0 +1,313 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAServer shares the loaded armour library and characters with other devices at the table, for example a tablet for the players or a bot.
+# It is an asyncio server on localhost or a Unix socket that speaks JSON lines: every request is a JSON object on its own line
+# and is answered by a JSON object on its own line with the same "id". Requests:
+#	{"id": 1, "op": "state"}	the damage types, the armour library and the characters
+#	{"id": 2, "op": "resolve", "character": "Tav", "attack": 17, "damage": 12, "type": "slashing"}	the hit slot and the reduced damage of a hit
+#	{"id": 3, "op": "resolveBatch", "hits": [["Tav", 17, 12, "slashing"], ...]}	the hit slots and reduced damage of many hits at once
+#	{"id": 4, "op": "subscribe"}	pushes {"event": "state", "version": ...} whenever the state changes ("unsubscribe" stops it)
+#	{"id": 5, "op": "ping"}
+# The server never reads the registry itself. The thread owning the registry (the Tk mainloop in the GUI) publishes immutable snapshots,
+# which are handed to the event loop of the server thread, so the server can run next to the GUI without locks.
+# 
+# Usage: python HomebrewArmour.py serve CONFIGURATION [--host 127.0.0.1] [--port 8765] [--unix PATH]
+
+# Changelog
+# 2026-10-16: Messages about the loaded files are written through HBALog
+# 2026-10-16: Initial version
+
+import argparse
+import asyncio
+import json
+import threading
+import numpy as np
+import HBAEngine as E
+import HBABatch as B
+import HBALog as O
+
+# Default address of the server
+HOST = "127.0.0.1"
+PORT = 8765
+# Maximum length of a request line in bytes
+LINE_LIMIT = 2 ** 24
+
+# Immutable copy of the state of a registry that the server answers requests from.
+class Snapshot:
+	# Constructor method. Must be called on the thread that owns the registry.
+	# 
+	# @param registry The registry to copy.
+	def __init__(self, registry):
+		self.version = registry.version
+		self.damageTypes = list(registry.damageTypes)
+		self.damageTypeIndex = dict(registry.damageTypeIndex)
+		# Stack the reduction tables per loadout
+		resolver = B.BatchResolver(registry)
+		resolver.compile()
+		self.reductions = resolver.reductions
+		self.rows = resolver.rows
+		self.hitLocations = resolver.hitLocations
+		# First character with each name
+		self.characterIDs = {name: characterIDs[0] for name, characterIDs in registry.characterNames.items()}
+		# The reduction tables are shared and never modified, so they can be kept without copying
+		self.characters = [[character.name, character.hitPoints, character.reductions] for character in registry.characters.values()]
+		self.armour = [[armourType.name, armourType.reductions.tolist()] for armourType in registry.armour.values()]
+		# Encoded answer to "state" requests, created when it is first requested
+		self.state = None
+	
+	# Gets the full state.
+	# 
+	# @return Dictionary with the version, the slots, the damage types, the reductions of each armour type and the characters.
+	def getState(self):
+		if None == self.state:
+			self.state = {
+				"version": self.version,
+				"slots": E.SLOT_NAMES,
+				"damageTypes": self.damageTypes,
+				"armour": {name: dict(zip(self.damageTypes, reductions)) for name, reductions in self.armour},
+				"characters": [{"name": name, "hitPoints": hitPoints, "reductions": reductions} for name, hitPoints, reductions in self.characters],
+			}
+		return self.state
+	
+	# Resolves hits against the characters of the snapshot.
+	# 
+	# @param hits List of hits in the format [characterName, attackRoll, damage, damageType].
+	# @return Tuple of a list with the index of the hit slot and a list with the reduced damage of each hit (None for hits against unknown characters).
+	def resolve(self, hits):
+		characterIDs = []
+		known = []
+		for index, hit in enumerate(hits):
+			characterID = self.characterIDs.get(hit[0])
+			if not None == characterID:
+				characterIDs.append(characterID)
+				known.append(index)
+		slots = [None] * len(hits)
+		reducedDamage = [None] * len(hits)
+		if len(known) == 0:
+			return slots, reducedDamage
+		columns = list(zip(*[hits[index] for index in known]))
+		locations = self.hitLocations[np.asarray(columns[1], dtype=np.int64) % 10]
+		rows = self.rows[np.asarray(characterIDs, dtype=np.intp)]
+		damageColumns = B.damageTypeColumns(columns[3], self.damageTypeIndex)
+		reduced = np.maximum(np.asarray(columns[2], dtype=np.int64) - self.reductions[rows, locations, damageColumns], 0)
+		for index, slot, damage in zip(known, locations.tolist(), reduced.tolist()):
+			slots[index] = E.SLOT_NAMES[slot]
+			reducedDamage[index] = damage
+		return slots, reducedDamage
+
+# JSON lines server for the state of a registry.
+class Server:
+	# Constructor method. Must be called on the thread that owns the registry.
+	# 
+	# @param registry The registry to serve.
+	def __init__(self, registry):
+		self.snapshot = Snapshot(registry)
+		# Writers of all connected clients and of those that subscribed to state changes
+		self.clients = set()
+		self.subscribers = set()
+		# Event loop of the server, set while it is running
+		self.loop = None
+		# The asyncio server, set while it is running
+		self.server = None
+	
+	# Publishes the current state of a registry to the server and its subscribers. Must be called on the thread that owns the registry.
+	# 
+	# @param registry The registry.
+	def publish(self, registry):
+		snapshot = Snapshot(registry)
+		if None == self.loop:
+			self.snapshot = snapshot
+		else:
+			self.loop.call_soon_threadsafe(self.setSnapshot, snapshot)
+	
+	# Replaces the snapshot and notifies the subscribers. Runs on the event loop.
+	# 
+	# @param snapshot The new Snapshot.
+	def setSnapshot(self, snapshot):
+		self.snapshot = snapshot
+		event = (json.dumps({"event": "state", "version": snapshot.version}) + "\n").encode()
+		for writer in list(self.subscribers):
+			if writer.is_closing():
+				self.subscribers.discard(writer)
+			else:
+				writer.write(event)
+	
+	# Answers a request.
+	# 
+	# @param request The decoded request.
+	# @param writer The writer of the client, used for subscriptions.
+	# @return The response.
+	def handleRequest(self, request, writer):
+		operation = request.get("op")
+		response = {"id": request.get("id"), "ok": True}
+		snapshot = self.snapshot
+		if operation == "resolve":
+			hit = [request.get("character"), request.get("attack"), request.get("damage"), request.get("type")]
+			validateHit(hit, snapshot)
+			slots, reducedDamage = snapshot.resolve([hit])
+			if None == reducedDamage[0]:
+				raise ValueError("Character " + str(hit[0]) + " doesn't exist.")
+			response["slot"] = slots[0]
+			response["reduced"] = reducedDamage[0]
+		elif operation == "resolveBatch":
+			hits = request.get("hits")
+			if not isinstance(hits, list):
+				raise ValueError("\"hits\" must be a list of [character, attack, damage, type].")
+			for hit in hits:
+				validateHit(hit, snapshot)
+			response["slots"], response["reduced"] = snapshot.resolve(hits)
+		elif operation == "state":
+			response["state"] = snapshot.getState()
+		elif operation == "subscribe":
+			self.subscribers.add(writer)
+			response["version"] = snapshot.version
+		elif operation == "unsubscribe":
+			self.subscribers.discard(writer)
+		elif operation != "ping":
+			raise ValueError("Operation " + str(operation) + " is undefined.")
+		return response
+	
+	# Serves a client until it disconnects.
+	# 
+	# @param reader The stream reader of the connection.
+	# @param writer The stream writer of the connection.
+	async def handleClient(self, reader, writer):
+		self.clients.add(writer)
+		try:
+			while True:
+				line = await reader.readline()
+				if line == b"":
+					break
+				request = None
+				try:
+					request = json.loads(line)
+					if not isinstance(request, dict):
+						raise ValueError("A request must be a JSON object.")
+					response = self.handleRequest(request, writer)
+				except (ValueError, TypeError) as error:
+					response = {"id": request.get("id") if isinstance(request, dict) else None, "ok": False, "error": str(error)}
+				writer.write((json.dumps(response) + "\n").encode())
+				# Only wait for the client if it doesn't read its answers
+				if writer.transport.get_write_buffer_size() > 2 ** 16:
+					await writer.drain()
+		except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			self.clients.discard(writer)
+			self.subscribers.discard(writer)
+			writer.close()
+	
+	# Starts listening. Runs on the event loop.
+	# 
+	# @param host The host to listen on.
+	# @param port The port to listen on.
+	# @param path The path of a Unix socket to listen on instead of host and port.
+	async def start(self, host=HOST, port=PORT, path=None):
+		self.loop = asyncio.get_running_loop()
+		if None == path:
+			self.server = await asyncio.start_server(self.handleClient, host, port, limit=LINE_LIMIT)
+		else:
+			self.server = await asyncio.start_unix_server(self.handleClient, path, limit=LINE_LIMIT)
+	
+	# Serves until the server is stopped.
+	# 
+	# @param host The host to listen on.
+	# @param port The port to listen on.
+	# @param path The path of a Unix socket to listen on instead of host and port.
+	async def serve(self, host=HOST, port=PORT, path=None):
+		await self.start(host, port, path)
+		try:
+			await self.server.serve_forever()
+		except asyncio.CancelledError:
+			pass
+		finally:
+			self.server.close()
+			await self.disconnect()
+			self.loop = None
+	
+	# Disconnects all clients and waits until their handlers finished. Runs on the event loop.
+	async def disconnect(self):
+		for writer in list(self.clients):
+			writer.close()
+		handlers = [task for task in asyncio.all_tasks() if not task is asyncio.current_task()]
+		if len(handlers) > 0:
+			await asyncio.wait(handlers, timeout=1)
+	
+	# Runs the server on its own thread with its own event loop, for example next to the Tk mainloop.
+	# 
+	# @param host The host to listen on.
+	# @param port The port to listen on.
+	# @param path The path of a Unix socket to listen on instead of host and port.
+	# @return The thread. It is a daemon thread, so it doesn't keep the program running.
+	def startThread(self, host=HOST, port=PORT, path=None):
+		started = threading.Event()
+		errors = []
+		
+		# Runs the event loop of the server thread
+		def run():
+			loop = asyncio.new_event_loop()
+			try:
+				loop.run_until_complete(self.start(host, port, path))
+			except OSError as error:
+				errors.append(error)
+				started.set()
+				loop.close()
+				return
+			started.set()
+			try:
+				loop.run_until_complete(self.server.serve_forever())
+			except asyncio.CancelledError:
+				pass
+			finally:
+				self.server.close()
+				loop.run_until_complete(self.disconnect())
+				self.loop = None
+				loop.close()
+		
+		thread = threading.Thread(target=run, name="HBAServer", daemon=True)
+		thread.start()
+		started.wait()
+		if len(errors) > 0:
+			raise errors[0]
+		return thread
+	
+	# Stops the server and disconnects all clients. Can be called from any thread.
+	def stop(self):
+		loop = self.loop
+		if not None == loop and not None == self.server:
+			# The clients are disconnected when serving ends
+			loop.call_soon_threadsafe(self.server.close)
+
+# Checks the format of a hit.
+# 
+# @param hit The hit in the format [characterName, attackRoll, damage, damageType].
+# @param snapshot The Snapshot providing the damage types.
+def validateHit(hit, snapshot):
+	if not isinstance(hit, list) or len(hit) != 4:
+		raise ValueError("A hit must be [character, attack, damage, type].")
+	if not isinstance(hit[1], int) or not isinstance(hit[2], int):
+		raise ValueError("Attack roll and damage must be integers.")
+	if not hit[3] in snapshot.damageTypeIndex:
+		raise ValueError("Damage type " + str(hit[3]) + " is undefined.")
+
+# Loads a configuration and serves it.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(prog="HomebrewArmour.py serve", description="Serve the armour and characters of a configuration to other devices as JSON lines.")
+	parser.add_argument("configuration", help="the configuration file (.hacfg) with the armour and characters")
+	parser.add_argument("--host", default=HOST, help="host to listen on (default: " + HOST + ")")
+	parser.add_argument("--port", type=int, default=PORT, help="port to listen on (default: " + str(PORT) + ")")
+	parser.add_argument("--unix", help="path of a Unix socket to listen on instead of a port")
+	args = parser.parse_args(args)
+	registry = E.Registry()
+	for message in E.loadConfiguration(registry, args.configuration):
+		O.warning(message)
+	server = Server(registry)
+	print("Serving on " + (args.unix if not None == args.unix else args.host + ":" + str(args.port)))
+	try:
+		asyncio.run(server.serve(args.host, args.port, args.unix))
+	except KeyboardInterrupt:
+		pass
@@ -0,0 +1,274 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBASession saves and restores a whole session: the armour definitions, the damage types and hit locations,
+# every character with its loadout and the last attack roll, damage and reduced damage entered for it.
+# A session file (.hbs) is a snapshot of the session in a compact binary format (marshal), so it is written and read in milliseconds
+# and restoring it doesn't parse any armour or character file.
+# Changes are autosaved by appending records to a journal next to the snapshot ("NAME.hbs.journal") instead of rewriting the snapshot.
+# The journal is compacted into a new snapshot after COMPACT_RECORDS records. After a crash, the session is recovered from the snapshot
+# and the records of the journal; a record that was only partly written is ignored.
+
+# Changelog
+# 2026-10-17: The first snapshot of a process continues the generations on disk, so a stale journal isn't replayed onto it
+# 2026-10-16: Removed and moved characters are journaled
+# 2026-10-16: Initial version
+
+import marshal
+import os
+import struct
+import HBACache as C
+import HBAEngine as E
+
+# Default path of the autosave
+AUTOSAVE = "./autosave.hbs"
+# Marks a session snapshot and the version of its format. Must be changed whenever the format of the state changes.
+MAGIC = b"HBAS\x01"
+# Number of journal records after which the journal is compacted into a new snapshot
+COMPACT_RECORDS = 1000
+# Header of a journal record: the size of its payload
+RECORD_HEADER = struct.Struct("<I")
+
+# Captures the state of a session.
+# Characters sharing a loadout share its list of slots, which marshal stores only once.
+# 
+# @param registry The registry holding the armour and characters.
+# @param order The IDs of the characters in the order they are listed.
+# @param inputs The inputs of each character keyed by character ID: [attack roll, damage total, reduced damage].
+# @param armourPath The path of the armour file the definitions were loaded from or None.
+# @return The state as a dictionary of types marshal supports.
+def captureState(registry, order, inputs, armourPath=None):
+	slotsByLoadout = {}
+	characters = {}
+	for characterID in order:
+		character = registry.characters[characterID]
+		slots = slotsByLoadout.get(character.loadout)
+		if None == slots:
+			slots = registry.getSlots(character)
+			slotsByLoadout[character.loadout] = slots
+		characters[characterID] = [character.name, character.hitPoints, slots]
+	return {
+		"generation": 0,
+		"armour": armourPath,
+		"definitions": registry.definitions,
+		"damageTypes": list(registry.damageTypes),
+		"hitLocations": [E.SLOT_NAMES[slot] for slot in registry.hitLocations],
+		"characters": characters,
+		"inputs": {characterID: list(inputs[characterID]) for characterID in order if characterID in inputs},
+		"order": list(order),
+	}
+
+# Creates the journal record of a character that was added or changed.
+# 
+# @param registry The registry holding the character.
+# @param characterID The ID of the character.
+# @return The record.
+def characterRecord(registry, characterID):
+	character = registry.characters[characterID]
+	return ("character", characterID, character.name, character.hitPoints, registry.getSlots(character))
+
+# Applies a journal record to a state.
+# Records:
+#	("character", characterID, name, hitPoints, slots)	adds or replaces a character
+#	("inputs", characterID, [attack roll, damage total, reduced damage])	sets the inputs of a character
+#	("remove", characterID)	removes a character
+#	("move", characterID, beforeID)	moves a character in front of another one (or to the end if beforeID is None)
+# 
+# @param state The state as returned by captureState.
+# @param roster The E.Roster with the order of the characters. The order of the state is only updated from it when a snapshot is written.
+# @param record The record.
+def applyRecord(state, roster, record):
+	if record[0] == "character":
+		if not record[1] in roster:
+			roster.append(record[1])
+		state["characters"][record[1]] = [record[2], record[3], record[4]]
+	elif record[0] == "inputs":
+		if record[1] in roster:
+			state["inputs"][record[1]] = list(record[2])
+	elif record[0] == "remove":
+		if record[1] in roster:
+			roster.remove(record[1])
+			del state["characters"][record[1]]
+			state["inputs"].pop(record[1], None)
+	elif record[0] == "move":
+		if record[1] in roster and (None == record[2] or record[2] in roster):
+			roster.move(record[1], record[2])
+
+# Writes a snapshot. The file is replaced at once, so a crash can't leave a half written snapshot.
+# 
+# @param path The path of the session file.
+# @param state The state as returned by captureState.
+def writeSnapshot(path, state):
+	payload = marshal.dumps(state)
+	temporaryPath = path + "." + str(os.getpid()) + ".tmp"
+	snapshotFile = open(temporaryPath, "wb")
+	snapshotFile.write(MAGIC + C.digest(payload) + payload)
+	snapshotFile.close()
+	os.replace(temporaryPath, path)
+
+# Reads a snapshot.
+# 
+# @param path The path of the session file.
+# @return The state or None if the file doesn't exist or is corrupt.
+def readSnapshot(path):
+	try:
+		snapshotFile = open(path, "rb")
+		data = snapshotFile.read()
+		snapshotFile.close()
+		if data[:len(MAGIC)] != MAGIC:
+			return None
+		payload = data[len(MAGIC) + C.DIGEST_SIZE:]
+		if C.digest(payload) != data[len(MAGIC):len(MAGIC) + C.DIGEST_SIZE]:
+			return None
+		state = marshal.loads(payload)
+		if not isinstance(state, dict) or not "order" in state:
+			return None
+		return state
+	except (OSError, EOFError, ValueError, TypeError):
+		return None
+
+# Reads the records of a journal up to the first record that is incomplete or corrupt.
+# 
+# @param path The path of the journal.
+# @return List of the records. The first record is ("session", generation) and names the snapshot the journal belongs to.
+def readJournal(path):
+	try:
+		journalFile = open(path, "rb")
+		data = journalFile.read()
+		journalFile.close()
+	except OSError:
+		return []
+	records = []
+	position = 0
+	while position + RECORD_HEADER.size + C.DIGEST_SIZE <= len(data):
+		size = RECORD_HEADER.unpack_from(data, position)[0]
+		start = position + RECORD_HEADER.size + C.DIGEST_SIZE
+		payload = data[start:start + size]
+		if len(payload) != size or C.digest(payload) != data[position + RECORD_HEADER.size:start]:
+			break
+		try:
+			records.append(marshal.loads(payload))
+		except (EOFError, ValueError, TypeError):
+			break
+		position = start + size
+	return records
+
+# Finds the generation of the next snapshot of a session file.
+# It follows the generations of the snapshot and the journal on disk, so a journal left over from an earlier session never matches the new snapshot,
+# even if the process stops after the snapshot was written but before the journal was truncated.
+# 
+# @param path The path of the session file.
+# @return The generation.
+def nextGeneration(path):
+	generation = -1
+	state = readSnapshot(path)
+	if not None == state:
+		generation = state.get("generation", -1)
+	records = readJournal(path + ".journal")
+	if len(records) > 0 and isinstance(records[0], tuple) and len(records[0]) == 2 and records[0][0] == "session":
+		generation = max(generation, records[0][1])
+	return generation + 1
+
+# Reads a session from its snapshot and the records of its journal.
+# 
+# @param path The path of the session file.
+# @return The state or None if the session file doesn't exist or is corrupt.
+def readSession(path):
+	state = readSnapshot(path)
+	if None == state:
+		return None
+	records = readJournal(path + ".journal")
+	# Only replay a journal that was started for this snapshot
+	if len(records) > 0 and records[0] == ("session", state["generation"]):
+		roster = E.Roster(state["order"])
+		for record in records[1:]:
+			applyRecord(state, roster, record)
+		state["order"] = roster.getOrder()
+	return state
+
+# Restores the armour and characters of a session into an empty registry.
+# 
+# @param registry The registry.
+# @param state The state as returned by readSession.
+# @return Tuple of the IDs of the characters in the order they are listed, their inputs keyed by ID and a list of messages about undefined armour.
+def restoreState(registry, state):
+	messages = []
+	if state["damageTypes"] != registry.damageTypes:
+		registry.setDamageTypes(state["damageTypes"])
+	registry.setHitLocations(state["hitLocations"])
+	registry.setArmourDefinitions(state["definitions"])
+	order = []
+	inputs = {}
+	for oldID in state["order"]:
+		name, hitPoints, slots = state["characters"][oldID]
+		characterID = registry.addCharacter(name, hitPoints)
+		for armourName in registry.setCharacterArmour(characterID, slots):
+			messages.append("Error: " + name + " is wearing undefined armour: " + armourName)
+		order.append(characterID)
+		inputs[characterID] = list(state["inputs"].get(oldID, ["", "", "0"]))
+	return order, inputs, messages
+
+# Autosave of a session: a snapshot and a journal of the changes since the snapshot.
+class Session:
+	# Constructor method
+	# 
+	# @param path The path of the session file.
+	def __init__(self, path=AUTOSAVE):
+		self.path = path
+		self.journalPath = path + ".journal"
+		# State of the session including the journaled changes (None until the first snapshot)
+		self.state = None
+		# Order of the characters of the state
+		self.roster = None
+		# Open journal file
+		self.journal = None
+		# Number of records in the journal
+		self.records = 0
+	
+	# Writes a snapshot of a state and starts a new journal for it.
+	# Used after changes that affect the whole session, like loading a configuration.
+	# 
+	# @param state The state as returned by captureState.
+	def reset(self, state):
+		state["generation"] = (self.state["generation"] + 1) if not None == self.state else nextGeneration(self.path)
+		writeSnapshot(self.path, state)
+		self.state = state
+		self.roster = E.Roster(state["order"])
+		if not None == self.journal:
+			self.journal.close()
+		self.journal = open(self.journalPath, "wb")
+		self.records = 0
+		self.append(("session", state["generation"]))
+	
+	# Appends a record to the journal.
+	# 
+	# @param record The record.
+	def append(self, record):
+		payload = marshal.dumps(record)
+		self.journal.write(RECORD_HEADER.pack(len(payload)) + C.digest(payload) + payload)
+		self.journal.flush()
+	
+	# Records a change of the session. The journal is compacted into a new snapshot after COMPACT_RECORDS records.
+	# 
+	# @param record The record as described in applyRecord.
+	def record(self, record):
+		if None == self.state or None == self.journal:
+			return
+		applyRecord(self.state, self.roster, record)
+		self.append(record)
+		self.records += 1
+		if self.records >= COMPACT_RECORDS:
+			self.compact()
+	
+	# Writes the current state as a new snapshot and truncates the journal.
+	def compact(self):
+		if not None == self.state:
+			self.state["order"] = list(self.roster.getOrder())
+			self.reset(self.state)
+	
+	# Closes the journal. Changes aren't recorded until the next snapshot.
+	def close(self):
+		if not None == self.journal:
+			self.journal.close()
+			self.journal = None
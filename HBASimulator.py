@@ -0,0 +1,239 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBASimulator plays out encounters many times with the Monte Carlo method.
+# Every round, each attacker attacks the simulated character: a d20 plus the attacker's bonus hits if it reaches the armour class,
+# the last digit of the attack total decides the hit location (like in HBA.calculateDamage) and the armour layers of the slot reduce the damage.
+# The trials are split into chunks that run on a process pool. Every chunk has its own seed derived from the seed of the simulation,
+# so a simulation with the same seed gives the same result on any number of cores.
+# 
+# Usage: python HomebrewArmour.py simulate CONFIGURATION --attacker "Goblin:+4:1d6+2:slashing" [...] --hp 30 --ac 14
+
+# Changelog
+# 2026-10-16: Messages about the loaded files are written through HBALog
+# 2026-10-16: Damage types and hit locations are taken from the registry
+# 2026-10-16: Characters sharing a loadout and hit points are only simulated once
+# 2026-10-16: Initial version
+
+import argparse
+import json
+import multiprocessing
+import numpy as np
+import HBAEngine as E
+import HBALog as O
+import HBAStats as S
+
+# Number of trials simulated by one task of the process pool
+CHUNK_SIZE = 50000
+
+# Parses an attacker in the format "NAME:BONUS:DAMAGE ROLL:DAMAGE TYPE", for example "Goblin:+4:1d6+2:slashing".
+# 
+# @param text The attacker.
+# @param damageTypes List of the valid damage types in the order of the columns of the reduction tables, by default the built-in damage types.
+# @return The attacker in the format [name, bonus, dice terms, modifier, damage type index].
+def parseAttacker(text, damageTypes=E.DAMAGE_TYPES):
+	fields = text.split(":")
+	if len(fields) != 4:
+		raise ValueError("Attacker \"" + text + "\" must have the format NAME:BONUS:DAMAGE ROLL:DAMAGE TYPE.")
+	try:
+		bonus = int(fields[1])
+	except ValueError:
+		raise ValueError("Attack bonus of \"" + text + "\" must be an integer.")
+	terms, modifier, damageType = S.parseDamageRoll(fields[2] + " " + fields[3], damageTypes)
+	return [fields[0], bonus, terms, modifier, damageTypes.index(damageType)]
+
+# Collects the armour layers of a character with their reductions.
+# 
+# @param registry The registry holding the character and the armour definitions.
+# @param character The Character as stored in the registry.
+# @return List with the layers of each slot in SLOT_NAMES. Each layer is [armour name, reductions of each damage type]. Undefined armour reduces nothing.
+def characterLayers(registry, character):
+	slots = []
+	for slot in registry.getSlots(character):
+		layers = []
+		for armourLayer in slot:
+			armourType = registry.getArmour(armourLayer)
+			if None == armourType:
+				layers.append([armourLayer, [0] * len(registry.damageTypes)])
+			else:
+				layers.append([armourLayer, armourType.reductions.tolist()])
+		slots.append(layers)
+	return slots
+
+# Rolls the damage of many attacks at once.
+# 
+# @param rng The random number generator.
+# @param terms List of dice [count, sides] as returned by HBAStats.parseDamageRoll.
+# @param modifier The constant modifier of the damage roll.
+# @param count The number of damage rolls.
+# @return Array with the damage totals.
+def rollDamage(rng, terms, modifier, count):
+	damage = np.full(count, modifier, dtype=np.int64)
+	for dice, sides in terms:
+		rolls = rng.integers(1, sides + 1, size=(count, abs(dice))).sum(axis=1)
+		damage += rolls if dice > 0 else -rolls
+	return damage
+
+# Simulates a chunk of trials. This runs in a worker process.
+# 
+# @param task Tuple of the layers as returned by characterLayers, the parsed attackers, the hit points, the armour class,
+# the number of trials, the maximum number of rounds, the seed sequence of the chunk, the hit locations and the number of damage types.
+# @return Dictionary with the histogram of the rounds to down (the last bin counts trials that survived all rounds),
+# the damage absorbed by each layer, the damage taken on each slot and the hits on each slot.
+def simulateChunk(task):
+	layers, attackers, hitPoints, armourClass, trials, maxRounds, seed, hitLocations, damageTypeCount = task
+	rng = np.random.default_rng(seed)
+	locations = np.array(hitLocations, dtype=np.intp)
+	# Reductions of each layer as (slot, layer, damage type), padded with zeros
+	depth = max([len(slot) for slot in layers] + [1])
+	reductions = np.zeros((len(E.SLOT_NAMES), depth, damageTypeCount), dtype=np.int64)
+	for slotIndex, slot in enumerate(layers):
+		for layerIndex, layer in enumerate(slot):
+			reductions[slotIndex, layerIndex] = layer[1]
+	absorbed = np.zeros((len(E.SLOT_NAMES), depth), dtype=np.int64)
+	slotDamage = np.zeros(len(E.SLOT_NAMES), dtype=np.int64)
+	slotHits = np.zeros(len(E.SLOT_NAMES), dtype=np.int64)
+	roundsToDown = np.full(trials, maxRounds + 1, dtype=np.int64)
+	remaining = np.full(trials, hitPoints, dtype=np.int64)
+	alive = np.arange(trials)
+	for currentRound in range(1, maxRounds + 1):
+		for name, bonus, terms, modifier, column in attackers:
+			if len(alive) == 0:
+				break
+			natural = rng.integers(1, 21, size=len(alive))
+			attack = natural + bonus
+			# A natural 20 always hits and a natural 1 always misses
+			hit = ((attack >= armourClass) | (natural == 20)) & (natural != 1)
+			targets = alive[hit]
+			slots = locations[attack[hit] % 10]
+			damage = rollDamage(rng, terms, modifier, len(targets))
+			# Every layer absorbs up to its reduction from the damage that is left
+			for layerIndex in range(depth):
+				layerAbsorbed = np.minimum(np.maximum(damage, 0), reductions[slots, layerIndex, column])
+				absorbed[:, layerIndex] += np.bincount(slots, weights=layerAbsorbed, minlength=len(E.SLOT_NAMES)).astype(np.int64)
+				damage = damage - layerAbsorbed
+			# Damage can't be negative
+			damage = np.maximum(damage, 0)
+			slotDamage += np.bincount(slots, weights=damage, minlength=len(E.SLOT_NAMES)).astype(np.int64)
+			slotHits += np.bincount(slots, minlength=len(E.SLOT_NAMES))
+			np.subtract.at(remaining, targets, damage)
+			downed = alive[remaining[alive] <= 0]
+			roundsToDown[downed] = currentRound
+			alive = alive[remaining[alive] > 0]
+	return {
+		"rounds": np.bincount(roundsToDown, minlength=maxRounds + 2)[1:],
+		"absorbed": absorbed,
+		"slotDamage": slotDamage,
+		"slotHits": slotHits,
+	}
+
+# Simulates an encounter of a character against a group of attackers.
+# 
+# @param registry The registry holding the character and the armour definitions.
+# @param characterID The ID of the simulated character.
+# @param attackers List of attackers as returned by parseAttacker.
+# @param hitPoints The hit points of the character.
+# @param armourClass The armour class of the character.
+# @param trials The number of simulated encounters.
+# @param seed The seed of the simulation.
+# @param processes The number of worker processes. By default, all cores are used.
+# @param maxRounds The number of rounds after which an encounter ends if the character is still standing.
+# @return Dictionary with the summed results of all chunks (see simulateChunk) and the number of trials.
+def simulate(registry, characterID, attackers, hitPoints, armourClass, trials, seed=0, processes=None, maxRounds=100):
+	layers = characterLayers(registry, registry.getCharacter(characterID))
+	chunks = (trials + CHUNK_SIZE - 1) // CHUNK_SIZE
+	seeds = np.random.SeedSequence(seed).spawn(chunks)
+	tasks = []
+	for index in range(chunks):
+		size = min(CHUNK_SIZE, trials - index * CHUNK_SIZE)
+		tasks.append((layers, attackers, hitPoints, armourClass, size, maxRounds, seeds[index], registry.hitLocations, len(registry.damageTypes)))
+	if processes == 1 or chunks == 1:
+		results = [simulateChunk(task) for task in tasks]
+	else:
+		with multiprocessing.Pool(processes) as pool:
+			results = pool.map(simulateChunk, tasks)
+	total = {"trials": trials, "layers": layers}
+	for key in ["rounds", "absorbed", "slotDamage", "slotHits"]:
+		total[key] = sum(result[key] for result in results)
+	return total
+
+# Summarizes the result of a simulation.
+# 
+# @param result The result as returned by simulate.
+# @return Dictionary with the chance of going down, the mean and percentiles of the rounds to down, the mean damage absorbed by each layer
+# per encounter and the mean damage taken and hits on each slot per encounter, sorted by damage taken.
+def summarize(result):
+	trials = result["trials"]
+	downed = result["rounds"][:-1]
+	summary = {"down": float(downed.sum() / trials)}
+	if downed.sum() > 0:
+		rounds = np.arange(1, len(downed) + 1)
+		cumulative = np.cumsum(downed) / downed.sum()
+		summary["meanRoundsToDown"] = float(np.dot(rounds, downed) / downed.sum())
+		for percentile in S.PERCENTILES:
+			summary["p" + str(percentile)] = int(rounds[np.searchsorted(cumulative, percentile / 100 - 1e-12)])
+	summary["absorbed"] = []
+	for slotIndex, slot in enumerate(result["layers"]):
+		for layerIndex, layer in enumerate(slot):
+			summary["absorbed"].append([E.SLOT_NAMES[slotIndex], layer[0], float(result["absorbed"][slotIndex, layerIndex] / trials)])
+	summary["slots"] = sorted(
+		[[E.SLOT_NAMES[index], float(result["slotDamage"][index] / trials), float(result["slotHits"][index] / trials)] for index in range(len(E.SLOT_NAMES))],
+		key=lambda slot: -slot[1])
+	return summary
+
+# Runs simulations for the characters of a configuration and prints the summaries.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(prog="HomebrewArmour.py simulate", description="Monte Carlo simulation of encounters against the characters of a configuration.")
+	parser.add_argument("configuration", help="the configuration file (.hacfg) with the armour and characters")
+	parser.add_argument("--attacker", action="append", required=True, help="an attacker like \"Goblin:+4:1d6+2:slashing\", can be given multiple times")
+	parser.add_argument("--character", action="append", help="name of a character to simulate (default: all characters)")
+	parser.add_argument("--hp", type=int, default=None, help="hit points of the characters (default: the hit points of each character or 30)")
+	parser.add_argument("--ac", type=int, default=14, help="armour class of the characters")
+	parser.add_argument("--trials", type=int, default=100000, help="number of simulated encounters per character")
+	parser.add_argument("--rounds", type=int, default=100, help="maximum number of rounds per encounter")
+	parser.add_argument("--seed", type=int, default=0, help="seed of the simulation")
+	parser.add_argument("--processes", type=int, default=None, help="number of worker processes (default: all cores)")
+	parser.add_argument("--json", action="store_true", help="print the summaries as JSON")
+	args = parser.parse_args(args)
+	registry = E.Registry()
+	for message in E.loadConfiguration(registry, args.configuration):
+		O.warning(message)
+	# The configuration may declare the damage types
+	try:
+		attackers = [parseAttacker(attacker, registry.damageTypes) for attacker in args.attacker]
+	except ValueError as error:
+		parser.error(str(error))
+	summaries = {}
+	# Summaries keyed by loadout and hit points - identically equipped characters like the members of a squad are only simulated once
+	simulated = {}
+	for characterID, character in registry.characters.items():
+		if not None == args.character and not character.name in args.character:
+			continue
+		hitPoints = args.hp
+		if None == hitPoints:
+			hitPoints = 30 if None == character.hitPoints else character.hitPoints
+		key = (character.loadout, hitPoints)
+		if not key in simulated:
+			result = simulate(registry, characterID, attackers, hitPoints, args.ac, args.trials, args.seed, args.processes, args.rounds)
+			simulated[key] = summarize(result)
+		# Characters sharing a name are told apart by their ID, so none of them overwrites the summary of another
+		label = character.name
+		if len(registry.characterNames[character.name]) > 1:
+			label += " (" + str(characterID) + ")"
+		summaries[label] = simulated[key]
+	if args.json:
+		print(json.dumps(summaries, indent=1))
+		return
+	for name, summary in summaries.items():
+		print(name + ": down in " + "{:.1f}".format(100 * summary["down"]) + " % of the encounters")
+		if "meanRoundsToDown" in summary:
+			print("\tRounds to down: mean " + "{:.2f}".format(summary["meanRoundsToDown"]) + ", " + ", ".join("p" + str(percentile) + " " + str(summary["p" + str(percentile)]) for percentile in S.PERCENTILES))
+		print("\tDamage absorbed per encounter:")
+		for slotName, armourName, absorbed in summary["absorbed"]:
+			print("\t\t" + slotName + " " + armourName + ": " + "{:.2f}".format(absorbed))
+		print("\tDamage taken per encounter:")
+		for slotName, damage, hits in summary["slots"]:
+			print("\t\t" + slotName + ": " + "{:.2f}".format(damage) + " (" + "{:.2f}".format(hits) + " hits)")
@@ -0,0 +1,182 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAStats calculates the exact distribution of the reduced damage a character takes from a damage roll like "2d6+3 slashing".
+# The distribution of the dice is calculated by convolution and combined with the probability of each hit location
+# (the last digit of the attack roll) and the reduction of the hit slot.
+# 
+# Usage: python HomebrewArmour.py stats CONFIGURATION "DICE DAMAGE TYPE" [...]
+
+# Changelog
+# 2026-10-16: Messages about the loaded files are written through HBALog
+# 2026-10-16: Damage types and hit locations are taken from the registry
+# 2026-10-16: Initial version
+
+import argparse
+import functools
+import re
+import numpy as np
+import HBAEngine as E
+import HBALog as O
+
+# Percentiles included in a summary
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Calculates the probability of hitting each slot, assuming every last digit of the attack roll is equally likely.
+# 
+# @param hitLocations The row of the reduction table that is hit for each last digit of the attack roll.
+# @return Tuple with the probability of each slot in SLOT_NAMES.
+def slotProbabilities(hitLocations):
+	return tuple((np.bincount(hitLocations, minlength=len(E.SLOT_NAMES)) / len(hitLocations)).tolist())
+
+# Probability of hitting each slot with the default hit locations
+SLOT_PROBABILITIES = slotProbabilities(E.HIT_LOCATIONS)
+
+# Parses a damage roll like "2d6+3 slashing" or "1d8 + 1d6 - 1 piercing".
+# 
+# @param expression The damage roll.
+# @param damageTypes List of the valid damage types, by default the built-in damage types.
+# @return Tuple of a list of dice [count, sides] (negative counts are subtracted), the constant modifier and the damage type.
+def parseDamageRoll(expression, damageTypes=E.DAMAGE_TYPES):
+	fields = expression.rsplit(None, 1)
+	if len(fields) < 2 or not fields[1] in damageTypes:
+		raise ValueError("Damage roll \"" + expression + "\" must end with one of the damage types " + ", ".join(damageTypes) + ".")
+	dice = "".join(fields[0].split())
+	if None == re.fullmatch(r"([+-]?(\d*d\d+|\d+))+", dice):
+		raise ValueError("Dice \"" + fields[0] + "\" must be a sum of terms like 2d6 or 3.")
+	terms = []
+	modifier = 0
+	for sign, count, sides, constant in re.findall(r"([+-]?)(?:(\d*)d(\d+)|(\d+))", dice):
+		factor = -1 if sign == "-" else 1
+		if constant != "":
+			modifier += factor * int(constant)
+		elif int(sides) > 0:
+			terms.append([factor * int(count or 1), int(sides)])
+	return terms, modifier, fields[1]
+
+# Calculates the exact distribution of the total of a dice roll.
+# 
+# @param terms List of dice [count, sides] as returned by parseDamageRoll.
+# @param modifier The constant modifier of the roll.
+# @return Tuple of the lowest possible total and an array with the probability of each total starting from the lowest.
+def diceDistribution(terms, modifier):
+	lowest = modifier
+	probabilities = np.ones(1)
+	for count, sides in terms:
+		die = np.full(sides, 1 / sides)
+		for _ in range(abs(count)):
+			probabilities = np.convolve(probabilities, die)
+		# Subtracted dice range from -sides to -1 instead of 1 to sides
+		lowest += count if count > 0 else count * sides
+	return lowest, probabilities
+
+# Calculates the exact distribution of the dice part of a damage roll.
+# Results are cached, so the dice are only convolved once per damage roll.
+# 
+# @param dice The dice part of the damage roll without spaces, for example "2d6+3".
+# @return Tuple of the lowest possible total and an array with the probability of each total starting from the lowest. The array must not be modified.
+@functools.lru_cache(maxsize=256)
+def rollDistribution(dice):
+	terms, modifier, _ = parseDamageRoll(dice + " " + E.DAMAGE_TYPES[0])
+	lowest, probabilities = diceDistribution(terms, modifier)
+	probabilities.flags.writeable = False
+	return lowest, probabilities
+
+# Splits a damage roll into its dice and its damage type.
+# 
+# @param expression The damage roll, for example "2d6 + 3 slashing".
+# @param damageTypes List of the valid damage types, by default the built-in damage types.
+# @return Tuple of the dice without spaces (for example "2d6+3") and the damage type.
+def splitDamageRoll(expression, damageTypes=E.DAMAGE_TYPES):
+	parseDamageRoll(expression, damageTypes)
+	fields = expression.rsplit(None, 1)
+	return "".join(fields[0].split()), fields[1]
+
+# Calculates the distribution of the reduced damage for a loadout.
+# Results are cached, so evaluating the same loadout and damage roll again (for example for identically equipped characters) is free.
+# 
+# @param reductions The reductions of the damage type for each slot in SLOT_NAMES as a tuple.
+# @param dice The dice part of the damage roll without spaces, for example "2d6+3".
+# @param probabilities The probability of hitting each slot as returned by slotProbabilities.
+# @return Array with the probability of each reduced damage value starting from 0. The array must not be modified.
+@functools.lru_cache(maxsize=4096)
+def reducedDistribution(reductions, dice, probabilities=SLOT_PROBABILITIES):
+	lowest, rollProbabilities = rollDistribution(dice)
+	values = np.arange(lowest, lowest + len(rollProbabilities))
+	result = np.zeros(max(values[-1], 0) + 1)
+	for slotProbability, reduction in zip(probabilities, reductions):
+		if slotProbability == 0:
+			continue
+		# Damage can't be negative
+		np.add.at(result, np.maximum(values - reduction, 0), slotProbability * rollProbabilities)
+	result.flags.writeable = False
+	return result
+
+# Calculates the distribution of the reduced damage a character takes from a damage roll.
+# 
+# @param registry The registry holding the character.
+# @param character The Character as stored in the registry.
+# @param expression The damage roll, for example "2d6+3 slashing".
+# @return Array with the probability of each reduced damage value starting from 0.
+def characterDistribution(registry, character, expression):
+	dice, damageType = splitDamageRoll(expression, registry.damageTypes)
+	column = registry.damageTypeIndex[damageType]
+	return reducedDistribution(tuple(row[column] for row in character.reductions), dice, slotProbabilities(registry.hitLocations))
+
+# Calculates the distribution of the reduced damage an armour type takes from a damage roll if it is worn on every slot.
+# 
+# @param registry The registry holding the armour type.
+# @param armourType The ArmourType.
+# @param expression The damage roll, for example "2d6+3 slashing".
+# @return Array with the probability of each reduced damage value starting from 0.
+def armourDistribution(registry, armourType, expression):
+	dice, damageType = splitDamageRoll(expression, registry.damageTypes)
+	return reducedDistribution((armourType.reduction(registry, damageType),) * len(E.SLOT_NAMES), dice, slotProbabilities(registry.hitLocations))
+
+# Summarizes a damage distribution.
+# 
+# @param distribution Array with the probability of each damage value starting from 0.
+# @return Dictionary with the mean, the chance of zero damage and the damage at each of the PERCENTILES.
+def summarize(distribution):
+	cumulative = np.cumsum(distribution)
+	summary = {"mean": float(np.dot(np.arange(len(distribution)), distribution)), "zero": float(distribution[0])}
+	for percentile in PERCENTILES:
+		# Small tolerance against rounding errors of the cumulative sum
+		summary["p" + str(percentile)] = int(np.searchsorted(cumulative, percentile / 100 - 1e-12))
+	return summary
+
+# Formats a summary as a single line.
+# 
+# @param name The name of the character or armour type.
+# @param summary The summary as returned by summarize.
+# @return The formatted line.
+def formatSummary(name, summary):
+	percentiles = ", ".join("p" + str(percentile) + " " + str(summary["p" + str(percentile)]) for percentile in PERCENTILES)
+	return name + ": mean " + "{:.2f}".format(summary["mean"]) + ", P(0) " + "{:.1f}".format(100 * summary["zero"]) + " %, " + percentiles
+
+# Prints the damage distributions of all characters (or armour types) of a configuration.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(prog="HomebrewArmour.py stats", description="Exact reduced damage distributions per character and damage roll.")
+	parser.add_argument("configuration", help="the configuration file (.hacfg) with the armour and characters")
+	parser.add_argument("rolls", nargs="+", help="damage rolls like \"2d6+3 slashing\"")
+	parser.add_argument("--library", action="store_true", help="evaluate every armour type worn on every slot instead of the characters")
+	args = parser.parse_args(args)
+	registry = E.Registry()
+	for message in E.loadConfiguration(registry, args.configuration):
+		O.warning(message)
+	for expression in args.rolls:
+		try:
+			parseDamageRoll(expression, registry.damageTypes)
+		except ValueError as error:
+			print(error)
+			continue
+		print(expression)
+		if args.library:
+			for armourType in registry.armour.values():
+				print("\t" + formatSummary(armourType.name, summarize(armourDistribution(registry, armourType, expression))))
+		else:
+			for character in registry.characters.values():
+				print("\t" + formatSummary(character.name, summarize(characterDistribution(registry, character, expression))))
@@ -0,0 +1,273 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAValidate checks a whole campaign directory before a session instead of reporting problems one by one while files are loaded.
+# Every armour (.hba), character (.char) and configuration (.hacfg) file is parsed on a process pool. Afterwards, the files are checked
+# against each other: every file referenced by a configuration must exist, every equipped item must be defined by the armour files
+# of the configuration, armour types shouldn't be defined again by another armour file of the same configuration,
+# the reductions of the damage types a configuration declares must be valid and the names of the characters of a configuration must be unique. All problems are reported with their file and line.
+# The loader resolves relative paths in configurations against the working directory, and a campaign is run from its directory,
+# so relative paths are resolved against the checked directory, no matter where the check is started.
+
+# Changelog
+# 2026-10-17: Relative paths in configurations are resolved against the checked directory instead of the working directory
+# 2026-10-16: Initial version
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import HBAEngine as E
+
+# Kind of the files with each extension
+EXTENSIONS = {".hba": "armour", ".char": "character", ".hacfg": "configuration"}
+# Directories that aren't scanned (besides hidden directories)
+SKIPPED_DIRECTORIES = {"__hbacache__", "__pycache__"}
+# Number of files below which parsing on a process pool doesn't pay off
+POOL_THRESHOLD = 64
+
+# Finds the files to check in a directory and its subdirectories.
+# 
+# @param directory The directory.
+# @return List of [path, kind] sorted by path.
+def findFiles(directory):
+	files = []
+	for root, directories, names in os.walk(directory):
+		directories[:] = [name for name in directories if not name in SKIPPED_DIRECTORIES and not name.startswith(".")]
+		for name in names:
+			kind = EXTENSIONS.get(os.path.splitext(name)[1])
+			if not None == kind:
+				files.append([os.path.normpath(os.path.join(root, name)), kind])
+	return sorted(files)
+
+# Splits a message of a parser into its line and problem.
+# 
+# @param path The path of the parsed file.
+# @param message The message in the format "path:line: problem".
+# @return Tuple of the path, the line (None if the message doesn't give one) and the problem.
+def splitMessage(path, message):
+	if message.startswith(path + ":"):
+		line, separator, problem = message[len(path) + 1:].partition(": ")
+		if line.isdigit():
+			return (path, int(line), problem)
+	return (path, None, message)
+
+# Parses a file and keeps the lines of its definitions, items and entries. Runs in a worker process.
+# 
+# @param task List of the path and the kind of the file.
+# @return List of the path, the kind, the parsed content (None if the file couldn't be read) and a list of problems (path, line, problem).
+# The content of an armour file is [line of each armour name, other stats of each armour name], of a character file [name, slots, line of each item]
+# and of a configuration [entries, line of each entry].
+def scanFile(task):
+	path, kind = task
+	try:
+		if kind == "armour":
+			definedAt = {}
+			definitions, messages = E.parseArmourFile(path, definedAt)
+			content = [definedAt, {definition[0]: definition[-1] for definition in definitions}]
+		elif kind == "character":
+			itemLines = [[] for _ in E.SLOT_NAMES]
+			name, slots, messages = E.parseCharacterFile(path, itemLines)
+			content = [name, slots, itemLines]
+		else:
+			entryLines = []
+			entries, messages = E.parseConfigurationFile(path, entryLines)
+			content = [entries, entryLines]
+	except (OSError, UnicodeDecodeError) as error:
+		return [path, kind, None, [(path, None, "couldn't be read: " + str(error))]]
+	return [path, kind, content, [splitMessage(path, message) for message in messages]]
+
+# Parses files, on a process pool if there are enough of them.
+# 
+# @param tasks List of [path, kind] of the files.
+# @param processes The number of worker processes. By default, all cores are used.
+# @return Dictionary with the result of scanFile keyed by (real path, kind).
+def scanFiles(tasks, processes=None):
+	if processes == 1 or len(tasks) < POOL_THRESHOLD:
+		results = [scanFile(task) for task in tasks]
+	else:
+		with multiprocessing.Pool(processes) as pool:
+			results = pool.map(scanFile, tasks, chunksize=max(1, len(tasks) // ((processes or os.cpu_count() or 1) * 4)))
+	return {(os.path.realpath(result[0]), result[1]): result for result in results}
+
+# Checks the armour of characters against armour definitions.
+# 
+# @param characters List of [path, name, slots, line of each item] of the characters.
+# @param defined Set or dictionary with the defined armour names.
+# @param source Description of the armour files for the messages, for example "the armour files of campaign.hacfg".
+# @param problems Set the problems are added to.
+def checkArmour(characters, defined, source, problems):
+	for path, name, slots, itemLines in characters:
+		for slotName, slot, lines in zip(E.SLOT_NAMES, slots, itemLines):
+			for armourName, line in zip(slot, lines):
+				if not armourName in defined:
+					problems.add((path, line, "Armour \"" + armourName + "\" in the slot " + slotName + " isn't defined by " + source + "."))
+
+# Resolves a path of a configuration like the loader does when it runs in the campaign directory.
+# 
+# @param root The campaign directory.
+# @param value The path as given in the configuration.
+# @return The path relative to the working directory of the check.
+def resolvePath(root, value):
+	if os.path.isabs(value):
+		return value
+	return os.path.normpath(os.path.join(root, value))
+
+# Checks a configuration against the files it references.
+# 
+# @param path The path of the configuration file.
+# @param entries The entries of the configuration.
+# @param entryLines The line of each entry.
+# @param results The parsed files keyed by (real path, kind).
+# @param problems Set the problems are added to.
+# @param root The campaign directory relative paths are resolved against.
+# @return Tuple of a list of [path, name, slots, line of each item] of the characters and whether their armour was checked,
+# which it isn't if the configuration doesn't load any armour file.
+def checkConfiguration(path, entries, entryLines, results, problems, root="."):
+	# First definition of each armour name: (path, line)
+	defined = {}
+	armourLoaded = False
+	characters = []
+	# Entry that added each character name: (line, path of the character file)
+	names = {}
+	# Damage types declared by the configuration and the loaded armour files: [path, content]
+	damageTypes = []
+	armourFiles = []
+	for entry, line in zip(entries, entryLines):
+		key, value = entry[0], entry[1]
+		# The last declaration applies to all armour, wherever it is in the configuration
+		if key == "damagetypes":
+			damageTypes = entry[1]
+			continue
+		if not key in ["armour", "character", "squad"]:
+			continue
+		kind = "armour" if key == "armour" else "character"
+		filePath = resolvePath(root, value)
+		if not os.path.exists(filePath):
+			problem = key.capitalize() + " file \"" + value + "\" doesn't exist."
+			# Paths are relative to the campaign directory, not to the configuration
+			if not os.path.isabs(value) and os.path.exists(os.path.join(os.path.dirname(path), value)):
+				problem += " It exists next to the configuration, but paths are relative to the campaign directory."
+			problems.add((path, line, problem))
+			continue
+		result = results.get((os.path.realpath(filePath), kind))
+		if None == result or None == result[2]:
+			continue
+		if kind == "armour":
+			armourLoaded = True
+			armourFiles.append([filePath, result[2]])
+			for armourName, definedAt in result[2][0].items():
+				if not armourName in defined:
+					defined[armourName] = (filePath, definedAt)
+				elif defined[armourName][0] != filePath:
+					problems.add((filePath, definedAt, "Armour type \"" + armourName + "\" is already defined in " + defined[armourName][0] + ":"
+						+ str(defined[armourName][1]) + ". " + path + " only uses the first definition."))
+			continue
+		name, slots, itemLines = result[2]
+		characters.append([filePath, name, slots, itemLines])
+		if key == "character":
+			# Characters without a name get a generated one
+			memberNames = [] if None == name else [name]
+		else:
+			squadName = os.path.splitext(os.path.basename(value))[0] if None == name else name
+			memberNames = [squadName + " " + str(number) for number in range(1, entry[2] + 1)]
+		for memberName in memberNames:
+			if memberName in names:
+				problems.add((path, line, "Character name \"" + memberName + "\" is already used by " + names[memberName][1] + " in line " + str(names[memberName][0]) + "."))
+			else:
+				names[memberName] = (line, filePath)
+	if armourLoaded:
+		checkArmour(characters, defined, "the armour files of " + path, problems)
+	# Check the reductions of the declared damage types of the armour types the configuration uses, as the registry does when it builds them
+	declared = [damageType for damageType in damageTypes if not damageType in E.DAMAGE_TYPE_INDEX]
+	for armourPath, (armourLines, stats) in armourFiles:
+		for armourName, armourStats in stats.items():
+			if defined[armourName][0] != armourPath:
+				continue
+			for damageType in declared:
+				if damageType in armourStats:
+					problem = E.checkReduction(damageType, armourStats[damageType])
+					if not None == problem:
+						problems.add((armourPath, armourLines[armourName], "Armour type \"" + armourName + "\": " + problem))
+	return characters, armourLoaded
+
+# Validates a campaign directory.
+# 
+# @param directory The directory.
+# @param processes The number of worker processes. By default, all cores are used.
+# @return Tuple of a list of problems (path, line, problem) sorted by path and line and the number of checked files.
+def validate(directory, processes=None):
+	results = scanFiles(findFiles(directory), processes)
+	# Files referenced by configurations that are outside the directory or have another extension
+	referenced = []
+	for path, kind, content, fileProblems in list(results.values()):
+		if kind != "configuration" or None == content:
+			continue
+		for entry in content[0]:
+			if entry[0] in ["armour", "character", "squad"] and os.path.exists(resolvePath(directory, entry[1])):
+				task = [resolvePath(directory, entry[1]), "armour" if entry[0] == "armour" else "character"]
+				if not (os.path.realpath(task[0]), task[1]) in results and not task in referenced:
+					referenced.append(task)
+	results.update(scanFiles(referenced, processes))
+	problems = set()
+	for path, kind, content, fileProblems in results.values():
+		problems.update(fileProblems)
+	# Characters keyed by real path whose armour was checked by a configuration and those whose armour wasn't
+	checked = set()
+	unchecked = {}
+	for path, kind, content, fileProblems in results.values():
+		if kind == "configuration" and not None == content:
+			characters, armourLoaded = checkConfiguration(path, content[0], content[1], results, problems, directory)
+			for character in characters:
+				if armourLoaded:
+					checked.add(os.path.realpath(character[0]))
+				else:
+					unchecked.setdefault(os.path.realpath(character[0]), character)
+	for path, kind, content, fileProblems in results.values():
+		if kind == "character" and not None == content:
+			unchecked.setdefault(os.path.realpath(path), [path] + content)
+	# Check the armour of the other characters against all armour files that were found
+	defined = set()
+	for path, kind, content, fileProblems in results.values():
+		if kind == "armour" and not None == content:
+			defined.update(content[0])
+	if len(defined) > 0:
+		checkArmour([character for realPath, character in unchecked.items() if not realPath in checked], defined, "any armour file", problems)
+	# Files are named the same, whether they were found in the directory or referenced by a configuration
+	problems = {(os.path.normpath(path), line, text) for path, line, text in problems}
+	return sorted(problems, key=lambda problem: (problem[0], -1 if None == problem[1] else problem[1], problem[2])), len(results)
+
+# Formats a problem.
+# 
+# @param problem The problem (path, line, problem).
+# @return The problem in the format "path:line: problem".
+def formatProblem(problem):
+	path, line, text = problem
+	if None == line:
+		return path + ": " + text
+	return path + ":" + str(line) + ": " + text
+
+# Validates a campaign directory and prints all problems. Exits with status 1 if there are any.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(prog="HomebrewArmour.py validate", description="Check all armour, character and configuration files of a campaign directory. "
+		+ "Relative paths in configurations are resolved against the campaign directory, like the loader does when it is run from there.")
+	parser.add_argument("directory", nargs="?", default=".", help="the campaign directory (default: the working directory)")
+	parser.add_argument("--processes", type=int, default=None, help="number of worker processes (default: all cores)")
+	parser.add_argument("--json", action="store_true", help="print the problems as JSON")
+	args = parser.parse_args(args)
+	start = time.perf_counter()
+	problems, fileCount = validate(args.directory, args.processes)
+	seconds = time.perf_counter() - start
+	if args.json:
+		print(json.dumps([{"path": path, "line": line, "problem": text} for path, line, text in problems], indent=1))
+	else:
+		for problem in problems:
+			print(formatProblem(problem))
+		print(str(fileCount) + " files checked in " + "{:.2f}".format(seconds) + " s: " + str(len(problems)) + " problems.")
+	if len(problems) > 0:
+		sys.exit(1)
@@ -0,0 +1,235 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# HBAWatch notices changes to the loaded armour and character files and applies them to the registry without reloading everything.
+# Files are polled with os.stat, which only needs the standard library and works on every platform and file system.
+# Only a changed file is parsed again. For armour files, the old and new definitions of the file are compared and only the armour types
+# that were added, changed or removed are rebuilt, so only the loadouts wearing them are recompiled.
+# For character files, the name and armour of the characters loaded from the file are updated in place.
+
+# Changelog
+# 2026-10-16: Initial version
+
+import os
+import HBACache as C
+import HBAEngine as E
+
+# Time between two polls in milliseconds
+POLL_INTERVAL = 1000
+
+# Gets the modification time and size of a file.
+# 
+# @param path The path of the file.
+# @return Tuple of the modification time in nanoseconds and the size or None if the file doesn't exist.
+def stamp(path):
+	try:
+		status = os.stat(path)
+	except OSError:
+		return None
+	return (status.st_mtime_ns, status.st_size)
+
+# Compares two lists of armour definitions.
+# 
+# @param old The old definitions.
+# @param new The new definitions.
+# @return Set of the names of the armour types that were added, changed or removed.
+def diffDefinitions(old, new):
+	oldDefinitions = {}
+	for definition in old:
+		oldDefinitions.setdefault(definition[0], definition)
+	newDefinitions = {}
+	for definition in new:
+		newDefinitions.setdefault(definition[0], definition)
+	return {name for name in oldDefinitions.keys() | newDefinitions.keys() if oldDefinitions.get(name) != newDefinitions.get(name)}
+
+# Watches the files the armour and characters of a registry were loaded from.
+class Watcher:
+	# Constructor method
+	# 
+	# @param registry The registry the files were loaded into.
+	def __init__(self, registry):
+		self.registry = registry
+		# Modification time and size of each watched file when it was last read
+		self.stamps = {}
+		# Armour files in the order their definitions are combined: [path, definitions]
+		self.armourFiles = []
+		# Loads of character and squad files keyed by path. A file can be loaded more than once, for example as a character and as a squad.
+		# Each load is a list: [squad name or None for a character, IDs of the characters loaded (a dictionary used as ordered set)]
+		self.characterFiles = {}
+		# Path and load each character came from keyed by character ID
+		self.characterSources = {}
+	
+	# Sets the armour files the armour definitions of the registry were combined from.
+	# 
+	# @param armourFiles List of [path, definitions] in the order the definitions were combined.
+	def watchArmour(self, armourFiles):
+		for path, definitions in self.armourFiles:
+			if not path in self.characterFiles:
+				self.stamps.pop(path, None)
+		self.armourFiles = [[path, definitions] for path, definitions in armourFiles]
+		for path, definitions in self.armourFiles:
+			self.stamps[path] = stamp(path)
+	
+	# Adds an armour file whose definitions were appended to the armour definitions of the registry.
+	# 
+	# @param path The path of the armour file.
+	# @param definitions The definitions of the file.
+	def addArmour(self, path, definitions):
+		self.armourFiles.append([path, definitions])
+		self.stamps[path] = stamp(path)
+	
+	# Watches the file characters were loaded from.
+	# 
+	# @param path The path of the character file.
+	# @param characterIDs The IDs of the characters loaded from the file.
+	# @param squadName The name of the squad if the file was loaded as a squad, None otherwise.
+	def watchCharacters(self, path, characterIDs, squadName=None):
+		for characterID in characterIDs:
+			self.forgetCharacter(characterID)
+		load = [squadName, dict.fromkeys(characterIDs)]
+		self.characterFiles.setdefault(path, []).append(load)
+		for characterID in characterIDs:
+			self.characterSources[characterID] = (path, load)
+		self.stamps[path] = stamp(path)
+	
+	# Watches the files of a configuration after it was applied with E.applyConfiguration.
+	# 
+	# @param parsed The parsed configuration as returned by E.parseConfiguration.
+	# @param characterIDs The IDs of the added characters as returned by E.applyConfiguration.
+	def watchConfiguration(self, parsed, characterIDs):
+		armourFiles = []
+		position = 0
+		for entry in parsed:
+			key, path, result = entry[0], entry[1], entry[-1]
+			if None == result:
+				continue
+			if key == "armour":
+				armourFiles.append([path, result[0]])
+			elif key == "character":
+				self.watchCharacters(path, characterIDs[position:position + 1])
+				position += 1
+			elif key == "squad":
+				self.watchCharacters(path, characterIDs[position:position + entry[2]], squadName(path, result[0]))
+				position += entry[2]
+		# The armour files of a configuration replace the armour definitions loaded before
+		if len(armourFiles) > 0:
+			self.watchArmour(armourFiles)
+	
+	# Stops watching a character, for example because it was removed.
+	# 
+	# @param characterID The ID of the character.
+	def forgetCharacter(self, characterID):
+		source = self.characterSources.pop(characterID, None)
+		if None == source:
+			return
+		path, load = source
+		del load[1][characterID]
+		if len(load[1]) == 0:
+			loads = self.characterFiles[path]
+			loads.remove(load)
+			if len(loads) == 0:
+				del self.characterFiles[path]
+				if not any(path == armourPath for armourPath, definitions in self.armourFiles):
+					self.stamps.pop(path, None)
+	
+	# Checks which watched files changed since they were last read.
+	# 
+	# @return List of the paths of the changed files.
+	def poll(self):
+		changed = []
+		for path, oldStamp in self.stamps.items():
+			newStamp = stamp(path)
+			# Files that were deleted keep their content until they are written again
+			if not None == newStamp and newStamp != oldStamp:
+				changed.append(path)
+		for path in changed:
+			self.stamps[path] = stamp(path)
+		return changed
+	
+	# Parses a changed armour file again and updates the armour types that changed.
+	# 
+	# @param path The path of the armour file.
+	# @return Tuple of a list of messages and whether any armour type changed.
+	def reloadArmour(self, path):
+		definitions, messages = C.cachedParse(path, E.parseArmourFile)
+		names = set()
+		for armourFile in self.armourFiles:
+			if armourFile[0] == path:
+				names |= diffDefinitions(armourFile[1], definitions)
+				armourFile[1] = definitions
+		if len(names) == 0:
+			return messages, False
+		combined = []
+		for armourPath, armourDefinitions in self.armourFiles:
+			combined.extend(armourDefinitions)
+		for characterID, armourName in self.registry.updateArmourDefinitions(combined, names):
+			messages.append("Error: " + self.registry.characters[characterID].name + " is wearing undefined armour: " + armourName)
+		messages.extend(self.registry.invalidReductions)
+		messages.append("Armour file \"" + path + "\" reloaded: " + ", ".join(sorted(names)) + " changed.")
+		return messages, True
+	
+	# Parses a changed character file again and updates the name and armour of the characters loaded from it.
+	# 
+	# @param path The path of the character file.
+	# @return Tuple of a list of messages and the IDs of the changed characters.
+	def reloadCharacters(self, path):
+		name, slots, messages = C.cachedParse(path, E.parseCharacterFile)
+		changed = []
+		for load in self.characterFiles[path]:
+			# Squad members keep their number, even if other members were removed
+			names = {}
+			if None == load[0]:
+				names = dict.fromkeys(load[1], name)
+			elif squadName(path, name) != load[0]:
+				oldName = load[0]
+				load[0] = squadName(path, name)
+				for characterID in load[1]:
+					names[characterID] = load[0] + self.registry.characters[characterID].name[len(oldName):]
+			for characterID in load[1]:
+				character = self.registry.characters[characterID]
+				updated = False
+				characterName = names.get(characterID)
+				if not None == characterName and characterName != character.name:
+					self.registry.renameCharacter(characterID, characterName)
+					updated = True
+				if self.registry.getSlots(character) != slots:
+					for armourName in self.registry.setCharacterArmour(characterID, slots):
+						messages.append("Error: " + character.name + " is wearing undefined armour: " + armourName)
+					updated = True
+				if updated:
+					changed.append(characterID)
+		if len(changed) > 0:
+			messages.append("Character file \"" + path + "\" reloaded: " + str(len(changed)) + " characters changed.")
+		return messages, changed
+	
+	# Applies the changes of all watched files that changed since they were last read.
+	# 
+	# @return Tuple of a list of messages, the IDs of the characters whose name or armour changed and whether any armour type changed.
+	def update(self):
+		messages = []
+		characterIDs = []
+		armourChanged = False
+		for path in self.poll():
+			try:
+				if any(path == armourPath for armourPath, definitions in self.armourFiles):
+					fileMessages, fileChanged = self.reloadArmour(path)
+					armourChanged = armourChanged or fileChanged
+					messages.extend(fileMessages)
+				if path in self.characterFiles:
+					fileMessages, fileCharacters = self.reloadCharacters(path)
+					characterIDs.extend(fileCharacters)
+					messages.extend(fileMessages)
+			except (OSError, UnicodeDecodeError) as error:
+				messages.append("File \"" + path + "\" couldn't be reloaded: " + str(error))
+		return messages, characterIDs, armourChanged
+
+# Gets the name of a squad like E.applyConfiguration does.
+# 
+# @param path The path of the character file of the squad.
+# @param name The name given by the file or None.
+# @return The name of the squad.
+def squadName(path, name):
+	if None == name:
+		return os.path.splitext(os.path.basename(path))[0]
+	return name
@@ -0,0 +1,54 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Browser benchmark: measures the latency of each keystroke when typing queries into the armour browser of a large generated library,
+# with name searches, range queries on the reductions and both combined.
+# 
+# Usage: python benchmarks/benchBrowser.py [--armour 50000]
+
+# Changelog
+# 2026-10-16: Initial version
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBAEngine as E
+import HBAIndex as I
+import generators
+
+# Queries typed one character at a time
+QUERIES = ["armour 12", "rmour 4", "slashing>=4 piercing<=2", "armour 7 bludgeoning>=6"]
+
+# Runs the benchmark.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Benchmark for searching the armour browser while typing.")
+	parser.add_argument("--armour", type=int, default=50000, help="number of generated armour types")
+	args = parser.parse_args(args)
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, "library.hba")
+		generators.writeLibrary(path, args.armour)
+		registry = E.Registry()
+		registry.setArmourDefinitions(E.parseArmourFile(path)[0])
+	index = I.ArmourIndex(registry)
+	start = time.perf_counter()
+	index.refresh()
+	build = time.perf_counter() - start
+	print("Building the index of " + str(args.armour) + " armour types: " + "{:.1f}".format(build * 1000) + " ms")
+	for query in QUERIES:
+		latencies = []
+		for length in range(1, len(query) + 1):
+			start = time.perf_counter()
+			rows = index.search(query[:length])
+			latencies.append(time.perf_counter() - start)
+		print("\"" + query + "\": " + str(len(rows)) + " results, " + "{:.2f}".format(sum(latencies) / len(latencies) * 1000) + " ms per keystroke on average, "
+			+ "{:.2f}".format(max(latencies) * 1000) + " ms at most")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,104 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Memory benchmark: compares a synthetic roster stored as nested lists of armour names (the former data model)
+# with the same roster stored in the registry as Character objects with interned armour IDs and shared loadouts.
+# 
+# Usage: python benchmarks/benchMemory.py [--armour 500] [--characters 10000] [--loadouts 2000]
+
+# Changelog
+# 2026-10-16: Initial version
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBAEngine as E
+
+# Generates armour definitions and the slots of a roster.
+# Every armour name is a new string object, like the result of parsing a file for each character.
+# 
+# @param armourCount The number of armour types.
+# @param characterCount The number of characters.
+# @param loadoutCount The number of distinct loadouts the characters are equipped with.
+# @return Tuple of the armour definitions and a list of [name, slots] for every character.
+def generateRoster(armourCount, characterCount, loadoutCount):
+	rng = random.Random(0)
+	definitions = []
+	for index in range(armourCount):
+		definitions.append(["Armour " + str(index)] + [rng.randrange(8) for _ in E.DAMAGE_TYPES] + [{}])
+	loadouts = []
+	for _ in range(loadoutCount):
+		loadouts.append([[rng.randrange(armourCount) for _ in range(rng.randrange(4))] for _ in E.SLOT_NAMES])
+	roster = []
+	for index in range(characterCount):
+		loadout = loadouts[rng.randrange(loadoutCount)]
+		roster.append(["Character " + str(index), [["Armour " + str(armourIndex) for armourIndex in slot] for slot in loadout]])
+	return definitions, roster
+
+# Stores a roster in the former data model: lists of armour definitions and characters as [name, feet, legs, torso, arms, hands, head, reductions].
+# 
+# @param definitions The armour definitions.
+# @param roster The roster as returned by generateRoster.
+# @return The armour list and the character dictionary.
+def buildLists(definitions, roster):
+	armour = [list(definition) for definition in definitions]
+	index = {definition[0]: definition for definition in armour}
+	characters = {}
+	for characterID, (name, slots) in enumerate(roster):
+		reductions = []
+		for slot in slots:
+			slotReductions = [0] * len(E.DAMAGE_TYPES)
+			for armourLayer in slot:
+				for damageTypeIndex in range(len(E.DAMAGE_TYPES)):
+					slotReductions[damageTypeIndex] += index[armourLayer][damageTypeIndex + 1]
+			reductions.append(slotReductions)
+		characters[characterID] = [name] + [list(slot) for slot in slots] + [reductions]
+	return armour, characters
+
+# Stores a roster in a registry.
+# 
+# @param definitions The armour definitions.
+# @param roster The roster as returned by generateRoster.
+# @return The registry.
+def buildRegistry(definitions, roster):
+	registry = E.Registry()
+	registry.setArmourDefinitions(definitions)
+	for name, slots in roster:
+		registry.setCharacterArmour(registry.addCharacter(name), slots)
+	return registry
+
+# Measures the memory allocated while building a data model.
+# 
+# @param build The function building the data model.
+# @param args The arguments of the function.
+# @return The allocated memory in bytes.
+def measure(build, *args):
+	tracemalloc.start()
+	result = build(*args)
+	size = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del result
+	return size
+
+# Runs the benchmark.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Memory benchmark for the data model of armour and characters.")
+	parser.add_argument("--armour", type=int, default=500, help="number of generated armour types")
+	parser.add_argument("--characters", type=int, default=10000, help="number of generated characters")
+	parser.add_argument("--loadouts", type=int, default=2000, help="number of distinct loadouts in the roster")
+	args = parser.parse_args(args)
+	definitions, roster = generateRoster(args.armour, args.characters, args.loadouts)
+	lists = measure(buildLists, definitions, roster)
+	objects = measure(buildRegistry, definitions, roster)
+	print("Nested lists: " + "{:.2f}".format(lists / 2 ** 20) + " MiB")
+	print("Registry: " + "{:.2f}".format(objects / 2 ** 20) + " MiB (" + "{:.1f}".format(100 * (1 - objects / lists)) + " % less)")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,93 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Scrolling benchmark: opens the GUI with a large roster and measures the time spent handling sustained mouse wheel scrolling and window resizes,
+# once with every event updating the character list immediately and once with the updates coalesced by the RenderScheduler.
+# Requires a display.
+# 
+# Usage: python benchmarks/benchScrolling.py [--characters 10000] [--frames 300] [--events 8]
+
+# Changelog
+# 2026-10-16: Initial version
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBAGui as G
+
+# Opens the GUI without entering its mainloop, so the benchmark can drive the event loop.
+# 
+# @param characterCount The number of characters in the roster.
+# @return The HBA instance.
+def openGui(characterCount):
+	mainloop = tk.Tk.mainloop
+	tk.Tk.mainloop = lambda self, n=0: None
+	try:
+		app = G.HBA()
+	finally:
+		tk.Tk.mainloop = mainloop
+	for index in range(characterCount):
+		characterID = app.registry.addCharacter("Character " + str(index))
+		app.roster.append(characterID)
+		app.characterInputs[characterID] = ["", "", "0"]
+	app.layoutRows()
+	app.window.update()
+	return app
+
+# Scrolls through the roster and measures the time until all events of each frame are handled.
+# 
+# @param app The HBA instance.
+# @param frames The number of frames.
+# @param events The number of wheel events per frame. Every tenth frame also resizes the window.
+# @return Tuple of the time in seconds and the number of times the rows were rebound.
+def scroll(app, frames, events):
+	refreshRows = app.refreshRows
+	calls = [0]
+	# Count the rebinds of the rows
+	def countedRefresh(event=None):
+		calls[0] += 1
+		refreshRows()
+	app.refreshRows = countedRefresh
+	width = app.window.winfo_width()
+	start = time.perf_counter()
+	for frame in range(frames):
+		for _ in range(events):
+			app.canvas.event_generate("<MouseWheel>", delta=-120 if frame < frames // 2 else 120, when="tail")
+		if frame % 10 == 0:
+			width += 1 if frame % 20 == 0 else -1
+			app.window.geometry(str(width) + "x" + str(app.window.winfo_height()))
+		app.window.update()
+	seconds = time.perf_counter() - start
+	app.refreshRows = refreshRows
+	return seconds, calls[0]
+
+# Runs the benchmark.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Benchmark for handling scroll and resize events of the character list.")
+	parser.add_argument("--characters", type=int, default=10000, help="number of characters in the roster")
+	parser.add_argument("--frames", type=int, default=300, help="number of frames")
+	parser.add_argument("--events", type=int, default=8, help="number of mouse wheel events per frame")
+	args = parser.parse_args(args)
+	# The GUI writes its default armour and autosave to the working directory
+	with tempfile.TemporaryDirectory() as directory:
+		os.chdir(directory)
+		app = openGui(args.characters)
+		app.renderScheduler.immediate = True
+		immediate, immediateCalls = scroll(app, args.frames, args.events)
+		app.renderScheduler.immediate = False
+		coalesced, coalescedCalls = scroll(app, args.frames, args.events)
+		app.quit()
+	print("Immediate updates: " + "{:.2f}".format(immediate / args.frames * 1000) + " ms per frame, " + str(immediateCalls) + " rebinds")
+	print("Coalesced updates: " + "{:.2f}".format(coalesced / args.frames * 1000) + " ms per frame, " + str(coalescedCalls) + " rebinds ("
+		+ "{:.1f}".format(immediate / coalesced) + " times faster)")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,122 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Load benchmark for HBAServer: runs the server on its own thread, like next to the GUI, and lets several clients send
+# single hits and batches of hits over localhost. Every client keeps a window of requests in flight.
+# 
+# Usage: python benchmarks/benchServer.py [--characters 100] [--clients 8] [--requests 20000] [--batch 100]
+
+# Changelog
+# 2026-10-16: Initial version
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBAEngine as E
+import HBAServer as V
+
+# Builds a registry with generated armour and characters.
+# 
+# @param characterCount The number of characters.
+# @return The registry.
+def buildRegistry(characterCount):
+	rng = random.Random(0)
+	registry = E.Registry()
+	registry.setArmourDefinitions([["Armour " + str(index)] + [rng.randrange(6) for _ in E.DAMAGE_TYPES] + [{}] for index in range(50)])
+	for index in range(characterCount):
+		slots = [["Armour " + str(rng.randrange(50)) for _ in range(rng.randrange(4))] for _ in E.SLOT_NAMES]
+		registry.setCharacterArmour(registry.addCharacter("Character " + str(index), 30), slots)
+	return registry
+
+# Sends requests over one connection and reads the answers, keeping a window of requests in flight.
+# 
+# @param port The port of the server.
+# @param requests List of the encoded requests.
+# @param window The maximum number of requests in flight.
+# @return The number of failed requests.
+async def runClient(port, requests, window):
+	reader, writer = await asyncio.open_connection(V.HOST, port, limit=V.LINE_LIMIT)
+	failed = 0
+	sent = 0
+	received = 0
+	while received < len(requests):
+		while sent < len(requests) and sent - received < window:
+			writer.write(requests[sent])
+			sent += 1
+		await writer.drain()
+		response = json.loads(await reader.readline())
+		received += 1
+		if not response["ok"]:
+			failed += 1
+	writer.close()
+	await writer.wait_closed()
+	return failed
+
+# Runs clients in parallel and measures the throughput.
+# 
+# @param port The port of the server.
+# @param requests List of the encoded requests of each client.
+# @param window The maximum number of requests in flight per client.
+# @return Tuple of the time in seconds and the number of failed requests.
+async def runClients(port, requests, window):
+	start = time.perf_counter()
+	failed = await asyncio.gather(*[runClient(port, clientRequests, window) for clientRequests in requests])
+	return time.perf_counter() - start, sum(failed)
+
+# Generates the requests of the clients.
+# 
+# @param characterCount The number of characters.
+# @param clients The number of clients.
+# @param count The number of requests per client.
+# @param batch The number of hits per request, or 0 for single "resolve" requests.
+# @return List of the encoded requests of each client.
+def generateRequests(characterCount, clients, count, batch):
+	rng = random.Random(1)
+	requests = []
+	for _ in range(clients):
+		clientRequests = []
+		for index in range(count):
+			if batch == 0:
+				request = {"id": index, "op": "resolve", "character": "Character " + str(rng.randrange(characterCount)),
+					"attack": rng.randrange(1, 30), "damage": rng.randrange(1, 20), "type": rng.choice(E.DAMAGE_TYPES)}
+			else:
+				request = {"id": index, "op": "resolveBatch", "hits": [["Character " + str(rng.randrange(characterCount)),
+					rng.randrange(1, 30), rng.randrange(1, 20), rng.choice(E.DAMAGE_TYPES)] for _ in range(batch)]}
+			clientRequests.append((json.dumps(request) + "\n").encode())
+		requests.append(clientRequests)
+	return requests
+
+# Runs the benchmark.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Load benchmark for the damage resolution server.")
+	parser.add_argument("--characters", type=int, default=100, help="number of generated characters")
+	parser.add_argument("--clients", type=int, default=8, help="number of parallel clients")
+	parser.add_argument("--requests", type=int, default=20000, help="number of requests of each kind per client")
+	parser.add_argument("--batch", type=int, default=100, help="number of hits per batch request")
+	parser.add_argument("--window", type=int, default=32, help="number of requests in flight per client")
+	parser.add_argument("--port", type=int, default=V.PORT + 1, help="port for the benchmark server")
+	args = parser.parse_args(args)
+	server = V.Server(buildRegistry(args.characters))
+	server.startThread(V.HOST, args.port)
+	single = generateRequests(args.characters, args.clients, args.requests, 0)
+	batches = generateRequests(args.characters, args.clients, max(args.requests // 10, 1), args.batch)
+	total = args.clients * args.requests
+	seconds, failed = asyncio.run(runClients(args.port, single, args.window))
+	print("Single hits: " + "{:.0f}".format(total / seconds) + " requests/s (" + str(failed) + " failed)")
+	batchCount = args.clients * max(args.requests // 10, 1)
+	seconds, failed = asyncio.run(runClients(args.port, batches, args.window))
+	print("Batches of " + str(args.batch) + " hits: " + "{:.0f}".format(batchCount / seconds) + " requests/s, "
+		+ "{:.0f}".format(batchCount * args.batch / seconds) + " hits/s (" + str(failed) + " failed)")
+	server.stop()
+
+if __name__ == "__main__":
+	main()
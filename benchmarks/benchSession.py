@@ -0,0 +1,71 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Session benchmark: measures writing a session snapshot, appending journal records and recovering the session,
+# compared with loading the same configuration from its files.
+# 
+# Usage: python benchmarks/benchSession.py [--armour 10000] [--characters 1000] [--records 1000]
+
+# Changelog
+# 2026-10-16: The configuration is written by the generators module
+# 2026-10-16: Initial version
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBACache as C
+import HBAEngine as E
+import HBASession as J
+import generators
+
+# Runs the benchmark.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Benchmark for saving and recovering sessions.")
+	parser.add_argument("--armour", type=int, default=10000, help="number of generated armour types")
+	parser.add_argument("--characters", type=int, default=1000, help="number of generated characters")
+	parser.add_argument("--records", type=int, default=1000, help="number of journal records appended")
+	args = parser.parse_args(args)
+	J.COMPACT_RECORDS = args.records + 1
+	with tempfile.TemporaryDirectory() as directory:
+		path = generators.writeConfiguration(directory, args.armour, args.characters)
+		C.ENABLED = False
+		registry = E.Registry()
+		start = time.perf_counter()
+		E.loadConfiguration(registry, path)
+		load = time.perf_counter() - start
+		order = list(registry.characters)
+		inputs = {characterID: ["", "", "0"] for characterID in order}
+		# Snapshot
+		session = J.Session(os.path.join(directory, "session.hbs"))
+		start = time.perf_counter()
+		session.reset(J.captureState(registry, order, inputs, path))
+		snapshot = time.perf_counter() - start
+		# Journal
+		start = time.perf_counter()
+		for index in range(args.records):
+			characterID = order[index % len(order)]
+			inputs[characterID] = [str(index % 30), str(index % 20), str(index % 10)]
+			session.record(("inputs", characterID, inputs[characterID]))
+		journal = time.perf_counter() - start
+		session.close()
+		# Recovery
+		start = time.perf_counter()
+		state = J.readSession(session.path)
+		J.restoreState(E.Registry(), state)
+		recovery = time.perf_counter() - start
+		size = os.path.getsize(session.path)
+	print("Loading the configuration from text: " + "{:.3f}".format(load) + " s")
+	print("Writing a snapshot: " + "{:.1f}".format(snapshot * 1000) + " ms (" + "{:.0f}".format(size / 1024) + " KiB)")
+	print("Appending a journal record: " + "{:.1f}".format(journal / args.records * 1e6) + " us")
+	print("Recovering from the snapshot and " + str(args.records) + " journal records: " + "{:.3f}".format(recovery) + " s ("
+		+ "{:.1f}".format(load / recovery) + " times faster)")
+
+if __name__ == "__main__":
+	main()
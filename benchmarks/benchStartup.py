@@ -0,0 +1,53 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Startup benchmark: compares loading a generated configuration by parsing every file from text with loading it from the HBACache.
+# 
+# Usage: python benchmarks/benchStartup.py [--armour 100000] [--characters 1000]
+
+# Changelog
+# 2026-10-16: The configuration is written by the generators module
+# 2026-10-16: Initial version
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBACache as C
+import HBAEngine as E
+import generators
+
+# Loads a configuration into a new registry and measures the time.
+# 
+# @param path The path of the configuration file.
+# @return The time in seconds.
+def timeLoad(path):
+	start = time.perf_counter()
+	E.loadConfiguration(E.Registry(), path)
+	return time.perf_counter() - start
+
+# Runs the benchmark.
+# 
+# @param args The command line arguments.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Startup benchmark for the HBACache.")
+	parser.add_argument("--armour", type=int, default=100000, help="number of generated armour types")
+	parser.add_argument("--characters", type=int, default=1000, help="number of generated characters")
+	args = parser.parse_args(args)
+	with tempfile.TemporaryDirectory() as directory:
+		path = generators.writeConfiguration(directory, args.armour, args.characters)
+		C.ENABLED = False
+		text = timeLoad(path)
+		C.ENABLED = True
+		cold = timeLoad(path)
+		warm = timeLoad(path)
+	print("Parsing from text: " + "{:.3f}".format(text) + " s")
+	print("Cold cache (parsing and writing the cache): " + "{:.3f}".format(cold) + " s")
+	print("Warm cache: " + "{:.3f}".format(warm) + " s (" + "{:.1f}".format(text / warm) + " times faster)")
+
+if __name__ == "__main__":
+	main()
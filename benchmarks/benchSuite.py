@@ -0,0 +1,303 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Benchmark suite: times parsing armour libraries, character files and configurations, building a roster with addCharacter,
+# resolving hits one at a time and in batches, and measures the peak memory of loading a configuration.
+# The inputs are generated from a seed by the generators module, from small to large libraries and rosters.
+# With --gui, the same loads and calculateDamage are also timed through the GUI; this requires a display, for example xvfb-run.
+# The results are saved as JSON and can be compared with a stored baseline. Every result is a time or a size, so lower is better;
+# results that got worse than the baseline by more than the tolerance are reported as regressions and make the suite exit with status 1.
+# 
+# Usage: python benchmarks/benchSuite.py [--armour 10 1000 100000] [--characters 1 100 10000] [--output results.json] [--baseline baseline.json]
+
+# Changelog
+# 2026-10-16: Initial version
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBACache as C
+import HBAEngine as E
+import HBALog as O
+import generators
+
+# Runs a function several times and measures the fastest run.
+# Each run gets a fresh argument from the setup function, so setup work isn't timed.
+# 
+# @param function The function to time. It is called with the result of the setup function.
+# @param repeat The number of runs.
+# @param setup Function preparing the argument of each run or None.
+# @return The time of the fastest run in seconds.
+def timeRuns(function, repeat, setup=None):
+	best = None
+	for _ in range(repeat):
+		argument = None if None == setup else setup()
+		gc.collect()
+		start = time.perf_counter()
+		function(argument)
+		seconds = time.perf_counter() - start
+		if None == best or seconds < best:
+			best = seconds
+	return best
+
+# Measures the peak memory allocated by a function.
+# 
+# @param function The function to measure. It is called with the result of the setup function.
+# @param setup Function preparing the argument or None. Its allocations aren't counted.
+# @return The peak memory in MiB.
+def peakMemory(function, setup=None):
+	argument = None if None == setup else setup()
+	gc.collect()
+	tracemalloc.start()
+	function(argument)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return peak / 2**20
+
+# Times parsing armour libraries and building their armour index.
+# 
+# @param directory The directory to write the generated files to.
+# @param armourCounts The numbers of armour types of the libraries.
+# @param repeat The number of runs of each case.
+# @param results Dictionary the results are added to.
+def benchLibraries(directory, armourCounts, repeat, results):
+	for armourCount in armourCounts:
+		path = os.path.join(directory, "library" + str(armourCount) + ".hba")
+		generators.writeLibrary(path, armourCount)
+		definitions = E.parseArmourFile(path)[0]
+		results["parseArmourFile/" + str(armourCount) + "/seconds"] = timeRuns(lambda _: E.parseArmourFile(path), repeat)
+		results["setArmourDefinitions/" + str(armourCount) + "/seconds"] = timeRuns(lambda registry: registry.setArmourDefinitions(definitions), repeat, E.Registry)
+
+# Times parsing character files and configurations, building rosters and resolving hits.
+# 
+# @param directory The directory to write the generated files to.
+# @param characterCounts The numbers of characters of the rosters.
+# @param armourCount The number of armour types in the library the characters wear.
+# @param layers The maximum number of armour layers per slot.
+# @param hitCount The number of hits resolved against each roster.
+# @param repeat The number of runs of each case.
+# @param results Dictionary the results are added to.
+def benchRosters(directory, characterCounts, armourCount, layers, hitCount, repeat, results):
+	try:
+		import HBABatch as B
+	except ImportError:
+		B = None
+		print("NumPy isn't installed, batch resolution is skipped.")
+	for characterCount in characterCounts:
+		key = "/" + str(characterCount) + "/"
+		rosterDirectory = os.path.join(directory, "roster" + str(characterCount))
+		os.mkdir(rosterDirectory)
+		path = generators.writeConfiguration(rosterDirectory, armourCount, characterCount, layers)
+		paths = [os.path.join(rosterDirectory, "character" + str(index) + ".char") for index in range(characterCount)]
+		definitions = E.parseArmourFile(os.path.join(rosterDirectory, "library.hba"))[0]
+		characters = [E.parseCharacterFile(characterPath) for characterPath in paths]
+		results["parseCharacterFile" + key + "seconds"] = timeRuns(lambda _: [E.parseCharacterFile(characterPath) for characterPath in paths], repeat)
+		results["parseConfiguration" + key + "seconds"] = timeRuns(lambda _: E.parseConfiguration(path), repeat)
+		results["loadConfiguration" + key + "seconds"] = timeRuns(lambda registry: E.loadConfiguration(registry, path), repeat, E.Registry)
+		results["loadConfiguration" + key + "peakMiB"] = peakMemory(lambda registry: E.loadConfiguration(registry, path), E.Registry)
+		# Build the roster like the GUI does: add each character, then equip its armour
+		def setupRegistry():
+			registry = E.Registry()
+			registry.setArmourDefinitions(definitions)
+			return registry
+		def buildRoster(registry):
+			for name, slots, messages in characters:
+				registry.setCharacterArmour(registry.addCharacter(name), slots)
+		results["addCharacter" + key + "seconds"] = timeRuns(buildRoster, repeat, setupRegistry)
+		results["addCharacter" + key + "peakMiB"] = peakMemory(buildRoster, setupRegistry)
+		# Resolve hits against the roster
+		registry = setupRegistry()
+		buildRoster(registry)
+		attacks = generators.generateAttacks([name for name, slots, messages in characters], hitCount)
+		hits = [(registry.getCharacter(registry.findCharacter(name)), attackRoll, damage, damageType) for name, attackRoll, damage, damageType in attacks]
+		resolveHit = registry.resolveHit
+		results["resolveHit" + key + "seconds"] = timeRuns(lambda _: [resolveHit(*hit) for hit in hits], repeat)
+		if not None == B:
+			resolver = B.BatchResolver(registry)
+			resolver.compile()
+			results["resolveBatch" + key + "seconds"] = timeRuns(lambda _: B.resolveRecords(resolver, attacks), repeat)
+
+# Input field with a fixed text, standing in for the entries of a row.
+class FixedInput:
+	# Constructor method
+	# 
+	# @param text The text of the input.
+	def __init__(self, text):
+		self.text = text
+	
+	# Gets the text of the input.
+	# 
+	# @return The text.
+	def get(self):
+		return self.text
+
+# Opens the GUI without entering its mainloop, so the benchmark can drive the event loop.
+# 
+# @return The HBA instance.
+def openGui():
+	import tkinter as tk
+	import HBAGui as G
+	mainloop = tk.Tk.mainloop
+	tk.Tk.mainloop = lambda self, n=0: None
+	try:
+		app = G.HBA()
+	finally:
+		tk.Tk.mainloop = mainloop
+	app.window.update()
+	return app
+
+# Loads a configuration through the GUI and waits until its characters are added.
+# 
+# @param app The HBA instance.
+# @param path The path of the configuration file.
+def loadGuiConfiguration(app, path):
+	app.loadConfiguration(path)
+	while not None == app.configurationLoad:
+		app.window.update()
+		time.sleep(0.001)
+	app.window.update()
+
+# Times loading armour and characters and calculating damage through the GUI.
+# Every run opens a new window in a new working directory, so the autosave of one run isn't recovered by the next.
+# 
+# @param directory The directory to write the generated files to.
+# @param armourCounts The numbers of armour types of the libraries.
+# @param characterCounts The numbers of characters of the rosters.
+# @param armourCount The number of armour types in the library the characters wear.
+# @param layers The maximum number of armour layers per slot.
+# @param hitCount The number of hits calculated with calculateDamage.
+# @param repeat The number of runs of each case.
+# @param results Dictionary the results are added to.
+def benchGui(directory, armourCounts, characterCounts, armourCount, layers, hitCount, repeat, results):
+	import tkinter as tk
+	# Open each window in an empty working directory
+	def setupGui():
+		os.chdir(tempfile.mkdtemp(dir=directory))
+		return openGui()
+	# Run a case and close the window afterwards
+	def closing(function):
+		def run(app):
+			function(app)
+			app.quit()
+		return run
+	for count in armourCounts:
+		path = os.path.join(directory, "library" + str(count) + ".hba")
+		results["gui.loadArmourDefinitions/" + str(count) + "/seconds"] = timeRuns(closing(lambda app: app.loadArmourDefinitions(path)), repeat, setupGui)
+	for characterCount in characterCounts:
+		key = "/" + str(characterCount) + "/"
+		rosterDirectory = os.path.join(directory, "roster" + str(characterCount))
+		path = os.path.join(rosterDirectory, "campaign.hacfg")
+		paths = [os.path.join(rosterDirectory, "character" + str(index) + ".char") for index in range(characterCount)]
+		libraryPath = os.path.join(rosterDirectory, "library.hba")
+		# Load the library first, so only adding and loading the characters is timed
+		def setupRoster():
+			app = setupGui()
+			app.loadArmourDefinitions(libraryPath)
+			return app
+		def loadCharacters(app):
+			for characterPath in paths:
+				app.loadCharacter(app.addCharacter(), characterPath)
+			app.window.update()
+		results["gui.loadCharacter" + key + "seconds"] = timeRuns(closing(loadCharacters), repeat, setupRoster)
+		results["gui.loadConfiguration" + key + "seconds"] = timeRuns(closing(lambda app: loadGuiConfiguration(app, path)), repeat, setupGui)
+		# Calculate damage like the damage buttons of the rows do
+		app = setupGui()
+		loadGuiConfiguration(app, path)
+		names = [app.registry.characters[characterID].name for characterID in app.roster.getOrder()]
+		label = tk.Label(app.window)
+		hits = [(app.registry.findCharacter(name), FixedInput(str(attackRoll)), FixedInput(str(damage)), damageType)
+			for name, attackRoll, damage, damageType in generators.generateAttacks(names, hitCount)]
+		results["gui.calculateDamage" + key + "seconds"] = timeRuns(lambda _: [app.calculateDamage(*hit, label) for hit in hits], repeat)
+		app.quit()
+
+# Compares results with a baseline.
+# 
+# @param results Dictionary with the results.
+# @param baseline Dictionary with the results of the baseline.
+# @param tolerance The relative increase over the baseline that is still accepted.
+# @return List of the names of the results that regressed.
+def compare(results, baseline, tolerance):
+	regressions = []
+	for name in sorted(results.keys() | baseline.keys()):
+		if not name in baseline:
+			print(name + ": " + "{:.6g}".format(results[name]) + " (not in the baseline)")
+			continue
+		if not name in results:
+			print(name + ": not measured (baseline " + "{:.6g}".format(baseline[name]) + ")")
+			continue
+		ratio = results[name] / baseline[name] if baseline[name] > 0 else 1.0
+		status = ""
+		if ratio > 1 + tolerance:
+			status = " REGRESSION"
+			regressions.append(name)
+		elif ratio < 1 - tolerance:
+			status = " improved"
+		print(name + ": " + "{:.6g}".format(results[name]) + " (baseline " + "{:.6g}".format(baseline[name]) + ", "
+			+ "{:+.1f}".format((ratio - 1) * 100) + " %)" + status)
+	return regressions
+
+# Runs the benchmark suite.
+# 
+# @param args The command line arguments.
+# @return The exit status: 1 if a result regressed, 0 otherwise.
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Benchmark suite for parsing, roster construction, hit resolution and memory.")
+	parser.add_argument("--armour", type=int, nargs="+", default=[10, 1000, 100000], help="numbers of armour types of the generated libraries")
+	parser.add_argument("--characters", type=int, nargs="+", default=[1, 100, 10000], help="numbers of characters of the generated rosters")
+	parser.add_argument("--library", type=int, default=1000, help="number of armour types in the library the characters wear")
+	parser.add_argument("--layers", type=int, default=8, help="maximum number of armour layers per slot")
+	parser.add_argument("--hits", type=int, default=100000, help="number of hits resolved against each roster")
+	parser.add_argument("--repeat", type=int, default=3, help="number of runs of each case; the fastest run is reported")
+	parser.add_argument("--gui", action="store_true", help="also time loading and calculateDamage through the GUI (requires a display)")
+	parser.add_argument("--output", help="path of the JSON file the results are saved to")
+	parser.add_argument("--baseline", help="path of a JSON file with results to compare with")
+	parser.add_argument("--tolerance", type=float, default=0.2, help="relative increase over the baseline reported as a regression")
+	args = parser.parse_args(args)
+	# Measure parsing, not loading from the cache, and don't time console output
+	C.ENABLED = False
+	O.setLevel(O.ERROR)
+	results = {}
+	workingDirectory = os.getcwd()
+	with tempfile.TemporaryDirectory() as directory:
+		benchLibraries(directory, args.armour, args.repeat, results)
+		benchRosters(directory, args.characters, args.library, args.layers, args.hits, args.repeat, results)
+		if args.gui:
+			try:
+				benchGui(directory, args.armour, args.characters, args.library, args.layers, min(args.hits, 10000), args.repeat, results)
+			finally:
+				os.chdir(workingDirectory)
+	report = {
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"parameters": vars(args),
+		"results": results,
+	}
+	if not None == args.output:
+		output = open(args.output, "w")
+		json.dump(report, output, indent="\t")
+		output.close()
+	if None == args.baseline:
+		for name in sorted(results):
+			print(name + ": " + "{:.6g}".format(results[name]))
+		return 0
+	baselineFile = open(args.baseline, "r")
+	baseline = json.load(baselineFile)["results"]
+	baselineFile.close()
+	regressions = compare(results, baseline, args.tolerance)
+	if len(regressions) > 0:
+		print(str(len(regressions)) + " results regressed by more than " + "{:.0f}".format(args.tolerance * 100) + " %.")
+		return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
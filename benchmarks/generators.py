@@ -0,0 +1,116 @@
+# Lukas Freudenberg
+# 
+# 2026-10-16, ver.1.0
+# 
+# Generators for synthetic armour libraries (.hba), character rosters (.char) and configurations (.hacfg) used by the benchmarks.
+# The files are generated from a seed, so a benchmark always measures the same input.
+
+# Changelog
+# 2026-10-16: Initial version
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import HBAEngine as E
+
+# Materials used as text stats of the generated armour
+MATERIALS = ["leather", "cloth", "iron", "steel", "mithril", "bone", "silk", "dragonscale"]
+
+# Writes an armour library.
+# Every armour type has a reduction for each built-in damage type, a numeric stat and a text stat.
+# 
+# @param path The path of the library file.
+# @param armourCount The number of armour types.
+# @param seed The seed of the generated reductions.
+def writeLibrary(path, armourCount, seed=0):
+	rng = random.Random(seed)
+	lines = ["# Generated armour library with " + str(armourCount) + " armour types\n"]
+	for index in range(armourCount):
+		lines.append("Armour " + str(index) + "\n")
+		for damageType in E.DAMAGE_TYPES:
+			lines.append("\t" + damageType + ": " + str(rng.randrange(8)) + "\n")
+		lines.append("\tweight: " + str(rng.randrange(1, 40)) + "\n")
+		lines.append("\tmaterial: " + rng.choice(MATERIALS) + "\n")
+		lines.append("\n")
+	libraryFile = open(path, "w")
+	libraryFile.writelines(lines)
+	libraryFile.close()
+
+# Generates the slots of a character.
+# 
+# @param rng The random number generator.
+# @param armourCount The number of armour types in the library.
+# @param layers The maximum number of armour layers per slot.
+# @return List with the armour names of each slot.
+def generateSlots(rng, armourCount, layers):
+	return [["Armour " + str(rng.randrange(armourCount)) for _ in range(rng.randrange(layers + 1))] for _ in E.SLOT_NAMES]
+
+# Writes a character file.
+# 
+# @param path The path of the character file.
+# @param name The name of the character.
+# @param slots List with the armour names of each slot.
+def writeCharacter(path, name, slots):
+	lines = ["name=" + name + "\n"]
+	for slotName, slot in zip(E.SLOT_NAMES, slots):
+		lines.append(slotName + "\n")
+		for armourName in slot:
+			lines.append("\t" + armourName + "\n")
+	characterFile = open(path, "w")
+	characterFile.writelines(lines)
+	characterFile.close()
+
+# Writes a roster of character files.
+# 
+# @param directory The directory to write the files to.
+# @param characterCount The number of characters.
+# @param armourCount The number of armour types in the library the characters wear.
+# @param layers The maximum number of armour layers per slot.
+# @param seed The seed of the generated loadouts.
+# @return List of the paths of the character files.
+def writeRoster(directory, characterCount, armourCount, layers=4, seed=0):
+	rng = random.Random(seed)
+	paths = []
+	for index in range(characterCount):
+		path = os.path.join(directory, "character" + str(index) + ".char")
+		writeCharacter(path, "Character " + str(index), generateSlots(rng, armourCount, layers))
+		paths.append(path)
+	return paths
+
+# Writes a configuration with a generated library and roster.
+# 
+# @param directory The directory to write the files to.
+# @param armourCount The number of armour types in the library.
+# @param characterCount The number of characters.
+# @param layers The maximum number of armour layers per slot.
+# @param squads List of [count, hitPoints] for squads of identically equipped characters added to the configuration.
+# @param seed The seed of the generated files.
+# @return The path of the configuration file.
+def writeConfiguration(directory, armourCount, characterCount, layers=4, squads=(), seed=0):
+	libraryPath = os.path.join(directory, "library.hba")
+	writeLibrary(libraryPath, armourCount, seed)
+	lines = ["armour=" + libraryPath + "\n"]
+	for path in writeRoster(directory, characterCount, armourCount, layers, seed):
+		lines.append("character=" + path + "\n")
+	rng = random.Random(seed + 1)
+	for index, (count, hitPoints) in enumerate(squads):
+		path = os.path.join(directory, "squad" + str(index) + ".char")
+		writeCharacter(path, "Squad " + str(index), generateSlots(rng, armourCount, layers))
+		lines.append("squad=" + str(count) + " " + str(hitPoints) + " " + path + "\n")
+	configurationPath = os.path.join(directory, "campaign.hacfg")
+	configurationFile = open(configurationPath, "w")
+	configurationFile.writelines(lines)
+	configurationFile.close()
+	return configurationPath
+
+# Generates attack records against a roster.
+# 
+# @param characterNames The names of the characters.
+# @param count The number of attacks.
+# @param seed The seed of the generated attacks.
+# @return List of records in the format [characterName, attackRoll, damage, damageType].
+def generateAttacks(characterNames, count, seed=0):
+	rng = random.Random(seed)
+	return [[rng.choice(characterNames), rng.randrange(1, 30), rng.randrange(1, 25), rng.choice(E.DAMAGE_TYPES)] for _ in range(count)]